@@ -10,9 +10,19 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 
 from game_source_adapter_template import GameSourceAdapter
+from timestamp_parser import parse_timestamp
 
 
 class AdinmoAdapter(GameSourceAdapter):
+    # Columnar hints (see GameSourceAdapter.transform_columns)
+    event_type_columns = ("table", "EVENT_TYPE", "event_type")
+    identifier_columns = {
+        "device_id": ("ANON_DEVICE_ID", "anon_device_id"),
+        "session_id": ("SESSION_ID", "session_id"),
+    }
+    timestamp_columns = ("ACTIVITY_TS", "activity_ts", "timestamp")
+    numeric_columns = ("BID_PRICE", "ACTUAL_REVENUE", "DWELL_TIME", "PLAYER_ENGAGEMENT_SCORE")
+
     def map_event_type(self, source_event: Dict[str, Any]) -> str:
         table = (source_event.get("table") or "").lower().strip()
         event_type = (source_event.get("EVENT_TYPE") or source_event.get("event_type") or "").lower().strip()
@@ -47,18 +57,7 @@ class AdinmoAdapter(GameSourceAdapter):
 
     def map_timestamp(self, source_event: Dict[str, Any]) -> datetime:
         ts = source_event.get("ACTIVITY_TS") or source_event.get("activity_ts") or source_event.get("timestamp")
-        if isinstance(ts, datetime):
-            return ts
-        if isinstance(ts, (int, float)):
-            if ts > 1e10:
-                return datetime.fromtimestamp(ts / 1000)
-            return datetime.fromtimestamp(ts)
-        if isinstance(ts, str) and ts.strip():
-            try:
-                return datetime.fromisoformat(ts.replace("Z", "+00:00"))
-            except ValueError:
-                pass
-        return datetime.now()
+        return parse_timestamp(ts, self.timestamp_numeric_unit) or datetime.now()
 
     def map_properties(self, source_event: Dict[str, Any]) -> Dict[str, Any]:
         props: Dict[str, Any] = {}
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Columnar Batch Containers
+
+Column-oriented input/output containers used by
+GameSourceAdapter.transform_columns(). Source rows and universal events are
+only materialized as per-event dicts when a caller asks for them.
+"""
+
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+
+
+UNIVERSAL_FIELDS = (
+    "event_id",
+    "event_type",
+    "device_id",
+    "session_id",
+    "game_id",
+    "activity_timestamp",
+    "properties",
+)
+
+
+def as_columns(data: Any) -> Dict[str, List[Any]]:
+    """
+    Normalize column-oriented input to a dict of Python lists.
+
+    Accepts a dict of sequences / NumPy arrays, a pandas DataFrame or a
+    pyarrow Table / RecordBatch. Third-party types are detected by duck typing
+    so neither library is required.
+
+    Args:
+        data: Column-oriented source data
+
+    Returns:
+        Dictionary of column name -> list of values
+    """
+    if isinstance(data, Mapping):
+        columns = {}
+        for name, values in data.items():
+            tolist = getattr(values, "tolist", None)
+            columns[name] = tolist() if callable(tolist) else list(values)
+    elif callable(getattr(data, "to_pydict", None)):
+        # pyarrow.Table / pyarrow.RecordBatch
+        columns = data.to_pydict()
+    elif callable(getattr(data, "to_dict", None)) and hasattr(data, "columns"):
+        # pandas.DataFrame
+        columns = data.to_dict(orient="list")
+    else:
+        raise TypeError(f"Unsupported columnar input: {type(data).__name__}")
+
+    lengths = {len(values) for values in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+    return columns
+
+
+class _RowView(Mapping):
+    """Read-only dict-like view of one row of a SourceColumns batch."""
+
+    __slots__ = ("_columns", "_index")
+
+    def __init__(self, columns: Dict[str, List[Any]], index: int):
+        self._columns = columns
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._columns[key][self._index]
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        i = self._index
+        return (k for k, col in self._columns.items() if col[i] is not None)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class SourceColumns:
+    """
+    Column-oriented batch of source events.
+
+    Missing values are represented as None; a None cell is treated as an
+    absent key when a row is viewed as an event dict.
+    """
+
+    def __init__(self, data: Any):
+        self.columns = as_columns(data)
+        self._length = len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def column(self, name: str) -> List[Any]:
+        """Return a column, or a column of None if the source lacks it."""
+        values = self.columns.get(name)
+        if values is None:
+            return [None] * self._length
+        return values
+
+    def coalesce(self, names: Sequence[str]) -> List[Any]:
+        """
+        Column-wise equivalent of ``event.get(a) or event.get(b) or ...``.
+
+        Args:
+            names: Candidate column names in priority order
+
+        Returns:
+            Coalesced column values
+        """
+        result = self.column(names[-1])
+        for name in reversed(names[:-1]):
+            values = self.columns.get(name)
+            if values is not None:
+                result = [v if v else r for v, r in zip(values, result)]
+        return result
+
+    def first_present(self, names: Sequence[str]) -> List[Any]:
+        """Column-wise equivalent of "first key present in the event" (None = absent)."""
+        result: List[Any] = [None] * self._length
+        for name in reversed(names):
+            values = self.columns.get(name)
+            if values is not None:
+                result = [v if v is not None else r for v, r in zip(values, result)]
+        return result
+
+    def view(self, index: int) -> Mapping:
+        """Return a lightweight dict-like view of one row (no copy)."""
+        return _RowView(self.columns, index)
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Materialize one row as a plain dict."""
+        return {k: col[index] for k, col in self.columns.items() if col[index] is not None}
+
+
+class UniversalColumns:
+    """
+    Column-oriented batch of universal events.
+
+    Holds one list per universal field (see UNIVERSAL_FIELDS). Per-event
+    dicts matching GameSourceAdapter.transform_event() output are built on
+    demand by row() / iteration. The source columns are only retained in
+    "full" provenance mode.
+    """
+
+    def __init__(
+        self,
+        source_name: str,
+        columns: Dict[str, List[Any]],
+        source: Optional[SourceColumns] = None,
+        provenance: str = "full",
+        start_index: int = 0,
+    ):
+        self.source_name = source_name
+        self.columns = columns
+        self.provenance = provenance
+        self.start_index = start_index
+        self.source = source if provenance == "full" else None
+
+    def __len__(self) -> int:
+        return len(self.columns["event_id"])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """Materialize one universal event dict."""
+        universal_event = {field: self.columns[field][index] for field in UNIVERSAL_FIELDS}
+        metadata: Dict[str, Any] = {"source_name": self.source_name}
+        if self.provenance == "full":
+            metadata["original_event"] = self.source.row(index) if self.source is not None else None
+        elif self.provenance == "reference":
+            metadata["source_index"] = self.start_index + index
+        universal_event["source_metadata"] = metadata
+        return universal_event
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        """Materialize every universal event dict."""
+        return list(self)
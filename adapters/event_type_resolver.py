@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Event Type Resolver
+
+Shared event-type dispatch for game source adapters. Each adapter declares its
+rules once (exact names plus ordered regex fallbacks); the resolver compiles
+them into an exact-match hash table and a single compiled pattern, and
+memoizes results per distinct raw event name.
+"""
+
+import re
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+
+class EventTypeResolver:
+    """
+    Resolve raw source event names to universal gaming event types.
+
+    Resolution order for a normalized (lowercased) name:
+    1. Exact match in the hash table
+    2. First matching fallback pattern, in declaration order (re.search semantics)
+    3. Default event type
+
+    Results are cached per raw event name in a bounded cache, so repeated
+    names cost a single dictionary lookup.
+    """
+
+    def __init__(
+        self,
+        exact: Dict[str, str],
+        patterns: Sequence[Tuple[str, str]] = (),
+        default: str = "GameEvent",
+        cache_size: int = 65536,
+    ):
+        """
+        Initialize the resolver.
+
+        Args:
+            exact: Normalized event name -> universal event type
+            patterns: Ordered (regex, universal event type) fallbacks
+            default: Universal event type when nothing matches
+            cache_size: Maximum number of distinct raw names memoized
+        """
+        self.exact = {name.lower(): event_type for name, event_type in exact.items()}
+        self.default = default
+        self.cache_size = cache_size
+        self._pattern_types = [event_type for _, event_type in patterns]
+        self._pattern: Optional[re.Pattern] = None
+        if patterns:
+            # One alternation anchored at position 0: alternatives are tried in
+            # order, so rule priority is preserved (unlike a plain search, which
+            # would prefer the leftmost match in the string).
+            self._pattern = re.compile(
+                "|".join(
+                    f"(?=[\\s\\S]*?(?:{regex}))(?P<r{i}>)"
+                    for i, (regex, _) in enumerate(patterns)
+                )
+            )
+        self._cache: Dict[Any, str] = {}
+
+    def resolve(self, raw_name: Any) -> str:
+        """
+        Resolve a raw event name to a universal event type.
+
+        Args:
+            raw_name: Event name as found in the source event
+
+        Returns:
+            Universal event type
+        """
+        try:
+            return self._cache[raw_name]
+        except KeyError:
+            pass
+        except TypeError:  # unhashable raw name
+            return self._resolve_uncached(raw_name)
+
+        event_type = self._resolve_uncached(raw_name)
+        if len(self._cache) >= self.cache_size:
+            # Evict the oldest entry (dicts preserve insertion order)
+            del self._cache[next(iter(self._cache))]
+        self._cache[raw_name] = event_type
+        return event_type
+
+    def _resolve_uncached(self, raw_name: Any) -> str:
+        name = str(raw_name).lower() if raw_name else ""
+        event_type = self.exact.get(name)
+        if event_type is not None:
+            return event_type
+        if self._pattern is not None:
+            match = self._pattern.match(name)
+            if match is not None:
+                return self._pattern_types[int(match.lastgroup[1:])]
+        return self.default
+
+    def cache_info(self) -> Dict[str, int]:
+        """Return current cache size and bound."""
+        return {"size": len(self._cache), "max_size": self.cache_size}
@@ -10,10 +10,28 @@ Copyright: © 2025 Gi Fernando. All rights reserved.
 Date: 2025-12-27
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import json
 
+from columnar_batch import SourceColumns, UniversalColumns
+from event_id_generator import (
+    DEFAULT_DEVICE_KEYS,
+    DEFAULT_NAME_KEYS,
+    DEFAULT_TIMESTAMP_KEYS,
+    EventIdGenerator,
+)
+from event_type_resolver import EventTypeResolver
+from property_remapper import PropertyRemapper
+from timestamp_parser import TimestampParser, parse_timestamp
+
+
+# How source_metadata records lineage (mapping_config["provenance"]):
+# - "full": embed the original source event (default)
+# - "reference": store the row index of the event in its source batch/stream
+# - "none": source name only
+PROVENANCE_MODES = ("full", "reference", "none")
+
 
 class GameSourceAdapter:
     """
@@ -22,6 +40,38 @@ class GameSourceAdapter:
     Subclass this class and implement the mapping methods for your specific game source.
     """
     
+    # Event-type rules (optional), compiled into an EventTypeResolver:
+    # - event_type_exact: lowercased event name -> universal event type
+    # - event_type_patterns: ordered (regex, universal event type) fallbacks
+    event_type_exact: Dict[str, str] = {}
+    event_type_patterns: Tuple[Tuple[str, str], ...] = ()
+    event_type_default: str = "GameEvent"
+    
+    # Source keys checked (in order) for an existing event ID; events without
+    # one get an ID from the EventIdGenerator strategy
+    event_id_keys: Tuple[str, ...] = ("event_id", "id", "_id", "insert_id", "eventId")
+    
+    # Columnar hints (optional). Declaring which source columns a mapping reads
+    # lets transform_columns() work column-at-a-time instead of row-at-a-time.
+    # - event_type_columns: columns map_event_type() depends on
+    # - identifier_columns: identifier_type -> columns coalesced with `or`
+    # - timestamp_columns: columns coalesced with `or`, then parsed by the
+    #   shared TimestampParser with the same semantics as map_timestamp()
+    event_type_columns: Optional[Tuple[str, ...]] = None
+    identifier_columns: Dict[str, Tuple[str, ...]] = {}
+    timestamp_columns: Optional[Tuple[str, ...]] = None
+    
+    # Unit for numeric timestamps: "auto" (milliseconds above 1e10), "s" or "ms"
+    timestamp_numeric_unit: str = "auto"
+    
+    # CSV columns holding numbers. CSV cells are strings; only these and the
+    # timestamp_columns are converted to int/float when read from CSV exports
+    numeric_columns: Tuple[str, ...] = ()
+    
+    # Source property name -> universal property name, compiled into a
+    # PropertyRemapper (mapping_config["property_mappings"] adds/overrides entries)
+    property_mappings: Dict[str, str] = {}
+    
     def __init__(self, source_name: str, mapping_config: Dict[str, Any]):
         """
         Initialize the adapter.
@@ -29,9 +79,39 @@ class GameSourceAdapter:
         Args:
             source_name: Name of the game source (e.g., "MyGame", "AnotherGame")
             mapping_config: Configuration dictionary with mapping rules
+                (optional "provenance": one of PROVENANCE_MODES;
+                optional "event_id_strategy": "uuid4", "content_hash" or "counter"
+                and "event_id_worker", a label added to counter IDs;
+                optional "property_mappings" and "keep_unmapped_properties")
         """
         self.source_name = source_name
         self.mapping_config = mapping_config
+        self.provenance = mapping_config.get("provenance", "full")
+        if self.provenance not in PROVENANCE_MODES:
+            raise ValueError(
+                f"Unknown provenance mode {self.provenance!r}; expected one of {PROVENANCE_MODES}"
+            )
+        self.event_type_resolver = EventTypeResolver(
+            self.event_type_exact,
+            self.event_type_patterns,
+            default=self.event_type_default,
+            cache_size=mapping_config.get("event_type_cache_size", 65536)
+        )
+        self.timestamp_parser = TimestampParser(self.timestamp_numeric_unit)
+        self.event_id_generator = EventIdGenerator(
+            source_name,
+            strategy=mapping_config.get("event_id_strategy", "uuid4"),
+            id_keys=self.event_id_keys,
+            device_keys=self.identifier_columns.get("device_id", DEFAULT_DEVICE_KEYS),
+            timestamp_keys=self.timestamp_columns or DEFAULT_TIMESTAMP_KEYS,
+            name_keys=self.event_type_columns or DEFAULT_NAME_KEYS,
+            worker_id=mapping_config.get("event_id_worker")
+        )
+        self.property_remapper = PropertyRemapper(
+            {**self.property_mappings, **mapping_config.get("property_mappings", {})},
+            keep_unmapped=mapping_config.get("keep_unmapped_properties", False),
+            cache_size=mapping_config.get("property_name_cache_size", 4096)
+        )
         
     # ========================================================================
     # Event Type Mapping
@@ -125,7 +205,7 @@ class GameSourceAdapter:
     # Transformation Pipeline
     # ========================================================================
     
-    def transform_event(self, source_event: Dict[str, Any]) -> Dict[str, Any]:
+    def transform_event(self, source_event: Dict[str, Any], source_index: Optional[int] = None) -> Dict[str, Any]:
         """
         Transform a single source event to universal format.
         
@@ -142,6 +222,8 @@ class GameSourceAdapter:
         
         Args:
             source_event: Source event dictionary
+            source_index: Row index of the event in its source batch/stream
+                (recorded in "reference" provenance mode)
             
         Returns:
             Universal format event dictionary
@@ -157,34 +239,193 @@ class GameSourceAdapter:
         }
         
         # Add source metadata
-        universal_event["source_metadata"] = {
-            "source_name": self.source_name,
-            "original_event": source_event
-        }
+        universal_event["source_metadata"] = self._source_metadata(source_event, source_index)
         
         return universal_event
     
-    def transform_batch(self, source_events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def transform_batch(self, source_events: List[Dict[str, Any]], start_index: int = 0) -> List[Dict[str, Any]]:
         """
         Transform a batch of source events.
         
         Args:
             source_events: List of source event dictionaries
+            start_index: Source index of the first event (e.g. the batch's
+                offset in a stream); used by "reference" provenance
             
         Returns:
             List of universal format event dictionaries
         """
-        return [self.transform_event(event) for event in source_events]
+        return [
+            self.transform_event(event, index)
+            for index, event in enumerate(source_events, start_index)
+        ]
+    
+    def parallel(self, workers: Optional[int] = None, shard_size: int = 5000):
+        """
+        Create a process-pool executor for this adapter.
+        
+        Each worker builds its own instance of this adapter class from
+        source_name and mapping_config; output order matches input order.
+        
+        Args:
+            workers: Number of worker processes (default: CPU count)
+            shard_size: Events per task sent to a worker
+            
+        Returns:
+            ParallelTransformer (use as a context manager)
+        """
+        from parallel_executor import ParallelTransformer
+        return ParallelTransformer(
+            type(self), self.source_name, self.mapping_config,
+            workers=workers, shard_size=shard_size
+        )
+    
+    def transform_columns(self, source_data: Any, start_index: int = 0) -> UniversalColumns:
+        """
+        Transform a column-oriented batch of source events.
+        
+        Event-type mapping, identifier extraction and timestamp parsing run
+        once per column (using the columnar hints declared by the subclass)
+        rather than once per row per method. Per-event dicts, including
+        original_event, are only built when rows are requested from the result.
+        
+        Args:
+            source_data: Dict of column arrays, pandas DataFrame or pyarrow Table
+            start_index: Source index of the first row (e.g. the batch's
+                offset in a stream); used by "reference" provenance
+            
+        Returns:
+            UniversalColumns with one list per universal field
+        """
+        source = source_data if isinstance(source_data, SourceColumns) else SourceColumns(source_data)
+        columns = {
+            "event_id": self._generate_event_id_column(source),
+            "event_type": self.map_event_type_column(source),
+            "device_id": self.map_identifier_column(source, "device_id"),
+            "session_id": self.map_identifier_column(source, "session_id"),
+            "game_id": self.map_identifier_column(source, "game_id"),
+            "activity_timestamp": self.map_timestamp_column(source),
+            "properties": self.map_properties_column(source)
+        }
+        return UniversalColumns(self.source_name, columns, source, provenance=self.provenance,
+                                start_index=start_index)
+    
+    # ========================================================================
+    # Columnar Mapping
+    # ========================================================================
+    
+    def map_event_type_column(self, source: SourceColumns) -> List[str]:
+        """
+        Map the event type of every row in a columnar batch.
+        
+        With event_type_columns declared, map_event_type() is called once per
+        distinct combination of those column values; otherwise once per row.
+        """
+        if not self.event_type_columns:
+            return [self.map_event_type(source.view(i)) for i in range(len(source))]
+        
+        keys = self.event_type_columns
+        cache: Dict[Tuple[Any, ...], str] = {}
+        result = []
+        for values in zip(*(source.column(k) for k in keys)):
+            event_type = cache.get(values)
+            if event_type is None:
+                event = {k: v for k, v in zip(keys, values) if v is not None}
+                event_type = cache[values] = self.map_event_type(event)
+            result.append(event_type)
+        return result
+    
+    def map_identifier_column(self, source: SourceColumns, identifier_type: str) -> List[Optional[str]]:
+        """Map one identifier for every row in a columnar batch."""
+        keys = self.identifier_columns.get(identifier_type)
+        if keys:
+            return source.coalesce(keys)
+        return [self.map_identifier(source.view(i), identifier_type) for i in range(len(source))]
+    
+    def map_timestamp_column(self, source: SourceColumns) -> List[datetime]:
+        """
+        Map the timestamp of every row in a columnar batch.
+        
+        With timestamp_columns declared, the columns are coalesced once and
+        parsed by the shared TimestampParser (format detected once per column);
+        rows without a usable timestamp get the current time.
+        """
+        if not self.timestamp_columns:
+            return [self.map_timestamp(source.view(i)) for i in range(len(source))]
+        
+        parsed = self.timestamp_parser.to_datetimes(
+            source.coalesce(self.timestamp_columns), key=self.timestamp_columns
+        )
+        if None in parsed:
+            now = datetime.now()
+            parsed = [dt if dt is not None else now for dt in parsed]
+        return parsed
+    
+    def map_epoch_column(self, source: SourceColumns):
+        """
+        Map the timestamp of every row in a columnar batch to epoch microseconds.
+        
+        Requires timestamp_columns. Missing rows are timestamp_parser.MISSING_EPOCH.
+        
+        Returns:
+            NumPy int64 array (a list of ints when NumPy is unavailable)
+        """
+        if not self.timestamp_columns:
+            raise NotImplementedError("map_epoch_column requires timestamp_columns")
+        return self.timestamp_parser.to_epoch_us(
+            source.coalesce(self.timestamp_columns), key=self.timestamp_columns
+        )
+    
+    def map_properties_column(self, source: SourceColumns) -> List[Dict[str, Any]]:
+        """Map properties for every row in a columnar batch."""
+        return [self.map_properties(source.view(i)) for i in range(len(source))]
     
     # ========================================================================
     # Helper Methods
     # ========================================================================
     
+    def _source_metadata(self, source_event: Dict[str, Any], source_index: Optional[int]) -> Dict[str, Any]:
+        """Build source_metadata according to the provenance mode."""
+        if self.provenance == "full":
+            return {"source_name": self.source_name, "original_event": source_event}
+        if self.provenance == "reference":
+            return {"source_name": self.source_name, "source_index": source_index}
+        return {"source_name": self.source_name}
+    
+    @staticmethod
+    def resolve_original_event(
+        universal_event: Dict[str, Any],
+        source_events: List[Dict[str, Any]],
+        start_index: int = 0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Recover the source event behind a universal event.
+        
+        Works for "full" provenance (embedded event) and "reference"
+        provenance (index into source_events, offset by start_index).
+        
+        Args:
+            universal_event: Transformed universal event
+            source_events: Source batch/chunk the event came from
+            start_index: Source index of source_events[0]
+            
+        Returns:
+            Source event dictionary, or None if lineage was not retained
+        """
+        metadata = universal_event.get("source_metadata", {})
+        if "original_event" in metadata:
+            return metadata["original_event"]
+        index = metadata.get("source_index")
+        if index is None:
+            return None
+        return source_events[index - start_index]
+    
     def _generate_event_id(self, source_event: Dict[str, Any]) -> str:
         """
         Generate unique event ID from source event.
         
-        Uses source-specific identifier if available, otherwise generates UUID.
+        Uses source-specific identifier if available, otherwise generates one
+        with the configured strategy (see EventIdGenerator).
         
         Args:
             source_event: Source event dictionary
@@ -192,15 +433,13 @@ class GameSourceAdapter:
         Returns:
             Unique event ID string
         """
-        # Try to find existing event ID in source
-        event_id_keys = ["event_id", "id", "_id", "insert_id", "eventId"]
-        for key in event_id_keys:
-            if key in source_event:
-                return str(source_event[key])
-        
-        # Generate new ID (in production, use UUID)
-        import uuid
-        return str(uuid.uuid4())
+        return self.event_id_generator.generate(source_event)
+    
+    def _generate_event_id_column(self, source: SourceColumns) -> List[str]:
+        """Columnar equivalent of _generate_event_id()."""
+        return self.event_id_generator.generate_column(
+            source.first_present(self.event_id_keys), source.view
+        )
     
     def _normalize_property_name(self, source_property_name: str) -> str:
         """
@@ -212,10 +451,8 @@ class GameSourceAdapter:
         Returns:
             Normalized property name
         """
-        # Convert camelCase to snake_case
-        import re
-        s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', source_property_name)
-        return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+        # Convert camelCase to snake_case (LRU-cached per adapter)
+        return self.property_remapper.normalize(source_property_name)
     
     # ========================================================================
     # Validation
@@ -246,32 +483,33 @@ class ExampleGameAdapter(GameSourceAdapter):
     Replace with your specific game source implementation.
     """
     
+    event_type_columns = ("event_name",)
+    
+    event_type_patterns = (
+        # Session events: SessionStart / SessionEnd
+        (r"(?=.*session)(?=.*(?:start|begin|end|close))", "GameSession"),
+        # Purchase events
+        (r"purchase|iap|buy|payment", "MonetizationEvent"),
+        # Level events: LevelStart / LevelComplete / LevelFail
+        (r"(?=.*level)(?=.*(?:start|begin|complete|finish|fail))", "EngagementEvent"),
+    )
+    
+    property_mappings = {
+        "sessionCount": "session_count",
+        "session_count": "session_count",
+        "iapCount": "total_iaps",
+        "iap_count": "total_iaps",
+        "total_iaps": "total_iaps",
+        "amount": "amount",
+        "cost": "amount",
+        "price": "amount",
+        "currency": "currency",
+        "currency_code": "currency"
+    }
+    
     def map_event_type(self, source_event: Dict[str, Any]) -> str:
         """Map source event type to universal gaming event type."""
-        event_name = source_event.get("event_name", "").lower()
-        
-        # Session events
-        if "session" in event_name:
-            if "start" in event_name or "begin" in event_name:
-                return "GameSession"  # With type: "SessionStart"
-            elif "end" in event_name or "close" in event_name:
-                return "GameSession"  # With type: "SessionEnd"
-        
-        # Purchase events
-        if any(keyword in event_name for keyword in ["purchase", "iap", "buy", "payment"]):
-            return "MonetizationEvent"  # With type: "Purchase"
-        
-        # Level events
-        if "level" in event_name:
-            if "start" in event_name or "begin" in event_name:
-                return "EngagementEvent"  # With type: "LevelStart"
-            elif "complete" in event_name or "finish" in event_name:
-                return "EngagementEvent"  # With type: "LevelComplete"
-            elif "fail" in event_name:
-                return "EngagementEvent"  # With type: "LevelFail"
-        
-        # Default to generic GameEvent
-        return "GameEvent"
+        return self.event_type_resolver.resolve(source_event.get("event_name"))
     
     def map_identifier(self, source_event: Dict[str, Any], identifier_type: str) -> Optional[str]:
         """Map identifier properties."""
@@ -295,49 +533,17 @@ class ExampleGameAdapter(GameSourceAdapter):
         
         for key in timestamp_keys:
             if key in source_event:
-                timestamp_value = source_event[key]
-                
-                # Handle Unix timestamp (seconds)
-                if isinstance(timestamp_value, (int, float)):
-                    if timestamp_value > 1e10:  # Milliseconds
-                        return datetime.fromtimestamp(timestamp_value / 1000)
-                    else:  # Seconds
-                        return datetime.fromtimestamp(timestamp_value)
-                
-                # Handle ISO 8601 string
-                if isinstance(timestamp_value, str):
-                    try:
-                        return datetime.fromisoformat(timestamp_value.replace('Z', '+00:00'))
-                    except ValueError:
-                        continue
+                # Unix timestamp (seconds / milliseconds) or ISO 8601 string
+                parsed = parse_timestamp(source_event[key])
+                if parsed is not None:
+                    return parsed
         
         # Default to current time if not found
         return datetime.now()
     
     def map_properties(self, source_event: Dict[str, Any]) -> Dict[str, Any]:
         """Map all source properties to universal properties."""
-        properties = {}
-        source_props = source_event.get("properties", {})
-        
-        # Property mappings
-        property_mappings = {
-            "sessionCount": "session_count",
-            "session_count": "session_count",
-            "iapCount": "total_iaps",
-            "iap_count": "total_iaps",
-            "total_iaps": "total_iaps",
-            "amount": "amount",
-            "cost": "amount",
-            "price": "amount",
-            "currency": "currency",
-            "currency_code": "currency"
-        }
-        
-        for source_key, universal_key in property_mappings.items():
-            if source_key in source_props:
-                properties[universal_key] = source_props[source_key]
-        
-        return properties
+        return self.property_remapper.remap(source_event.get("properties", {}))
 
 
 if __name__ == "__main__":
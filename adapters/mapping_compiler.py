@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Mapping Compiler
+
+Compiles the declarative source mappings
+
+- sources/<source>/<source>_to_universal_mapping.yaml
+- mappings/<source>_to_universal.ttl
+
+into a flat, JSON-serializable adapter spec (exact event-name table,
+identifier / timestamp / event-name columns, property table) and runs it
+through MappedAdapter, a GameSourceAdapter whose mapping methods are pure
+table lookups.
+
+Compiled specs are cached on disk, keyed by the SHA-256 of the mapping file,
+so parallel workers start without re-parsing YAML/RDF.
+
+Usage:
+    adapter = load_mapped_adapter("sources/mixpanel/mixpanel_to_universal_mapping.yaml")
+    universal_events = adapter.transform_batch(source_events)
+"""
+
+import hashlib
+import json
+import os
+import re
+import warnings
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from columnar_batch import SourceColumns
+from game_source_adapter_template import GameSourceAdapter
+from property_remapper import normalize_property_name
+from timestamp_parser import parse_timestamp
+
+
+# Bump when the spec layout or compilation rules change (invalidates caches)
+COMPILER_VERSION = 3
+
+DEFAULT_CACHE_DIR = Path(os.environ.get(
+    "GAMING_MAPPING_CACHE", Path.home() / ".cache" / "gaming_ontology" / "mappings"
+))
+
+# Universal targets that are event fields rather than properties
+_IDENTIFIER_TARGETS = ("device_id", "session_id", "game_id")
+_TIMESTAMP_TARGET = "activity_timestamp"
+_EVENT_NAME_TARGET = "event_type"
+
+# Timestamp columns the hand-written adapters read, tried after the mapped ones
+# (mapping files name the logical field, e.g. "timestamp", not Mixpanel's "time")
+_TIMESTAMP_FALLBACKS = ("timestamp", "time", "ts", "ACTIVITY_TS", "activity_ts", "created_at")
+
+# Gaming foundation ontology: its rdfs:subClassOf hierarchy maps TTL event
+# classes (g:Purchase, g:LevelStart, ...) onto the universal event types
+FOUNDATION_TTL = Path(__file__).parent.parent / "ontology" / "universal" / "gaming_foundation_v1.ttl"
+
+# Event types the YAML mappings and hand-written adapters emit, most specific first
+_UNIVERSAL_EVENT_TYPES = ("GameSession", "MonetizationEvent", "EngagementEvent", "GameEvent")
+
+_TTL_COMMENT = re.compile(r"Maps\s+\w+:(\w+)\s+to\s+\w+:(\w+)")
+
+# ============================================================================
+# Naming helpers
+# ============================================================================
+
+def _local_name(term: str) -> str:
+    """"ug:GameSession" / full IRI -> "GameSession"."""
+    return re.split(r"[#/:]", str(term))[-1]
+
+
+def _field_variants(name: str) -> Tuple[str, ...]:
+    """Raw source field spellings for a logical field: snake, camel, UPPER."""
+    snake = normalize_property_name(name)
+    head, *rest = snake.split("_")
+    camel = head + "".join(part.title() for part in rest)
+    variants = []
+    for variant in (name, snake, camel, snake.upper()):
+        if variant not in variants:
+            variants.append(variant)
+    return tuple(variants)
+
+
+def _strip_prefix(name: str, prefix: str) -> str:
+    """Drop a source prefix ("mixpanel_session_count" / "mixpanelSessionCount")."""
+    if prefix and name.lower().startswith(prefix.lower()):
+        rest = name[len(prefix):].lstrip("_")
+        if rest:
+            return rest[0].lower() + rest[1:]
+    return name
+
+
+def _empty_spec(source: str) -> Dict[str, Any]:
+    return {
+        "compiler_version": COMPILER_VERSION,
+        "source": source,
+        "event_type_exact": {},
+        "event_type_default": "GameEvent",
+        "event_type_columns": [],
+        "identifier_columns": {},
+        "timestamp_columns": [],
+        "timestamp_numeric_unit": "auto",
+        "properties_fields": ["properties"],
+        "property_mappings": {},
+    }
+
+
+def _route_field(spec: Dict[str, Any], source_field: str, target: str) -> None:
+    """Place one source field -> universal target mapping in the spec."""
+    target = normalize_property_name(target)
+    variants = list(_field_variants(source_field))
+    if target in _IDENTIFIER_TARGETS:
+        spec["identifier_columns"].setdefault(target, []).extend(
+            v for v in variants if v not in spec["identifier_columns"].get(target, [])
+        )
+    elif target == _TIMESTAMP_TARGET:
+        spec["timestamp_columns"].extend(v for v in variants if v not in spec["timestamp_columns"])
+    elif target == _EVENT_NAME_TARGET:
+        spec["event_type_columns"].extend(v for v in variants if v not in spec["event_type_columns"])
+    else:
+        for variant in variants:
+            spec["property_mappings"].setdefault(variant, target)
+
+
+def _finish(spec: Dict[str, Any]) -> Dict[str, Any]:
+    if not spec["event_type_columns"]:
+        spec["event_type_columns"] = ["event_name"]
+    spec["timestamp_columns"].extend(c for c in _TIMESTAMP_FALLBACKS if c not in spec["timestamp_columns"])
+    return spec
+
+
+# ============================================================================
+# Compilers
+# ============================================================================
+
+def _source_from_path(path: Path) -> str:
+    return path.name.split("_to_universal")[0]
+
+
+class MissingTimestampError(ValueError):
+    """Raised for events without a usable timestamp when require_timestamp is set."""
+
+
+def compile_yaml_mapping(path: Any) -> Dict[str, Any]:
+    """
+    Compile a sources/*_to_universal_mapping.yaml file.
+
+    Two layouts are understood: event/property mappings keyed by
+    "<source>_<name>" (Unity, Mixpanel) and table mappings with an identity
+    section (Adinmo).
+    """
+    import yaml
+
+    path = Path(path)
+    with open(path, "r", encoding="utf-8") as f:
+        doc = yaml.safe_load(f) or {}
+    source = str(doc.get("source") or _source_from_path(path))
+    spec = _empty_spec(source)
+
+    for key, rule in (doc.get("event_mappings") or {}).items():
+        if isinstance(rule, dict) and rule.get("universal"):
+            spec["event_type_exact"][_strip_prefix(key, source).lower()] = _local_name(rule["universal"])
+
+    for key, rule in (doc.get("property_mappings") or {}).items():
+        if isinstance(rule, dict) and rule.get("universal"):
+            _route_field(spec, _strip_prefix(key, source), rule["universal"])
+
+    tables = doc.get("tables") or {}
+    if tables:
+        # One row per table: the table name is the event name, columns are top level
+        spec["event_type_columns"] = ["table"]
+        spec["properties_fields"] = []
+        spec["property_skip_none"] = True
+        for table, rule in tables.items():
+            target = ((rule or {}).get("maps_to") or {}).get("class")
+            if target:
+                spec["event_type_exact"][table.lower()] = _local_name(target)
+    for field, target in (doc.get("identity") or {}).items():
+        _route_field(spec, field, _local_name(target))
+    for rule in tables.values():
+        for field in (rule or {}).get("key_fields") or []:
+            if any(field in cols for cols in spec["identifier_columns"].values()) \
+                    or field in spec["timestamp_columns"]:
+                continue
+            target = field.lower()
+            if target in _IDENTIFIER_TARGETS:
+                _route_field(spec, field, target)
+            else:
+                spec["property_mappings"].setdefault(field, target)
+
+    return _finish(spec)
+
+
+def compile_ttl_mapping(path: Any) -> Dict[str, Any]:
+    """
+    Compile a mappings/*_to_universal.ttl graph.
+
+    Event rules come from classes equivalent to an intersection with an
+    owl:hasValue restriction on the source's event-name property. Their
+    rdfs:subClassOf target (e.g. g:Purchase) is generalized through the
+    gaming foundation hierarchy to the event type the YAML mappings and
+    hand-written adapters emit for the same events (MonetizationEvent), so
+    consumers keyed on those types see them; targets outside the foundation
+    keep their own name. Field rules come
+    from "Maps src:field to g:target" comments on the mapping properties.
+    Whole-class equivalences without a hasValue carry no event name and are
+    skipped.
+    """
+    from rdflib import Graph
+    from rdflib.collection import Collection
+    from rdflib.namespace import OWL, RDFS
+
+    path = Path(path)
+    graph = Graph()
+    graph.parse(str(path), format="turtle")
+    hierarchy = Graph()
+    if FOUNDATION_TTL.exists():
+        hierarchy.parse(str(FOUNDATION_TTL), format="turtle")
+    source = _source_from_path(path)
+    spec = _empty_spec(source)
+
+    def universal_event_type(target) -> str:
+        seen, queue = set(), [target]
+        while queue:
+            cls = queue.pop(0)
+            if _local_name(cls) in _UNIVERSAL_EVENT_TYPES:
+                return _local_name(cls)
+            if cls not in seen:
+                seen.add(cls)
+                queue.extend(hierarchy.objects(cls, RDFS.subClassOf))
+        return _local_name(target)
+
+    for cls, equivalent in graph.subject_objects(OWL.equivalentClass):
+        for members in graph.objects(equivalent, OWL.intersectionOf):
+            for member in Collection(graph, members):
+                value = graph.value(member, OWL.hasValue)
+                prop = graph.value(member, OWL.onProperty)
+                if value is None or prop is None:
+                    continue
+                for target in graph.objects(cls, RDFS.subClassOf):
+                    spec["event_type_exact"][str(value).lower()] = universal_event_type(target)
+                _route_field(spec, _strip_prefix(_local_name(prop), source), _EVENT_NAME_TARGET)
+
+    for comment in sorted(str(c) for c in graph.objects(None, RDFS.comment)):
+        match = _TTL_COMMENT.search(comment)
+        if match:
+            _route_field(spec, _strip_prefix(match.group(1), source), match.group(2))
+
+    return _finish(spec)
+
+
+def compile_mapping(path: Any) -> Dict[str, Any]:
+    """Compile a YAML or Turtle mapping file into an adapter spec."""
+    path = Path(path)
+    if path.suffix in (".yaml", ".yml"):
+        return compile_yaml_mapping(path)
+    if path.suffix == ".ttl":
+        return compile_ttl_mapping(path)
+    raise ValueError(f"Unsupported mapping file: {path}")
+
+
+# ============================================================================
+# Disk Cache
+# ============================================================================
+
+def mapping_cache_key(path: Any) -> str:
+    """Cache key: SHA-256 of the mapping file contents (plus the foundation ontology for TTL) and the compiler version."""
+    digest = hashlib.sha256(Path(path).read_bytes())
+    digest.update(f"compiler:{COMPILER_VERSION}".encode())
+    if Path(path).suffix == ".ttl" and FOUNDATION_TTL.exists():
+        digest.update(FOUNDATION_TTL.read_bytes())  # event types depend on its hierarchy
+    return digest.hexdigest()
+
+
+def load_compiled_mapping(path: Any, cache_dir: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Return the compiled spec for a mapping file, compiling it on a cache miss.
+
+    Args:
+        path: YAML or Turtle mapping file
+        cache_dir: Directory for compiled specs (default: DEFAULT_CACHE_DIR;
+            False disables the disk cache)
+
+    Returns:
+        Adapter spec dictionary
+    """
+    if cache_dir is False:
+        return compile_mapping(path)
+    cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+    cache_file = cache_dir / f"{mapping_cache_key(path)}.json"
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    spec = compile_mapping(path)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(spec, f, indent=2, sort_keys=True)
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass  # read-only cache location: still usable, just not cached
+    return spec
+
+
+# ============================================================================
+# Adapter
+# ============================================================================
+
+class MappedAdapter(GameSourceAdapter):
+    """
+    GameSourceAdapter driven entirely by a compiled mapping spec.
+
+    mapping_config keys:
+        mapping_file: YAML/Turtle mapping to compile (or)
+        mapping_spec: an already compiled spec
+        mapping_cache_dir: disk cache location (False to disable)
+        mapping_overrides: spec entries to override (e.g. timestamp_columns)
+        require_timestamp: raise MissingTimestampError for events without a
+            usable timestamp instead of warning and using the current time
+
+    Because the spec is looked up from mapping_config, the adapter can be
+    rebuilt by name in worker processes (see parallel_executor).
+    """
+
+    def __init__(self, source_name: str, mapping_config: Dict[str, Any]):
+        spec = mapping_config.get("mapping_spec")
+        if spec is None:
+            spec = load_compiled_mapping(
+                mapping_config["mapping_file"], mapping_config.get("mapping_cache_dir")
+            )
+        spec = {**spec, **mapping_config.get("mapping_overrides", {})}
+        self.spec = spec
+
+        # Instance attributes shadow the class-level rule tables read by
+        # GameSourceAdapter.__init__()
+        self.event_type_exact = spec["event_type_exact"]
+        self.event_type_default = spec["event_type_default"]
+        self.event_type_columns = tuple(spec["event_type_columns"])
+        self.identifier_columns = {k: tuple(v) for k, v in spec["identifier_columns"].items()}
+        self.timestamp_columns = tuple(spec["timestamp_columns"])
+        self.timestamp_numeric_unit = spec["timestamp_numeric_unit"]
+        self.property_mappings = spec["property_mappings"]
+        self.properties_fields = tuple(spec["properties_fields"])
+        super().__init__(source_name or spec["source"], mapping_config)
+        self.property_remapper.skip_none = spec.get("property_skip_none", False)
+        self.require_timestamp = mapping_config.get("require_timestamp", False)
+        self._warned_timestamp = False
+        if not self.event_type_exact:
+            warnings.warn(f"{self.source_name}: mapping defines no event rules; every event becomes "
+                          f"{self.event_type_default}", RuntimeWarning, stacklevel=2)
+
+    def _missing_timestamp(self, count: int = 1) -> datetime:
+        """Fail, or warn once per adapter, for events without a usable timestamp."""
+        message = (f"{self.source_name}: {count} event(s) without a usable timestamp in columns "
+                   f"{list(self.timestamp_columns)} (set mapping_overrides['timestamp_columns'])")
+        if self.require_timestamp:
+            raise MissingTimestampError(message)
+        if not self._warned_timestamp:
+            self._warned_timestamp = True
+            warnings.warn(f"{message}; using the current time", RuntimeWarning, stacklevel=3)
+        return datetime.now()
+
+    @staticmethod
+    def _first(source_event: Dict[str, Any], keys: Tuple[str, ...]) -> Any:
+        for key in keys:
+            value = source_event.get(key)
+            if value:
+                return value
+        return None
+
+    def map_event_type(self, source_event: Dict[str, Any]) -> str:
+        """Resolve the first present event-name column through the exact table."""
+        return self.event_type_resolver.resolve(self._first(source_event, self.event_type_columns))
+
+    def map_identifier(self, source_event: Dict[str, Any], identifier_type: str) -> Optional[str]:
+        """Coalesce the compiled identifier columns."""
+        keys = self.identifier_columns.get(identifier_type)
+        return self._first(source_event, keys) if keys else None
+
+    def map_timestamp(self, source_event: Dict[str, Any]) -> datetime:
+        """Coalesce and parse the compiled timestamp columns."""
+        raw = self._first(source_event, self.timestamp_columns)
+        return parse_timestamp(raw, self.timestamp_numeric_unit) or self._missing_timestamp()
+
+    def map_timestamp_column(self, source: SourceColumns) -> List[datetime]:
+        """Coalesce and parse the compiled timestamp columns of a columnar batch."""
+        parsed = self.timestamp_parser.to_datetimes(
+            source.coalesce(self.timestamp_columns), key=self.timestamp_columns
+        )
+        missing = parsed.count(None)
+        if missing:
+            now = self._missing_timestamp(missing)
+            parsed = [dt if dt is not None else now for dt in parsed]
+        return parsed
+
+    def map_properties(self, source_event: Dict[str, Any]) -> Dict[str, Any]:
+        """Remap the first non-empty properties field (or the event itself)."""
+        if not self.properties_fields:
+            return self.property_remapper.remap(source_event)
+        return self.property_remapper.remap(self._first(source_event, self.properties_fields))
+
+
+def load_mapped_adapter(
+    path: Any,
+    source_name: Optional[str] = None,
+    mapping_config: Optional[Dict[str, Any]] = None,
+    cache_dir: Optional[Any] = None,
+) -> MappedAdapter:
+    """
+    Build a ready-to-run adapter from a mapping file.
+
+    Args:
+        path: YAML or Turtle mapping file
+        source_name: Adapter source name (default: the mapping's source)
+        mapping_config: Extra adapter configuration (provenance, ID strategy, ...)
+        cache_dir: Compiled-spec cache directory (False disables it)
+
+    Returns:
+        MappedAdapter instance
+    """
+    config = dict(mapping_config or {})
+    config["mapping_file"] = str(path)
+    if cache_dir is not None:
+        config["mapping_cache_dir"] = cache_dir if cache_dir is False else str(cache_dir)
+    return MappedAdapter(source_name or "", config)
+
+
+def discover_mapping_files(repo_root: Any) -> List[Path]:
+    """List sources/*/*_to_universal_mapping.yaml and mappings/*_to_universal.ttl."""
+    root = Path(repo_root)
+    return sorted(root.glob("sources/*/*_to_universal_mapping.yaml")) + sorted(
+        root.glob("mappings/*_to_universal.ttl")
+    )
@@ -10,6 +10,7 @@ Date: 2025-12-27
 """
 
 from game_source_adapter_template import GameSourceAdapter
+from timestamp_parser import parse_timestamp
 from typing import Dict, Any, Optional
 from datetime import datetime
 
@@ -22,34 +23,72 @@ class MixpanelAdapter(GameSourceAdapter):
     Based on production Flick Solitaire data patterns.
     """
     
-    def map_event_type(self, source_event: Dict[str, Any]) -> str:
-        """Map Mixpanel event type to universal gaming event type."""
-        event_name = source_event.get("event_name", "").lower()
+    # Columnar hints (see GameSourceAdapter.transform_columns)
+    event_type_columns = ("event_name",)
+    identifier_columns = {
+        "device_id": ("distinct_id", "distinctId", "user_id"),
+    }
+    timestamp_columns = ("time", "timestamp")
+    
+    # Mixpanel typically uses seconds
+    timestamp_numeric_unit = "s"
+    
+    # Mixpanel event patterns (from Flick data)
+    event_type_exact = {
+        "session_start": "GameSession",  # Type: "SessionStart"
+        "session_end": "GameSession",  # Type: "SessionEnd"
+        "game_start": "EngagementEvent",  # Type: "GameStart"
+        "game_end": "EngagementEvent",  # Type: "GameEnd"
+        "iap_purchase": "MonetizationEvent",  # Type: "Purchase"
+        "ad_viewed": "MonetizationEvent",  # Type: "AdViewed"
+        "move": "EngagementEvent",  # Type: "Move"
+        "hint_used": "EngagementEvent",  # Type: "HintUsed"
+        "coins_earned": "MonetizationEvent",  # Type: "CoinsEarned"
+        "coins_spent": "MonetizationEvent",  # Type: "CoinsSpent"
+    }
+    
+    # Mixpanel property mappings (from Flick data patterns)
+    property_mappings = {
+        # Session properties
+        "sessionCount": "session_count",
+        "session_count": "session_count",
+        "sessionDays": "session_days",
+        "sessionDuration": "session_duration",
+        "adCount": "ad_view_count",
+        "sessionAdCount": "session_ad_count",
+        "timeSinceLastAd": "time_since_last_ad",
+        
+        # Monetization properties
+        "iapCount": "total_iaps",
+        "iap_count": "total_iaps",
+        "coins": "currency_balance",
+        "cost": "amount",
+        "item": "item_id",
+        "adType": "ad_type",
+        "adRev_total": "ad_revenue_total",
         
-        # Mixpanel event patterns (from Flick data)
-        if event_name == "session_start":
-            return "GameSession"  # Type: "SessionStart"
-        elif event_name == "session_end":
-            return "GameSession"  # Type: "SessionEnd"
-        elif event_name == "game_start":
-            return "EngagementEvent"  # Type: "GameStart"
-        elif event_name == "game_end":
-            return "EngagementEvent"  # Type: "GameEnd"
-        elif event_name == "iap_purchase":
-            return "MonetizationEvent"  # Type: "Purchase"
-        elif event_name == "ad_viewed":
-            return "MonetizationEvent"  # Type: "AdViewed"
-        elif event_name == "move":
-            return "EngagementEvent"  # Type: "Move"
-        elif event_name == "hint_used":
-            return "EngagementEvent"  # Type: "HintUsed"
-        elif event_name == "coins_earned":
-            return "MonetizationEvent"  # Type: "CoinsEarned"
-        elif event_name == "coins_spent":
-            return "MonetizationEvent"  # Type: "CoinsSpent"
+        # Gameplay properties
+        "game": "game_type",
+        "difficulty": "difficulty",
+        "cards_total": "cards_total",
+        "cards_free": "cards_free",
+        "moveCount": "move_count",
+        "hintsUsed": "hints_used",
+        "result": "game_result",
+        "progress": "progress",
+        "levelNumber": "level_number",
         
-        # Default
-        return "GameEvent"
+        # Mixpanel metadata (preserve)
+        "$lib_version": "lib_version",
+        "$app_version": "app_version",
+        "$manufacturer": "manufacturer",
+        "$model": "device_model",
+        "$os": "device_os"
+    }
+    
+    def map_event_type(self, source_event: Dict[str, Any]) -> str:
+        """Map Mixpanel event type to universal gaming event type."""
+        return self.event_type_resolver.resolve(source_event.get("event_name"))
     
     def map_identifier(self, source_event: Dict[str, Any], identifier_type: str) -> Optional[str]:
         """Map Mixpanel identifier properties."""
@@ -72,65 +111,10 @@ class MixpanelAdapter(GameSourceAdapter):
         # Mixpanel uses "time" field (Unix timestamp in seconds)
         timestamp = source_event.get("time") or source_event.get("timestamp")
         
-        if timestamp:
-            if isinstance(timestamp, (int, float)):
-                # Mixpanel typically uses seconds
-                return datetime.fromtimestamp(timestamp)
-            elif isinstance(timestamp, str):
-                try:
-                    return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                except ValueError:
-                    pass
-        
-        return datetime.now()
+        return parse_timestamp(timestamp, self.timestamp_numeric_unit) or datetime.now()
     
     def map_properties(self, source_event: Dict[str, Any]) -> Dict[str, Any]:
         """Map Mixpanel properties to universal properties."""
-        properties = {}
         source_props = source_event.get("properties", {})
-        
-        # Mixpanel property mappings (from Flick data patterns)
-        property_mappings = {
-            # Session properties
-            "sessionCount": "session_count",
-            "session_count": "session_count",
-            "sessionDays": "session_days",
-            "sessionDuration": "session_duration",
-            "adCount": "ad_view_count",
-            "sessionAdCount": "session_ad_count",
-            "timeSinceLastAd": "time_since_last_ad",
-            
-            # Monetization properties
-            "iapCount": "total_iaps",
-            "iap_count": "total_iaps",
-            "coins": "currency_balance",
-            "cost": "amount",
-            "item": "item_id",
-            "adType": "ad_type",
-            "adRev_total": "ad_revenue_total",
-            
-            # Gameplay properties
-            "game": "game_type",
-            "difficulty": "difficulty",
-            "cards_total": "cards_total",
-            "cards_free": "cards_free",
-            "moveCount": "move_count",
-            "hintsUsed": "hints_used",
-            "result": "game_result",
-            "progress": "progress",
-            "levelNumber": "level_number",
-            
-            # Mixpanel metadata (preserve)
-            "$lib_version": "lib_version",
-            "$app_version": "app_version",
-            "$manufacturer": "manufacturer",
-            "$model": "device_model",
-            "$os": "device_os"
-        }
-        
-        for mixpanel_key, universal_key in property_mappings.items():
-            if mixpanel_key in source_props:
-                properties[universal_key] = source_props[mixpanel_key]
-        
-        return properties
+        return self.property_remapper.remap(source_props)
 
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Parallel Transform Executor
+
+Shards source event batches across a process pool. Each worker builds its own
+adapter instance from (adapter class, source_name, mapping_config) once, at
+pool start-up, so any GameSourceAdapter subclass works unchanged. Results are
+returned in input order.
+"""
+
+import multiprocessing
+import os
+import sys
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from game_source_adapter_template import GameSourceAdapter
+
+
+DEFAULT_SHARD_SIZE = 5000
+
+# Adapter instance owned by each worker process
+_worker_adapter: Optional[GameSourceAdapter] = None
+
+
+def _init_worker(module_name: str, class_name: str, source_name: str,
+                 mapping_config: Dict[str, Any], import_paths: List[str]) -> None:
+    """Build the worker's adapter (import by name so "spawn" start methods work)."""
+    global _worker_adapter
+    import importlib
+
+    for path in reversed(import_paths):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    adapter_cls = getattr(importlib.import_module(module_name), class_name)
+    _worker_adapter = adapter_cls(source_name=source_name, mapping_config=mapping_config)
+
+
+def _transform_shard(shard: List[Dict[str, Any]], start_index: int = 0) -> List[Dict[str, Any]]:
+    return _worker_adapter.transform_batch(shard, start_index)
+
+
+class ParallelTransformer:
+    """
+    Process-pool executor for GameSourceAdapter.transform_batch().
+
+    Usage:
+        with ParallelTransformer(MixpanelAdapter, "Mixpanel", {}) as executor:
+            universal_events = executor.transform_batch(source_events)
+    """
+
+    def __init__(
+        self,
+        adapter_cls: Type[GameSourceAdapter],
+        source_name: str,
+        mapping_config: Dict[str, Any],
+        workers: Optional[int] = None,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        max_in_flight: Optional[int] = None,
+    ):
+        """
+        Initialize the executor and start its worker pool.
+
+        Args:
+            adapter_cls: Adapter class (must be importable at module level)
+            source_name: Passed to each worker's adapter
+            mapping_config: Passed to each worker's adapter (must be picklable)
+            workers: Number of worker processes (default: CPU count)
+            shard_size: Events per task sent to a worker
+            max_in_flight: Maximum shards submitted but not yet yielded
+                (default: 2 * workers); bounds memory when streaming
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_size = shard_size
+        self.max_in_flight = max_in_flight or 2 * self.workers
+        import_paths = [os.path.dirname(os.path.abspath(sys.modules[adapter_cls.__module__].__file__))]
+        import_paths.append(os.path.dirname(os.path.abspath(__file__)))
+        self._pool = multiprocessing.get_context().Pool(
+            self.workers,
+            initializer=_init_worker,
+            initargs=(adapter_cls.__module__, adapter_cls.__qualname__, source_name,
+                      mapping_config, import_paths),
+        )
+
+    def __enter__(self) -> "ParallelTransformer":
+        return self
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
+
+    def close(self) -> None:
+        """Shut down the worker pool after outstanding shards finish."""
+        self._pool.close()
+        self._pool.join()
+
+    def terminate(self) -> None:
+        """Stop the worker pool immediately, discarding outstanding shards."""
+        self._pool.terminate()
+        self._pool.join()
+
+    def _shards(self, source_events: List[Dict[str, Any]], offset: int = 0) -> Iterator[Tuple[List[Dict[str, Any]], int]]:
+        """Yield (shard, source index of its first event)."""
+        for start in range(0, len(source_events), self.shard_size):
+            yield source_events[start:start + self.shard_size], offset + start
+
+    def _ordered(self, shards: Iterable[Tuple[List[Dict[str, Any]], int]]) -> Iterator[List[Dict[str, Any]]]:
+        """Submit shards with a bounded window and yield results in submission order."""
+        pending: Deque[Any] = deque()
+        for shard, start_index in shards:
+            pending.append(self._pool.apply_async(_transform_shard, (shard, start_index)))
+            if len(pending) >= self.max_in_flight:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+    def transform_batch(self, source_events: List[Dict[str, Any]], start_index: int = 0) -> List[Dict[str, Any]]:
+        """
+        Transform a batch in parallel.
+
+        Args:
+            source_events: List of source event dictionaries
+            start_index: Source index of the first event ("reference" provenance)
+
+        Returns:
+            Universal events, in the same order as source_events
+        """
+        universal_events: List[Dict[str, Any]] = []
+        for result in self._ordered(self._shards(source_events, start_index)):
+            universal_events.extend(result)
+        return universal_events
+
+    def transform_chunks(self, chunks: Iterable[List[Dict[str, Any]]]) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Transform a stream of chunks in parallel.
+
+        Chunks are re-split into shards; transformed shards are yielded in
+        input order. Compatible with streaming_pipeline.run_pipeline(transform=...).
+        """
+        def shard_stream() -> Iterator[Tuple[List[Dict[str, Any]], int]]:
+            offset = 0
+            for chunk in chunks:
+                yield from self._shards(chunk, offset)
+                offset += len(chunk)
+
+        return self._ordered(shard_stream())
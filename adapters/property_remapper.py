@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Property Remapper
+
+Shared source -> universal property-name remapping for game source adapters.
+Each adapter declares its mapping table once; the remapper compiles it at
+construction and, per event, only looks at the keys the event actually has.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Mapping, Optional
+
+
+_CAMEL_WORD = re.compile(r"(.)([A-Z][a-z]+)")
+_CAMEL_BOUNDARY = re.compile(r"([a-z0-9])([A-Z])")
+
+
+def normalize_property_name(name: str) -> str:
+    """
+    Convert a camelCase / PascalCase property name to snake_case.
+
+    Args:
+        name: Original property name
+
+    Returns:
+        Normalized property name
+    """
+    return _CAMEL_BOUNDARY.sub(r"\1_\2", _CAMEL_WORD.sub(r"\1_\2", name)).lower()
+
+
+class PropertyRemapper:
+    """
+    Compiled property remapping table.
+
+    remap() is equivalent to the classic loop
+
+        for source_key, universal_key in mappings.items():
+            if source_key in source_props:
+                properties[universal_key] = source_props[source_key]
+
+    (same keys and values; when several source keys feed one universal key
+    the later table entry still wins) but, for events smaller than the
+    table, only visits the keys the event actually has. Output keys follow
+    the event's key order in that case.
+    """
+
+    def __init__(
+        self,
+        mappings: Mapping[str, str],
+        skip_none: bool = False,
+        keep_unmapped: bool = False,
+        cache_size: int = 4096,
+    ):
+        """
+        Initialize the remapper.
+
+        Args:
+            mappings: Source property name -> universal property name, in
+                priority order (later entries win for a shared universal name)
+            skip_none: Ignore source properties whose value is None
+            keep_unmapped: Carry unmapped properties through under their
+                normalized (snake_case) names
+            cache_size: Bound of the LRU cache for normalized names
+        """
+        self.mappings = dict(mappings)
+        self.skip_none = skip_none
+        self.keep_unmapped = keep_unmapped
+        self.normalize: Callable[[str], str] = lru_cache(maxsize=cache_size)(normalize_property_name)
+        self._table = tuple(self.mappings.items())
+        self._priority = {key: i for i, key in enumerate(self.mappings)}
+
+    def remap(self, source_props: Optional[Mapping[str, Any]]) -> Dict[str, Any]:
+        """
+        Remap one event's properties.
+
+        Args:
+            source_props: Source property dictionary (None treated as empty)
+
+        Returns:
+            Dictionary of universal properties
+        """
+        if not source_props:
+            return {}
+        mappings = self.mappings
+
+        if len(source_props) > len(mappings) and not self.keep_unmapped:
+            # Event wider than the table: probe the table instead
+            if self.skip_none:
+                get = source_props.get
+                return {target: value for key, target in self._table if (value := get(key)) is not None}
+            return {target: source_props[key] for key, target in self._table if key in source_props}
+
+        if self.skip_none:
+            hits = [key for key in source_props if key in mappings and source_props[key] is not None]
+        else:
+            hits = [key for key in source_props if key in mappings]
+        properties = {mappings[key]: source_props[key] for key in hits}
+        if len(properties) < len(hits):
+            # Several source keys hit one universal key: table order decides
+            hits.sort(key=self._priority.__getitem__)
+            for key in hits:
+                properties[mappings[key]] = source_props[key]
+
+        if self.keep_unmapped:
+            for key in source_props:
+                if key not in mappings:
+                    value = source_props[key]
+                    if value is not None or not self.skip_none:
+                        properties.setdefault(self.normalize(key), value)
+        return properties
+
+    def cache_info(self):
+        """Return LRU statistics of the normalized-name cache."""
+        return self.normalize.cache_info()
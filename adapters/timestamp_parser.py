@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Timestamp Parser
+
+Shared timestamp parsing for game source adapters.
+
+- parse_timestamp(): scalar parser (the per-row "slow path") implementing the
+  seconds / milliseconds / ISO-8601 sniffing every adapter used to re-implement.
+- TimestampParser: column parser that detects the format once per column
+  (cached per source column), converts whole arrays to epoch microseconds with
+  NumPy, and only falls back to parse_timestamp() for rows that don't fit the
+  detected format.
+
+NumPy is optional; without it the column parser degrades to the scalar path.
+"""
+
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+
+# Values above this are treated as epoch milliseconds by the "auto" unit
+MILLISECONDS_THRESHOLD = 1e10
+
+# Epoch value used for rows that could not be parsed
+MISSING_EPOCH = -(2 ** 63)
+
+# ISO-8601 forms that NumPy and datetime.fromisoformat() parse identically:
+# a full date, optional time, optional trailing "Z" (UTC) and no UTC offset.
+# Group 1 captures the "Z".
+_ISO_FAST = re.compile(
+    r"^\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?(Z)?)?\Z"
+)
+
+# Epoch microseconds of datetime.min: NumPy parses year 0000, datetime cannot
+_MIN_ISO_EPOCH = -62135596800 * 10**6
+
+_NUMBER_TYPES = (int, float)
+_DETECT_SAMPLE = 64
+
+
+def parse_timestamp(value: Any, numeric_unit: str = "auto") -> Optional[datetime]:
+    """
+    Parse a single raw timestamp value.
+
+    Args:
+        value: datetime, Unix timestamp (seconds or milliseconds) or ISO-8601 string
+        numeric_unit: "auto" (milliseconds above 1e10, else seconds), "s" or "ms"
+
+    Returns:
+        datetime, or None if the value is missing or unparseable
+    """
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, _NUMBER_TYPES) and not isinstance(value, bool):
+        if numeric_unit == "ms" or (numeric_unit == "auto" and value > MILLISECONDS_THRESHOLD):
+            value = value / 1000
+        try:
+            return datetime.fromtimestamp(value)
+        except (ValueError, OverflowError, OSError):  # out of platform range
+            return None
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return None
+
+
+def _classify(value: Any) -> Optional[str]:
+    if isinstance(value, datetime):
+        return "datetime"
+    if isinstance(value, _NUMBER_TYPES) and not isinstance(value, bool):
+        return "epoch"
+    if isinstance(value, str):
+        # Strings outside the fast form (e.g. with UTC offsets) take the slow path
+        match = _ISO_FAST.match(value)
+        if match is None:
+            return "mixed"
+        return "iso8601_utc" if match.group(1) else "iso8601"
+    return None
+
+
+class TimestampParser:
+    """
+    Vectorized column timestamp parser.
+
+    Formats: "epoch" (numbers), "iso8601" / "iso8601_utc" (naive / "Z"
+    strings in the fast form), "datetime" (datetime objects) and "mixed".
+    Detection takes the majority format of the first non-missing values of a
+    column and is cached per key (typically the source column name); it is
+    re-run when most rows of a column stop fitting the cached format.
+    """
+
+    def __init__(self, numeric_unit: str = "auto"):
+        """
+        Initialize the parser.
+
+        Args:
+            numeric_unit: Unit for numeric timestamps ("auto", "s" or "ms")
+        """
+        self.numeric_unit = numeric_unit
+        self._formats: Dict[Any, str] = {}
+        self.stats = {"fast_rows": 0, "slow_rows": 0, "detections": 0}
+
+    # ========================================================================
+    # Format Detection
+    # ========================================================================
+
+    def detect_format(self, values: Sequence[Any], key: Any = None) -> str:
+        """
+        Detect (or return the cached) format of a column.
+
+        Args:
+            values: Raw column values
+            key: Cache key, e.g. the source column name
+
+        Returns:
+            One of "epoch", "iso8601", "iso8601_utc", "datetime", "mixed"
+        """
+        if key is not None and key in self._formats:
+            return self._formats[key]
+
+        counts: Dict[Optional[str], int] = {}
+        sampled = 0
+        for value in values:
+            if value:
+                kind = _classify(value)
+                counts[kind] = counts.get(kind, 0) + 1
+                sampled += 1
+                if sampled >= _DETECT_SAMPLE:
+                    break
+        # Majority format wins; rows that don't fit it take the slow path
+        fmt = max(counts, key=counts.get) if counts else None
+        if fmt is None:
+            fmt = "mixed"
+        self.stats["detections"] += 1
+        if key is not None:
+            self._formats[key] = fmt
+        return fmt
+
+    def format_cache_info(self) -> Dict[Any, str]:
+        """Return the cached format per key."""
+        return dict(self._formats)
+
+    def _check_fit(self, key: Any, fitted: int, total: int) -> None:
+        # Forget a cached format once most rows fall back to the slow path
+        if key is not None and total and fitted * 2 < total:
+            self._formats.pop(key, None)
+
+    # ========================================================================
+    # Epoch Conversion
+    # ========================================================================
+
+    def to_epoch_us(self, values: Sequence[Any], key: Any = None):
+        """
+        Convert a column to epoch microseconds.
+
+        Naive ISO-8601 strings are interpreted as UTC. Missing or unparseable
+        rows are set to MISSING_EPOCH.
+
+        Args:
+            values: Raw column values
+            key: Format cache key
+
+        Returns:
+            NumPy int64 array (or a list of ints without NumPy)
+        """
+        if np is None:
+            return [self._scalar_epoch_us(v) for v in values]
+
+        n = len(values)
+        out = np.full(n, MISSING_EPOCH, dtype=np.int64)
+        fmt = self.detect_format(values, key)
+
+        if fmt == "epoch":
+            if isinstance(values, np.ndarray) and values.dtype.kind in "iuf":
+                raw = values.astype(np.float64)
+                fast = np.isfinite(raw) & (raw != 0)
+            else:
+                fast = np.fromiter(
+                    (type(v) in _NUMBER_TYPES and bool(v) for v in values), dtype=bool, count=n
+                )
+                raw = np.array(
+                    [v if f else 0 for v, f in zip(values, fast)], dtype=np.float64
+                )
+                fast &= np.isfinite(raw)
+            # NaN / inf rows go through the scalar fallback (-> MISSING_EPOCH)
+            out[fast] = np.rint(self._epoch_seconds(raw[fast]) * 1e6).astype(np.int64)
+        elif fmt in ("iso8601", "iso8601_utc"):
+            fast, _ = self._iso_fast_rows(values, out)
+        else:
+            self.stats["slow_rows"] += n
+            return np.fromiter(map(self._scalar_epoch_us, values), dtype=np.int64, count=n)
+
+        slow = np.flatnonzero(~fast)
+        self.stats["fast_rows"] += n - len(slow)
+        self.stats["slow_rows"] += len(slow)
+        for i in slow.tolist():
+            out[i] = self._scalar_epoch_us(values[i])
+        self._check_fit(key, n - len(slow), n)
+        return out
+
+    def _epoch_seconds(self, raw):
+        if self.numeric_unit == "ms":
+            return raw / 1000
+        if self.numeric_unit == "s":
+            return raw
+        return np.where(raw > MILLISECONDS_THRESHOLD, raw / 1000, raw)
+
+    def _iso_fast_rows(self, values: Sequence[Any], out):
+        """
+        Bulk-parse ISO strings in the fast form; returns (fast mask, UTC mask).
+
+        Rows are checked against _ISO_FAST first (NumPy accepts strings that
+        parse_timestamp() rejects, such as leading spaces or signed years);
+        the matching rows are parsed by NumPy in one call, or one by one if
+        that fails (e.g. an impossible date). Rows that don't fit, or fall
+        outside datetime's range, are left to the slow path.
+        """
+        n = len(values)
+        fast = np.zeros(n, dtype=bool)
+        utc = np.zeros(n, dtype=bool)
+        if all(type(v) is str for v in values):
+            idx = None
+            strings = values
+        else:
+            idx = np.fromiter((i for i, v in enumerate(values) if type(v) is str), dtype=np.intp)
+            strings = [values[i] for i in idx]
+        if not len(strings):
+            return fast, utc
+
+        match = _ISO_FAST.match
+        rows, text, z = [], [], []
+        for pos, value in enumerate(strings):
+            m = match(value)
+            if m is not None:
+                rows.append(pos)
+                text.append(value[:-1] if m.group(1) else value)
+                z.append(m.group(1) is not None)
+        if not rows:
+            return fast, utc
+
+        try:
+            parsed = np.array(text, dtype="datetime64[us]").astype(np.int64)
+            ok = np.ones(len(text), dtype=bool)
+        except ValueError:
+            # Some row is out of calendar range: parse the matching rows one by one
+            parsed = np.full(len(text), MISSING_EPOCH, dtype=np.int64)
+            ok = np.zeros(len(text), dtype=bool)
+            for pos, value in enumerate(text):
+                try:
+                    parsed[pos] = np.datetime64(value, "us").astype(np.int64)
+                except ValueError:
+                    continue
+                ok[pos] = True
+        ok &= parsed >= _MIN_ISO_EPOCH
+
+        rows = np.asarray(rows, dtype=np.intp)[ok]
+        target = rows if idx is None else idx[rows]
+        out[target] = parsed[ok]
+        fast[target] = True
+        utc[target] = np.asarray(z, dtype=bool)[ok]
+        return fast, utc
+
+    def _scalar_epoch_us(self, value: Any) -> int:
+        parsed = parse_timestamp(value, self.numeric_unit)
+        if parsed is None:
+            return MISSING_EPOCH
+        if parsed.tzinfo is None and not isinstance(value, _NUMBER_TYPES):
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(round(parsed.timestamp() * 1e6))
+
+    # ========================================================================
+    # Datetime Conversion
+    # ========================================================================
+
+    def to_datetimes(self, values: Sequence[Any], key: Any = None) -> List[Optional[datetime]]:
+        """
+        Convert a column to datetimes with the same semantics as parse_timestamp().
+
+        Naive ISO-8601 columns are parsed in bulk with NumPy. Other formats are
+        converted once per distinct raw value: Unix timestamps map to local
+        naive datetimes and "Z" strings to aware UTC datetimes, neither of
+        which NumPy can produce faster than the scalar parser.
+
+        Args:
+            values: Raw column values
+            key: Format cache key
+
+        Returns:
+            List of datetimes (None where missing or unparseable)
+        """
+        fmt = self.detect_format(values, key)
+        unit = self.numeric_unit
+
+        if fmt == "iso8601" and np is not None:
+            n = len(values)
+            epoch = np.full(n, MISSING_EPOCH, dtype=np.int64)
+            fast, utc = self._iso_fast_rows(values, epoch)
+            fast &= ~utc
+            result = epoch.astype("datetime64[us]").tolist()
+            slow = np.flatnonzero(~fast)
+            for i in slow.tolist():
+                result[i] = parse_timestamp(values[i], unit)
+            self.stats["fast_rows"] += n - len(slow)
+            self.stats["slow_rows"] += len(slow)
+            self._check_fit(key, n - len(slow), n)
+            return result
+
+        if fmt == "datetime":
+            return [v if isinstance(v, datetime) else parse_timestamp(v, unit) for v in values]
+
+        # Memoize per distinct raw value (timestamps repeat heavily at
+        # second granularity)
+        cache: Dict[Any, Optional[datetime]] = {}
+        result = []
+        append = result.append
+        for value in values:
+            try:
+                parsed = cache.get(value, cache)
+            except TypeError:  # unhashable raw value
+                parsed = parse_timestamp(value, unit)
+            else:
+                if parsed is cache:
+                    parsed = cache[value] = parse_timestamp(value, unit)
+            append(parsed)
+        return result
@@ -9,11 +9,86 @@ Copyright: © 2025 Gi Fernando. All rights reserved.
 Date: 2025-12-27
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+from bisect import bisect_left
 import json
 
 
+class GameEventTimeline:
+    """
+    Sorted index of game events by timestamp for nearest-event lookups.
+    
+    Each event timestamp is parsed once. Events sharing a timestamp collapse
+    into one entry that remembers the earliest event (by input order), so
+    lookups resolve ties exactly like a linear scan that keeps the first
+    closest event.
+    """
+    
+    def __init__(self, game_events: List[Dict[str, Any]], timestamps: List[Optional[float]]):
+        """
+        Build the timeline.
+        
+        Args:
+            game_events: Game events in input order
+            timestamps: Parsed timestamp per event (None if unparseable)
+        """
+        first_index: Dict[float, int] = {}
+        for i, ts in enumerate(timestamps):
+            # Skip unparseable and NaN timestamps (they never match)
+            if ts is None or ts != ts:
+                continue
+            if ts not in first_index:
+                first_index[ts] = i
+        
+        self.game_events = game_events
+        self.times = sorted(first_index)
+        self.first_index = [first_index[ts] for ts in self.times]
+    
+    def __len__(self) -> int:
+        return len(self.times)
+    
+    def nearest(self, timestamp: float, tolerance_seconds: float) -> Optional[Tuple[int, float]]:
+        """
+        Find the closest event within tolerance.
+        
+        Args:
+            timestamp: Timestamp to match
+            tolerance_seconds: Maximum allowed absolute time difference
+            
+        Returns:
+            (event index, time difference), or None if nothing is within tolerance
+        """
+        times = self.times
+        if not times:
+            return None
+        
+        pos = bisect_left(times, timestamp)
+        left = pos - 1
+        right = pos
+        best_diff = float('inf')
+        if left >= 0:
+            best_diff = abs(timestamp - times[left])
+        if right < len(times):
+            best_diff = min(best_diff, abs(timestamp - times[right]))
+        if not best_diff <= tolerance_seconds:
+            return None
+        
+        # Every timestamp at the minimal distance competes; the earliest event
+        # wins. Floating-point rounding can make neighbours tie, so walk
+        # outwards while the distance stays equal.
+        best_index = None
+        while left >= 0 and abs(timestamp - times[left]) == best_diff:
+            if best_index is None or self.first_index[left] < best_index:
+                best_index = self.first_index[left]
+            left -= 1
+        while right < len(times) and abs(timestamp - times[right]) == best_diff:
+            if best_index is None or self.first_index[right] < best_index:
+                best_index = self.first_index[right]
+            right += 1
+        return best_index, best_diff
+
+
 class VideoAdapter:
     """
     Adapter for processing video data of people playing games.
@@ -82,22 +157,21 @@ class VideoAdapter:
         """
         correlated_events = []
         
+        # Parse each game event timestamp once and sort: O((N+M) log M) overall
+        timeline = GameEventTimeline(
+            game_events,
+            [self._extract_game_event_timestamp(game_event) for game_event in game_events]
+        )
+        
         for frame in video_frames:
             frame_timestamp = frame.get("timestamp", 0.0)
             
             # Find closest game event
-            closest_event = None
-            min_time_diff = float('inf')
-            
-            for game_event in game_events:
-                game_timestamp = self._extract_game_event_timestamp(game_event)
-                if game_timestamp is None:
-                    continue
-                
-                time_diff = abs(frame_timestamp - game_timestamp)
-                if time_diff < min_time_diff and time_diff <= tolerance_seconds:
-                    min_time_diff = time_diff
-                    closest_event = game_event
+            match = timeline.nearest(frame_timestamp, tolerance_seconds)
+            if match is None:
+                continue
+            event_index, min_time_diff = match
+            closest_event = game_events[event_index]
             
             if closest_event:
                 correlation_score = 1.0 - (min_time_diff / tolerance_seconds)
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+
+asv-style benchmarks (setup excluded from timing, repeated runs, results
+as JSON) for the ontology tooling and the adapters, without extra
+dependencies:
+
+- parse.<file>: Turtle parse of every .ttl under ontology/ (no caches)
+- build_release: release build from the in-tree ontology files
+- validate_coverage / validate_extensibility: full validator runs
+- transform_batch.<Adapter>: synthetic events (default 1,000,000 per
+  adapter). One chunk of 50,000 distinct events is generated and replayed
+  until the total is reached, so event IDs repeat across chunks; results
+  record this as "distinct_units"
+- video_correlate.<n>: VideoAdapter.correlate_with_game_events at several
+  scales
+
+Each run writes benchmark_results/<UTC timestamp>.json (environment +
+per-benchmark timings; the directory is git-ignored, results are
+machine-specific) and, when an earlier result from the same platform, CPU
+count and Python version exists, prints the ratio against it and flags
+regressions.
+
+Usage:
+    python scripts/benchmarks.py                      # everything
+    python scripts/benchmarks.py -k parse -k video    # name filters
+    python scripts/benchmarks.py --events 100000 --repeat 5
+    python scripts/benchmarks.py --compare benchmark_results/2026-01-01T00-00-00.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT / "adapters"))
+
+import rdflib
+from rdflib import Graph
+
+from adinmo_adapter import AdinmoAdapter
+from game_source_adapter_template import ExampleGameAdapter
+from mixpanel_adapter import MixpanelAdapter
+from unity_adapter import UnityAnalyticsAdapter
+from video_adapter import VideoAdapter
+
+import build_universal_release
+import ontology_loader
+import validate_extensibility
+import validate_universal_coverage
+
+
+DEFAULT_RESULTS_DIR = REPO_ROOT / "benchmark_results"
+DEFAULT_EVENTS = 1_000_000
+CHUNK_SIZE = 50_000
+VIDEO_SCALES = (1_000, 10_000, 100_000)
+REGRESSION_THRESHOLD = 1.2
+
+
+class Benchmark:
+    """One named measurement: setup() -> state, run(state) is timed."""
+
+    def __init__(self, name: str, run: Callable[[Any], Any],
+                 setup: Callable[[], Any] = lambda: None, repeat: Optional[int] = None,
+                 units: Optional[int] = None, distinct_units: Optional[int] = None):
+        self.name = name
+        self.run = run
+        self.setup = setup
+        self.repeat = repeat
+        self.units = units  # items processed per run (for throughput)
+        self.distinct_units = distinct_units  # distinct items when a smaller dataset is replayed
+
+
+def _quiet(fn: Callable[[], Any]) -> Any:
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        return fn()
+
+
+# ============================================================================
+# Synthetic data
+# ============================================================================
+
+_EVENT_NAMES = ("session_start", "level_start", "level_complete", "iap_purchase", "move", "session_end")
+
+
+def _synthetic_events(adapter_class, n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Deterministic source-shaped events for an adapter."""
+    rng = random.Random(seed)
+    base_ts = 1_699_123_456
+    events = []
+    for i in range(n):
+        name = _EVENT_NAMES[rng.randrange(len(_EVENT_NAMES))]
+        user = f"user{rng.randrange(10_000)}"
+        ts = base_ts + i
+        if adapter_class is UnityAnalyticsAdapter:
+            events.append({"event_id": f"u{i}", "event_name": name, "user_id": user,
+                           "session_id": f"s{i // 20}", "timestamp": ts,
+                           "parameters": {"level_number": i % 50, "amount": 0.99, "currency": "USD"}})
+        elif adapter_class is MixpanelAdapter:
+            events.append({"event_id": f"m{i}", "event_name": name, "distinct_id": user, "time": ts,
+                           "properties": {"sessionCount": i % 100, "cost": 4.99, "game_id": "g1"}})
+        elif adapter_class is AdinmoAdapter:
+            events.append({"event_id": f"a{i}", "table": "tracker_events",
+                           "EVENT_TYPE": ("click", "impression", "video_complete")[i % 3],
+                           "ANON_DEVICE_ID": user, "SESSION_ID": f"s{i // 20}", "GAME_ID": 42,
+                           "ACTIVITY_TS": ts, "AD_TYPE": "banner", "COUNTRY": "gb"})
+        else:
+            events.append({"event_id": f"e{i}", "event_name": name, "user_id": user, "timestamp": ts,
+                           "properties": {"iapCount": i % 3}})
+    return events
+
+
+def _video_data(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    frames = [{"frame_number": i, "timestamp": i * 0.5} for i in range(n)]
+    events = []
+    for i in range(n):
+        ts = rng.uniform(0, n * 0.5)
+        # Half numeric, half ISO strings, as adapters emit both
+        stamp = ts if i % 2 else datetime.fromtimestamp(ts, timezone.utc).isoformat()
+        events.append({"event_id": f"g{i}", "activity_timestamp": stamp})
+    return frames, events
+
+
+# ============================================================================
+# Benchmark definitions
+# ============================================================================
+
+def _release_config(tmp: Path):
+    ontology = REPO_ROOT / "ontology"
+    return build_universal_release.BuildConfig(
+        repo_root=tmp,
+        core_ttl=ontology / "gaming_ontology_v1.ttl",
+        universal_hb_ttl=ontology / "universal" / "human_behavior_foundation.ttl",
+        universal_gaming_ttl=ontology / "universal" / "gaming_foundation_v1.ttl",
+        out_canonical=tmp / "release.ttl",
+        out_docker_copy=tmp / "docker.ttl",
+    )
+
+
+def _transform_all(adapter, chunk: List[Dict[str, Any]], total: int) -> int:
+    done = 0
+    while done < total:
+        size = min(len(chunk), total - done)
+        adapter.transform_batch(chunk[:size] if size < len(chunk) else chunk, start_index=done)
+        done += size
+    return done
+
+
+def collect_benchmarks(events: int = DEFAULT_EVENTS,
+                       video_scales=VIDEO_SCALES) -> Iterator[Benchmark]:
+    """All benchmarks, in run order."""
+    for path in sorted((REPO_ROOT / "ontology").rglob("*.ttl")):
+        rel = path.relative_to(REPO_ROOT / "ontology").as_posix()
+        yield Benchmark(f"parse.{rel}", lambda _, p=path: Graph().parse(str(p), format="turtle"))
+
+    # build_release only builds the graph; the output paths are never written
+    config = _release_config(Path(tempfile.gettempdir()) / "benchmarks")
+    yield Benchmark("build_release", lambda _: build_universal_release.build_release(config))
+
+    def validator(fn):
+        def run(_):
+            ontology_loader.clear_memo()  # snapshot-cached loads, not in-process memo hits
+            return _quiet(fn)
+        return run
+
+    yield Benchmark("validate_coverage", validator(validate_universal_coverage.validate_coverage))
+    yield Benchmark("validate_extensibility", validator(validate_extensibility.validate_extensibility))
+
+    for adapter_class in (UnityAnalyticsAdapter, MixpanelAdapter, AdinmoAdapter, ExampleGameAdapter):
+        def setup(cls=adapter_class):
+            return cls(cls.__name__, {}), _synthetic_events(cls, min(events, CHUNK_SIZE))
+        yield Benchmark(
+            f"transform_batch.{adapter_class.__name__}",
+            lambda state: _transform_all(state[0], state[1], events),
+            setup=setup, repeat=1 if events >= 200_000 else None, units=events,
+            distinct_units=min(events, CHUNK_SIZE),
+        )
+
+    for n in video_scales:
+        yield Benchmark(
+            f"video_correlate.{n}",
+            lambda state: VideoAdapter().correlate_with_game_events(*state),
+            setup=lambda n=n: _video_data(n), units=n,
+        )
+
+
+# ============================================================================
+# Runner
+# ============================================================================
+
+def _environment() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "rdflib": rdflib.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_benchmarks(benchmarks: List[Benchmark], repeat: int = 3) -> Dict[str, Dict[str, Any]]:
+    """Time each benchmark; setup runs once and is not timed."""
+    results = {}
+    for bench in benchmarks:
+        state = bench.setup()
+        times = []
+        for _ in range(bench.repeat or repeat):
+            start = time.perf_counter()
+            bench.run(state)
+            times.append(time.perf_counter() - start)
+        result = {
+            "repeat": len(times),
+            "min_s": min(times),
+            "median_s": statistics.median(times),
+            "mean_s": statistics.fmean(times),
+        }
+        if bench.units:
+            result["units"] = bench.units
+            result["per_unit_us"] = result["min_s"] / bench.units * 1e6
+        if bench.distinct_units and bench.distinct_units != bench.units:
+            result["distinct_units"] = bench.distinct_units
+        results[bench.name] = result
+        print(f"  {bench.name:<60} {result['min_s'] * 1000:10.2f} ms"
+              + (f"  ({result['per_unit_us']:.2f} us/item)" if bench.units else ""))
+    return results
+
+
+def compare(current: Dict[str, Dict[str, Any]], previous: Dict[str, Dict[str, Any]],
+            threshold: float = REGRESSION_THRESHOLD) -> List[str]:
+    """Names of benchmarks whose min time grew by more than `threshold`x."""
+    regressions = []
+    for name, result in current.items():
+        before = previous.get(name)
+        if not before or not before.get("min_s"):
+            continue
+        ratio = result["min_s"] / before["min_s"]
+        flag = "  REGRESSION" if ratio > threshold else ""
+        print(f"  {name:<60} {ratio:6.2f}x{flag}")
+        if ratio > threshold:
+            regressions.append(name)
+    return regressions
+
+
+# Environment fields that must match for timings to be comparable
+_COMPARABLE_KEYS = ("platform", "cpu_count", "python")
+
+
+def _comparable(env: Dict[str, Any], other: Dict[str, Any]) -> bool:
+    return all(env.get(key) == other.get(key) for key in _COMPARABLE_KEYS)
+
+
+def _latest_result(directory: Path, env: Dict[str, Any]) -> Optional[Path]:
+    """Newest result file recorded on a comparable machine."""
+    for path in sorted(directory.glob("*.json"), reverse=True):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                previous = json.load(f)["environment"]
+        except (OSError, ValueError, KeyError):
+            continue
+        if _comparable(env, previous):
+            return path
+    return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Ontology / adapter benchmark suite")
+    parser.add_argument("-k", dest="filters", action="append", default=[],
+                        help="Only benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--events", type=int, default=DEFAULT_EVENTS, help="Synthetic events per adapter")
+    parser.add_argument("--video-scales", type=int, nargs="+", default=list(VIDEO_SCALES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_RESULTS_DIR)
+    parser.add_argument("--compare", type=Path,
+                        help="Earlier result file (default: latest in output dir from a comparable machine)")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help=f"Exit 1 if any benchmark is over {REGRESSION_THRESHOLD}x slower")
+    args = parser.parse_args()
+
+    benchmarks = [
+        b for b in collect_benchmarks(args.events, args.video_scales)
+        if not args.filters or any(f in b.name for f in args.filters)
+    ]
+    env = _environment()
+    previous_path = args.compare or _latest_result(args.output_dir, env)
+
+    print(f"Running {len(benchmarks)} benchmarks")
+    results = run_benchmarks(benchmarks, args.repeat)
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    out_path = args.output_dir / f"{env['timestamp'].replace(':', '-').split('+')[0]}.json"
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"environment": env, "results": results}, f, indent=2)
+    print(f"Results written to {out_path}")
+
+    regressions: List[str] = []
+    if previous_path is not None and previous_path.exists() and previous_path != out_path:
+        with open(previous_path, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+        print(f"Compared with {previous_path} (commit {previous['environment'].get('commit')}):")
+        if not _comparable(env, previous["environment"]):
+            print(f"  ⚠️  Recorded on a different machine ({', '.join(_COMPARABLE_KEYS)} differ); ratios are indicative only")
+        regressions = compare(results, previous["results"])
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,17 +14,34 @@ Inputs (defaults assume repo layout):
 Outputs:
 - ontology/universal/worldmodeldata_universal_gaming_ontology_v1.ttl (canonical release artifact)
 - ontology/ontology/worldmodeldata_universal_gaming_ontology_v1.ttl (docker-mounted copy)
+- ontology/universal/worldmodeldata_universal_gaming_ontology_v1.build_manifest.json
+  (input hashes + per-term outputs for incremental rebuilds)
+
+Incremental builds (default; --full forces a clean build):
+- unchanged inputs and outputs -> no-op (only file hashes are computed)
+- changed core terms -> only those terms are recomputed, the rest are reused
+  from the manifest; changed foundations -> full rebuild
+The release is serialized once; the docker copy is a hard link (or a copy
+across filesystems).
 """
 
 from __future__ import annotations
 
+import argparse
+import hashlib
+import json
+import os
+import shutil
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, Optional, Set, Tuple
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
 
-from rdflib import Graph, Literal, Namespace, RDF, RDFS, OWL, URIRef
+from rdflib import BNode, Graph, Literal, Namespace, RDF, RDFS, OWL, URIRef
 from rdflib.namespace import XSD, SKOS, DC
 
+from ontology_loader import cache_stats, content_hash, load_graph
+from term_index import TermIndex
+
 
 CORE = Namespace("http://ontology.gaming.network/core#")
 UG = Namespace("http://ontology.gaming.network/universal/gaming#")
@@ -42,6 +59,10 @@ STRUCTURAL_PREDICATES = {
 }
 
 
+# Bump when build logic changes: invalidates manifests (forces a full build)
+BUILDER_VERSION = 2
+
+
 @dataclass(frozen=True)
 class BuildConfig:
     repo_root: Path
@@ -51,6 +72,10 @@ class BuildConfig:
     out_canonical: Path
     out_docker_copy: Path
 
+    @property
+    def manifest(self) -> Path:
+        return self.out_canonical.with_suffix(".build_manifest.json")
+
 
 def _is_core_uri(u: URIRef) -> bool:
     return isinstance(u, URIRef) and str(u).startswith(str(CORE))
@@ -69,9 +94,8 @@ def _is_testish(local: str) -> bool:
 
 
 def _load(path: Path) -> Graph:
-    g = Graph()
-    g.parse(path, format="turtle")
-    return g
+    # Shared (memoized, snapshot-cached) graph: read-only here
+    return load_graph(path)
 
 
 def _collect_typed_subjects(g: Graph) -> Set[URIRef]:
@@ -106,21 +130,21 @@ def _seed_explicit_equivalences(core_graph: Graph) -> Dict[URIRef, URIRef]:
 def _resolve_target(
     core_entity: URIRef,
     explicit_map: Dict[URIRef, URIRef],
-    existing_ug_ub_locals: Set[str],
+    universal_index: TermIndex,
+    kind: Optional[str] = None,
 ) -> URIRef:
     if core_entity in explicit_map:
         return explicit_map[core_entity]
 
     local = _local_name(core_entity)
-    # If universal already has a term with same local name, prefer that.
-    if local in existing_ug_ub_locals:
-        # Prefer UG over UB unless UB clearly contains it (we can't always tell here).
-        # Heuristic: if UB already has the local name, use UB; else UG.
-        ub_candidate = URIRef(str(UB) + local)
-        if local in existing_ug_ub_locals and (str(ub_candidate).startswith(str(UB))):
-            # We still need to check if it actually exists; caller provides locals set only.
-            # We'll use a conservative default: UG.
-            pass
+    # If universal already has a term with same local name, prefer that:
+    # UG first, UB when only UB defines it. Terms of the same kind
+    # (class/property) win over a same-named term of the other kind.
+    candidates = universal_index.lookup(local, namespaces=(UG, UB))
+    if kind is not None:
+        candidates = [c for c in candidates if c.kind == kind] or candidates
+    if candidates:
+        return candidates[0].iri
     return URIRef(str(UG) + local)
 
 
@@ -193,7 +217,8 @@ def _add_deprecated_stub(
         out_graph.add((core_entity, OWL.equivalentProperty, target_entity))
 
 
-def build_release(cfg: BuildConfig) -> Tuple[Graph, Dict[str, int]]:
+def _prepare(cfg: BuildConfig) -> Tuple[Graph, Graph, Set[URIRef], Dict[URIRef, URIRef], int]:
+    """Load inputs, seed the output with the foundations and map core terms to targets."""
     core_g = _load(cfg.core_ttl)
     hb_g = _load(cfg.universal_hb_ttl)
     ug_g = _load(cfg.universal_gaming_ttl)
@@ -213,17 +238,13 @@ def build_release(cfg: BuildConfig) -> Tuple[Graph, Dict[str, int]]:
     for t in ug_g:
         out.add(t)
 
-    existing_universal_locals: Set[str] = set()
-    for s in out.subjects(None, None):
-        if isinstance(s, URIRef):
-            if str(s).startswith(str(UG)) or str(s).startswith(str(UB)):
-                existing_universal_locals.add(_local_name(s))
+    universal_index = TermIndex.from_graph(hb_g, ug_g)
+    core_index = TermIndex.from_graph(core_g)
 
     core_terms = _collect_typed_subjects(core_g)
     explicit_map = _seed_explicit_equivalences(core_g)
 
     core_to_target: Dict[URIRef, URIRef] = {}
-    absorbed = 0
     skipped = 0
 
     for core_entity in sorted(core_terms, key=lambda u: str(u)):
@@ -232,10 +253,15 @@ def build_release(cfg: BuildConfig) -> Tuple[Graph, Dict[str, int]]:
             skipped += 1
             continue
 
-        target = _resolve_target(core_entity, explicit_map, existing_universal_locals)
+        target = _resolve_target(core_entity, explicit_map, universal_index, core_index.get(core_entity).kind)
         core_to_target[core_entity] = target
 
-    # Ontology header for the release artifact
+    _add_release_header(out)
+    return core_g, out, core_terms, core_to_target, skipped
+
+
+def _add_release_header(out: Graph) -> None:
+    """Ontology header for the release artifact."""
     release_iri = URIRef("http://ontology.gaming.network/universal/gaming_ontology")
     out.add((release_iri, RDF.type, OWL.Ontology))
     out.add((release_iri, DC.title, Literal("WorldModelData Universal Gaming Ontology v1", lang="en")))
@@ -254,6 +280,11 @@ def build_release(cfg: BuildConfig) -> Tuple[Graph, Dict[str, int]]:
     out.add((release_iri, OWL.imports, URIRef("http://ontology.gaming.network/universal/human_behavior")))
     out.add((release_iri, OWL.imports, URIRef("http://ontology.gaming.network/universal/gaming")))
 
+
+def build_release(cfg: BuildConfig) -> Tuple[Graph, Dict[str, int]]:
+    core_g, out, core_terms, core_to_target, skipped = _prepare(cfg)
+    absorbed = 0
+
     # Absorb core term content into universal namespace + add deprecated stubs for legacy IRIs
     for core_entity, target_entity in core_to_target.items():
         _copy_term_triples(core_g, out, core_entity, target_entity, core_to_target)
@@ -269,7 +300,180 @@ def build_release(cfg: BuildConfig) -> Tuple[Graph, Dict[str, int]]:
     return out, stats
 
 
+# ============================================================================
+# Incremental build
+# ============================================================================
+
+def _nt_term(node) -> str:
+    # Blank node labels differ between parses; the copied triples only point
+    # at a blank node, so any label is equivalent
+    return "_:b" if isinstance(node, BNode) else node.n3()
+
+
+def _term_fingerprint(core_g: Graph, core_entity: URIRef, core_to_target: Dict[URIRef, URIRef]) -> str:
+    """Hash of everything a term's output depends on: its source triples and
+    the targets of the core IRIs they mention."""
+    lines = []
+    referenced: Set[URIRef] = set()
+    for _, p, o in core_g.triples((core_entity, None, None)):
+        lines.append(f"{_nt_term(p)} {_nt_term(o)}")
+        for node in (p, o):
+            if isinstance(node, URIRef) and _is_core_uri(node):
+                referenced.add(node)
+    lines.sort()
+    lines.append(f"target {core_to_target[core_entity]}")
+    lines.extend(sorted(f"ref {r} {core_to_target.get(r)}" for r in referenced))
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+def _input_hashes(cfg: BuildConfig) -> Dict[str, str]:
+    return {
+        "core": content_hash(cfg.core_ttl),
+        "human_behavior": content_hash(cfg.universal_hb_ttl),
+        "gaming": content_hash(cfg.universal_gaming_ttl),
+    }
+
+
+def load_manifest(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("builder_version") != BUILDER_VERSION:
+        return None
+    return manifest
+
+
+def is_up_to_date(cfg: BuildConfig, manifest: Optional[Dict[str, Any]]) -> bool:
+    """True if inputs match the manifest and both outputs hold the recorded release."""
+    if manifest is None or manifest.get("inputs") != _input_hashes(cfg):
+        return False
+    for out_path in (cfg.out_canonical, cfg.out_docker_copy):
+        if not out_path.exists() or content_hash(out_path) != manifest.get("output_hash"):
+            return False
+    return True
+
+
+def build_release_incremental(
+    cfg: BuildConfig, manifest: Optional[Dict[str, Any]]
+) -> Tuple[Graph, Dict[str, int], Dict[str, Any]]:
+    """
+    Build the release, reusing per-term outputs recorded in a previous manifest.
+
+    Terms whose fingerprint is unchanged are re-added from their stored
+    N-Triples; only changed or new terms run through the absorb logic. Any
+    foundation change (or no manifest) recomputes every term.
+
+    Returns:
+        (release graph, stats, term records for the next manifest)
+    """
+    inputs = _input_hashes(cfg)
+    core_g, out, core_terms, core_to_target, skipped = _prepare(cfg)
+    previous_terms: Dict[str, Any] = {}
+    if manifest is not None and all(
+        manifest.get("inputs", {}).get(k) == inputs[k] for k in ("human_behavior", "gaming")
+    ):
+        previous_terms = manifest.get("terms", {})
+
+    terms: Dict[str, Any] = {}
+    reused_nt = []
+    recomputed = 0
+    for core_entity, target_entity in core_to_target.items():
+        fingerprint = _term_fingerprint(core_g, core_entity, core_to_target)
+        record = previous_terms.get(str(core_entity))
+        if record is not None and record["fingerprint"] == fingerprint:
+            reused_nt.append(record["output"])
+            terms[str(core_entity)] = record
+            continue
+        term_g = Graph()
+        _copy_term_triples(core_g, term_g, core_entity, target_entity, core_to_target)
+        _add_deprecated_stub(term_g, core_entity, target_entity, core_g)
+        out += term_g
+        terms[str(core_entity)] = {
+            "fingerprint": fingerprint,
+            "target": str(target_entity),
+            "output": term_g.serialize(format="nt"),
+        }
+        recomputed += 1
+
+    if reused_nt:
+        out.parse(data="".join(reused_nt), format="nt")
+
+    stats = {
+        "triples_out": len(out),
+        "core_terms_total": len(core_terms),
+        "core_terms_absorbed": len(core_to_target),
+        "core_terms_skipped_testish": skipped,
+        "core_terms_recomputed": recomputed,
+        "core_terms_reused": len(core_to_target) - recomputed,
+    }
+    return out, stats, terms
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def write_outputs(cfg: BuildConfig, ttl: str) -> str:
+    """
+    Write the serialized release once and link (or copy) it to the docker path.
+
+    Returns:
+        How the second output was produced: "hardlink" or "copy"
+    """
+    cfg.out_canonical.parent.mkdir(parents=True, exist_ok=True)
+    cfg.out_docker_copy.parent.mkdir(parents=True, exist_ok=True)
+    _atomic_write(cfg.out_canonical, ttl.encode("utf-8"))
+
+    tmp = cfg.out_docker_copy.with_name(f".{cfg.out_docker_copy.name}.{os.getpid()}.tmp")
+    try:
+        os.link(cfg.out_canonical, tmp)
+        method = "hardlink"
+    except OSError:  # different filesystem / no link support
+        shutil.copyfile(cfg.out_canonical, tmp)
+        method = "copy"
+    os.replace(tmp, cfg.out_docker_copy)
+    return method
+
+
+def run_build(cfg: BuildConfig, full: bool = False) -> Dict[str, Any]:
+    """
+    Build (or skip) the release and update the manifest.
+
+    Args:
+        cfg: Build configuration
+        full: Ignore the manifest and rebuild everything
+
+    Returns:
+        Stats (with "up_to_date": True when nothing had to be done)
+    """
+    manifest = None if full else load_manifest(cfg.manifest)
+    if is_up_to_date(cfg, manifest):
+        return {"up_to_date": True, "triples_out": manifest["stats"]["triples_out"]}
+
+    out_graph, stats, terms = build_release_incremental(cfg, manifest)
+    ttl = out_graph.serialize(format="turtle")
+    stats["second_output"] = write_outputs(cfg, ttl)
+    new_manifest = {
+        "builder_version": BUILDER_VERSION,
+        "inputs": _input_hashes(cfg),
+        "output_hash": content_hash(cfg.out_canonical),
+        "stats": stats,
+        "terms": terms,
+    }
+    _atomic_write(cfg.manifest, json.dumps(new_manifest, indent=1, sort_keys=True).encode("utf-8"))
+    stats["up_to_date"] = False
+    return stats
+
+
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the universal gaming ontology release")
+    parser.add_argument("--full", action="store_true", help="Ignore the build manifest and rebuild every term")
+    args = parser.parse_args()
+
     repo_root = Path(__file__).resolve().parents[2]
     cfg = BuildConfig(
         repo_root=repo_root,
@@ -280,18 +484,15 @@ def main() -> None:
         out_docker_copy=repo_root / "ontology" / "ontology" / "worldmodeldata_universal_gaming_ontology_v1.ttl",
     )
 
-    out_graph, stats = build_release(cfg)
-    cfg.out_canonical.parent.mkdir(parents=True, exist_ok=True)
-    cfg.out_docker_copy.parent.mkdir(parents=True, exist_ok=True)
-
-    ttl = out_graph.serialize(format="turtle")
-    cfg.out_canonical.write_text(ttl, encoding="utf-8")
-    cfg.out_docker_copy.write_text(ttl, encoding="utf-8")
-
-    print("Wrote:")
+    stats = run_build(cfg, full=args.full)
+    if stats["up_to_date"]:
+        print("Release is up to date:")
+    else:
+        print("Wrote:")
     print(f"- {cfg.out_canonical}")
     print(f"- {cfg.out_docker_copy}")
     print("Stats:", stats)
+    print("Ontology cache:", cache_stats())
 
 
 if __name__ == "__main__":
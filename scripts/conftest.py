@@ -0,0 +1,34 @@
+"""
+pytest configuration for the script tests.
+
+Points the ontology snapshot and compiled-mapping caches at a temporary
+directory for the session, so test runs never write into ~/.cache. Set
+before the test modules (and ontology_loader / mapping_compiler, which read
+the variables at import) are collected; worker processes inherit it.
+"""
+
+import os
+import shutil
+import tempfile
+
+_CACHE_VARS = ("ONTOLOGY_CACHE_DIR", "GAMING_MAPPING_CACHE")
+_saved = {}
+_cache_root = None
+
+
+def pytest_configure(config):
+    global _cache_root
+    _cache_root = tempfile.mkdtemp(prefix="gaming-ontology-test-cache-")
+    for name in _CACHE_VARS:
+        _saved[name] = os.environ.get(name)
+        os.environ[name] = os.path.join(_cache_root, name.lower())
+
+
+def pytest_unconfigure(config):
+    for name, value in _saved.items():
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+    if _cache_root:
+        shutil.rmtree(_cache_root, ignore_errors=True)
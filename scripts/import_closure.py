@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Offline owl:imports Closure Resolver
+
+Resolves owl:imports through ontology/module_registry.json (IRI -> local
+path) instead of the network, loads each wave of newly discovered modules in
+parallel threads through the shared ontology loader, and loads every module
+once even when several modules import it.
+
+Modules are kept as separate named graphs, so a consumer (e.g. the UI module
+toggles) can include or exclude modules and get a union view without
+re-parsing anything.
+
+Usage:
+    python scripts/import_closure.py                       # composed entrypoint
+    python scripts/import_closure.py --exclude extension_game_design
+"""
+
+import argparse
+import json
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+from rdflib import Dataset, Graph, URIRef
+from rdflib.graph import ReadOnlyGraphAggregate
+from rdflib.namespace import OWL, RDF
+
+from ontology_loader import cache_stats, load_graph
+
+
+DEFAULT_REGISTRY = Path(__file__).parent.parent / "ontology" / "module_registry.json"
+COMPOSED_ENTRYPOINT = "http://ontology.gaming.network/universal/gaming_ontology_composed"
+
+
+class ModuleRegistry:
+    """IRI <-> local file <-> module id lookups from module_registry.json."""
+
+    def __init__(self, registry_path: Union[str, Path] = DEFAULT_REGISTRY):
+        self.path = Path(registry_path)
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        base = self.path.parent
+        self.iri_to_path: Dict[str, Path] = {
+            iri: (base / local).resolve() for iri, local in data.get("iri_to_local_path", {}).items()
+        }
+        self.path_to_iri: Dict[Path, str] = {p: iri for iri, p in self.iri_to_path.items()}
+        self.modules: List[Dict] = data.get("modules", [])
+        self.id_to_iri: Dict[str, str] = {m["id"]: m["ontology_iri"] for m in self.modules if "id" in m}
+
+    def resolve(self, iri: str) -> Optional[Path]:
+        """Local path for an ontology IRI (None if unregistered)."""
+        return self.iri_to_path.get(iri)
+
+    def to_iri(self, ref: str) -> str:
+        """Accept a module id, an IRI or a registered file path."""
+        if ref in self.id_to_iri:
+            return self.id_to_iri[ref]
+        path = Path(ref).resolve()
+        return self.path_to_iri.get(path, ref)
+
+
+class ImportClosure:
+    """Per-module graphs of an owl:imports closure plus the import edges."""
+
+    def __init__(self, root: str, graphs: Dict[str, Graph], imports: Dict[str, List[str]],
+                 unresolved: Set[str], registry: ModuleRegistry):
+        self.root = root
+        self.graphs = graphs
+        self.imports = imports
+        self.unresolved = unresolved
+        self.registry = registry
+
+    def modules(self, exclude: Iterable[str] = ()) -> List[str]:
+        """
+        Module IRIs reachable from the root, in breadth-first order.
+
+        Excluded modules (ids or IRIs) are dropped together with imports that
+        are only reachable through them.
+        """
+        excluded = {self.registry.to_iri(ref) for ref in exclude}
+        if self.root in excluded:
+            return []
+        order, seen, queue = [], {self.root}, deque([self.root])
+        while queue:
+            iri = queue.popleft()
+            order.append(iri)
+            for child in self.imports.get(iri, ()):
+                if child in self.graphs and child not in seen and child not in excluded:
+                    seen.add(child)
+                    queue.append(child)
+        return order
+
+    def union(self, include: Optional[Iterable[str]] = None, exclude: Iterable[str] = ()) -> ReadOnlyGraphAggregate:
+        """
+        Read-only union view over the selected modules (no triples copied).
+
+        Args:
+            include: Modules to use (ids or IRIs); default: the whole closure
+            exclude: Modules to drop (with imports reachable only through them)
+        """
+        selected = self.modules(exclude)
+        if include is not None:
+            wanted = {self.registry.to_iri(ref) for ref in include}
+            selected = [iri for iri in selected if iri in wanted]
+        return ReadOnlyGraphAggregate([self.graphs[iri] for iri in selected])
+
+    def to_dataset(self, exclude: Iterable[str] = ()) -> Dataset:
+        """Copy the selected modules into a Dataset, one named graph per module IRI."""
+        dataset = Dataset()
+        for iri in self.modules(exclude):
+            named = dataset.graph(URIRef(iri))
+            for prefix, namespace in self.graphs[iri].namespaces():
+                dataset.bind(prefix, namespace, override=False)
+            named += self.graphs[iri]
+        return dataset
+
+
+def _ontology_iri(graph: Graph) -> Optional[str]:
+    for subject in graph.subjects(RDF.type, OWL.Ontology):
+        if isinstance(subject, URIRef):
+            return str(subject)
+    return None
+
+
+def load_closure(
+    entry: str = COMPOSED_ENTRYPOINT,
+    registry: Optional[ModuleRegistry] = None,
+    max_workers: int = 8,
+    cache_dir=None,
+) -> ImportClosure:
+    """
+    Load an ontology and its owl:imports closure without network access.
+
+    Args:
+        entry: Entry ontology IRI, module id or local file path
+        registry: Module registry (default: ontology/module_registry.json)
+        max_workers: Threads used to load each wave of modules
+        cache_dir: Passed to ontology_loader.load_graph()
+
+    Returns:
+        ImportClosure (imports of unregistered IRIs are listed in .unresolved)
+    """
+    registry = registry or ModuleRegistry()
+    root = registry.to_iri(entry)
+    root_path = registry.resolve(root)
+    if root_path is None:
+        # An unregistered file path: name the module after its ontology header
+        root_path = Path(entry)
+        root_graph = load_graph(root_path, cache_dir=cache_dir)
+        root = _ontology_iri(root_graph) or root_path.resolve().as_uri()
+        registry.iri_to_path.setdefault(root, root_path.resolve())
+
+    graphs: Dict[str, Graph] = {}
+    imports: Dict[str, List[str]] = {}
+    unresolved: Set[str] = set()
+    seen = {root}
+    wave = [root]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while wave:
+            loaded = list(pool.map(
+                lambda iri: load_graph(registry.resolve(iri), cache_dir=cache_dir), wave
+            ))
+            next_wave = []
+            for iri, graph in zip(wave, loaded):
+                graphs[iri] = graph
+                imports[iri] = sorted(str(o) for o in graph.objects(None, OWL.imports))
+                for child in imports[iri]:
+                    if child in seen:
+                        continue
+                    seen.add(child)
+                    if registry.resolve(child) is None:
+                        unresolved.add(child)
+                    else:
+                        next_wave.append(child)
+            wave = next_wave
+
+    return ImportClosure(root, graphs, imports, unresolved, registry)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Resolve an owl:imports closure offline")
+    parser.add_argument("entry", nargs="?", default=COMPOSED_ENTRYPOINT,
+                        help="Entry ontology IRI, module id or file (default: composed entrypoint)")
+    parser.add_argument("--registry", default=str(DEFAULT_REGISTRY))
+    parser.add_argument("--exclude", action="append", default=[], help="Module id or IRI to leave out")
+    args = parser.parse_args()
+
+    closure = load_closure(args.entry, ModuleRegistry(args.registry))
+    selected = closure.modules(args.exclude)
+    print(f"Import closure of {closure.root}:")
+    for iri in selected:
+        print(f"  {iri}  ({len(closure.graphs[iri])} triples)")
+    if closure.unresolved:
+        print("Unresolved imports (not in registry):")
+        for iri in sorted(closure.unresolved):
+            print(f"  {iri}")
+    print(f"Selected: {len(selected)} modules, {sum(len(closure.graphs[i]) for i in selected)} triples")
+    print(f"Ontology cache: {cache_stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Vectorized Monetization Segment Classifier
+
+Compiles ontology/tenant_thresholds.ttl into NumPy lookup tables once and
+classifies whole arrays of device aggregates (IAP counts or total spend)
+into NonPayer / Minnow / Dolphin / Whale:
+
+- every :MonetizationThresholds instance with :appliesToTenant becomes a
+  row; :DefaultMonetizationThresholds is row 0, used for unknown tenants and
+  for any threshold a tenant leaves out
+- all distinct boundary values of a metric are sorted into one array; a
+  single np.searchsorted gives each value its rank among them, and a
+  (tenant x rank) table maps the rank to that tenant's segment, so
+  classification is one searchsorted plus one gather, however many tenants
+- thresholds are inclusive lower bounds (value >= whale threshold is a
+  Whale), matching how the IAP thresholds were derived (the Nth-highest
+  count is itself a whale); a value below the minnow threshold is NonPayer
+- the TTL is re-read when its mtime or size changes (checked at most once
+  per check_interval seconds); the compiled table is swapped atomically
+
+Usage:
+    classifier = MonetizationClassifier()
+    codes = classifier.classify(tenant_ids, iap_counts)          # int8 codes
+    labels = classifier.labels(codes)                            # segment names
+    codes = classifier.classify("flick", total_spent, metric="monetary")
+
+    python scripts/monetization_classifier.py --devices 10000000 --tenants 300
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+from rdflib import Graph, Namespace
+from rdflib.namespace import RDF
+
+from ontology_loader import load_graph
+
+
+DEFAULT_THRESHOLDS = Path(__file__).parent.parent / "ontology" / "tenant_thresholds.ttl"
+CORE = Namespace("http://ontology.gaming.network/core#")
+
+SEGMENTS = ("NonPayer", "Minnow", "Dolphin", "Whale")
+METRICS = {
+    "iap": (CORE.minnowIapThreshold, CORE.dolphinIapThreshold, CORE.whaleIapThreshold),
+    "monetary": (CORE.minnowMonetaryThreshold, CORE.dolphinMonetaryThreshold, CORE.whaleMonetaryThreshold),
+}
+DEFAULT_TENANT = ""
+
+
+def _normalize_tenant(tenant: Any) -> str:
+    return str(tenant).strip().casefold()
+
+
+class ThresholdTable:
+    """Compiled thresholds: tenant rows, per-metric boundaries and rank -> segment tables."""
+
+    def __init__(self, tenants: Dict[str, int], bounds: Dict[str, "np.ndarray"]):
+        self.tenants = tenants  # normalized tenant id -> row (DEFAULT_TENANT -> 0)
+        self.bounds = bounds    # metric -> (rows, 3) minnow/dolphin/whale, NaN if undefined
+        self.cuts: Dict[str, "np.ndarray"] = {}
+        self.lookup: Dict[str, "np.ndarray"] = {}
+        for metric, table in bounds.items():
+            cuts = np.unique(table[~np.isnan(table)])
+            # rank r = number of cuts <= value; segment = number of the tenant's bounds <= cuts[r - 1]
+            ranks = np.concatenate(([-np.inf], cuts))
+            with np.errstate(invalid="ignore"):
+                lookup = (ranks[None, :, None] >= table[:, None, :]).sum(axis=2)
+            self.cuts[metric] = cuts
+            self.lookup[metric] = lookup.astype(np.int8)
+
+    def thresholds(self, tenant: str) -> Dict[str, Dict[str, Optional[float]]]:
+        row = self.tenants.get(_normalize_tenant(tenant), 0)
+        return {
+            metric: {segment: (None if np.isnan(v) else float(v))
+                     for segment, v in zip(SEGMENTS[1:], table[row])}
+            for metric, table in self.bounds.items()
+        }
+
+
+def compile_thresholds(graph: Graph) -> ThresholdTable:
+    """
+    Build the lookup tables from a thresholds graph.
+
+    Raises:
+        ValueError: If a tenant's thresholds are not ordered minnow <= dolphin <= whale
+    """
+    if np is None:
+        raise ImportError("monetization_classifier requires NumPy")
+
+    def values_of(node) -> Dict[str, list]:
+        return {metric: [_number(graph.value(node, p)) for p in properties]
+                for metric, properties in METRICS.items()}
+
+    default_node = CORE.DefaultMonetizationThresholds
+    default = values_of(default_node)
+    rows = {DEFAULT_TENANT: default}
+    for node in sorted(graph.subjects(RDF.type, CORE.MonetizationThresholds)):
+        if node == default_node:
+            continue
+        for tenant in graph.objects(node, CORE.appliesToTenant):
+            own = values_of(node)
+            rows[_normalize_tenant(tenant)] = {
+                metric: [v if v is not None else d for v, d in zip(own[metric], default[metric])]
+                for metric in METRICS
+            }
+
+    tenants = {}
+    bounds = {metric: np.full((len(rows), 3), np.nan) for metric in METRICS}
+    for i, (tenant, values) in enumerate(rows.items()):
+        tenants[tenant] = i
+        for metric, triple in values.items():
+            defined = [v for v in triple if v is not None]
+            if defined != sorted(defined):
+                raise ValueError(f"Thresholds for tenant {tenant or 'default'!r} ({metric}) "
+                                 f"are not ordered minnow <= dolphin <= whale: {triple}")
+            bounds[metric][i] = [np.nan if v is None else v for v in triple]
+    return ThresholdTable(tenants, bounds)
+
+
+def _number(term) -> Optional[float]:
+    if term is None:
+        return None
+    try:
+        return float(term.toPython())
+    except (TypeError, ValueError):
+        return None
+
+
+class MonetizationClassifier:
+    """Tenant-aware segment classifier over NumPy arrays, reloading its TTL on change."""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_THRESHOLDS, check_interval: float = 1.0):
+        if np is None:
+            raise ImportError("monetization_classifier requires NumPy")
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._checked = 0.0
+        self._table: Optional[ThresholdTable] = None
+        self.reload(force=True)
+
+    def _stat(self) -> Tuple[int, int]:
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    def reload(self, force: bool = False) -> bool:
+        """Recompile if the file changed (or `force`); True if the table was replaced."""
+        with self._lock:
+            # Advance first so a missing or unreadable file is retried only once per interval
+            self._checked = time.monotonic()
+            signature = self._stat()
+            if not force and signature == self._signature:
+                return False
+            table = compile_thresholds(load_graph(self.path))
+            self._table, self._signature = table, signature
+            self.reloads += 1
+            return True
+
+    @property
+    def table(self) -> ThresholdTable:
+        """Current compiled table, after at most one cheap change check per check_interval."""
+        if time.monotonic() - self._checked >= self.check_interval:
+            try:
+                self.reload()
+            except (OSError, ValueError, SyntaxError) as e:
+                # Keep serving the last good table if the file is mid-write or invalid
+                # (rdflib's BadSyntax for malformed Turtle is a SyntaxError)
+                print(f"⚠️  Keeping previous thresholds: {e}", file=sys.stderr)
+        return self._table
+
+    def tenant_rows(self, tenants: Any, n: Optional[int] = None,
+                    table: Optional[ThresholdTable] = None) -> "np.ndarray":
+        """Row index per device (0 = default thresholds for unknown tenants)."""
+        table = table or self.table
+        if isinstance(tenants, str):
+            return np.full(n if n is not None else 1, table.tenants.get(_normalize_tenant(tenants), 0),
+                           dtype=np.intp)
+        names, codes = factorize(tenants)
+        rows = np.array([table.tenants.get(_normalize_tenant(t), 0) for t in names], dtype=np.intp)
+        return rows[codes]
+
+    def classify(self, tenants: Any, values: Sequence[float], metric: str = "iap") -> "np.ndarray":
+        """
+        Segment codes (index into SEGMENTS) for each device.
+
+        Args:
+            tenants: One tenant id for all devices, or one per device (see
+                factorize(); dictionary-encoded columns are fastest)
+            values: IAP counts (metric="iap") or total spend (metric="monetary")
+            metric: "iap" or "monetary"
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}; expected one of {sorted(METRICS)}")
+        table = self.table  # one snapshot for the whole call
+        values = np.asarray(values, dtype=np.float64)
+        rows = self.tenant_rows(tenants, len(values), table)
+        if len(rows) != len(values):
+            raise ValueError(f"{len(rows)} tenants for {len(values)} values")
+        ranks = np.searchsorted(table.cuts[metric], values, side="right")
+        codes = table.lookup[metric][rows, ranks]
+        codes[np.isnan(values)] = 0
+        return codes
+
+    @staticmethod
+    def labels(codes: "np.ndarray") -> "np.ndarray":
+        return np.asarray(SEGMENTS)[codes]
+
+    def thresholds(self, tenant: str) -> Dict[str, Dict[str, Optional[float]]]:
+        """Effective thresholds of a tenant (after the default fallback)."""
+        return self.table.thresholds(tenant)
+
+
+def factorize(tenants: Any) -> Tuple[Sequence[Any], "np.ndarray"]:
+    """
+    (distinct tenant ids, code per device) for a tenant column.
+
+    Dictionary-encoded input is used as is: a (names, codes) tuple, a pandas
+    Categorical (.categories / .codes) or a pyarrow DictionaryArray
+    (.dictionary / .indices), detected by duck typing. Plain string arrays
+    are factorized by hashing each string's code points into a uint64 and
+    taking the distinct hashes (a sort of integers, not strings); a hash
+    collision is detected and falls back to np.unique on the strings.
+    """
+    if isinstance(tenants, tuple) and len(tenants) == 2:
+        return list(tenants[0]), np.asarray(tenants[1], dtype=np.intp)
+    if hasattr(tenants, "categories") and hasattr(tenants, "codes"):
+        return list(tenants.categories), np.asarray(tenants.codes, dtype=np.intp)
+    if hasattr(tenants, "dictionary") and hasattr(tenants, "indices"):
+        return tenants.dictionary.to_pylist(), np.asarray(tenants.indices, dtype=np.intp)
+
+    values = np.asarray(tenants)
+    if values.dtype.kind != "U":
+        values = values.astype(str)
+    values = values.reshape(-1)
+    width = values.dtype.itemsize // 4
+    if len(values) == 0 or width == 0:
+        names, codes = np.unique(values, return_inverse=True)
+        return list(names), codes.reshape(-1)
+    code_points = values.view(np.uint32).reshape(len(values), width)
+    hashes = np.zeros(len(values), dtype=np.uint64)
+    for column in range(width):
+        hashes = hashes * np.uint64(1000003) ^ code_points[:, column]
+    _, first, codes = np.unique(hashes, return_index=True, return_inverse=True)
+    codes = codes.reshape(-1)
+    names = values[first]
+    if not np.array_equal(names[codes], values):
+        names, codes = np.unique(values, return_inverse=True)
+        codes = codes.reshape(-1)
+    return list(names), codes
+
+
+def _python_classify(table: ThresholdTable, tenants, values, metric: str):
+    """Reference per-device loop, for the benchmark."""
+    bounds = table.bounds[metric]
+    out = []
+    for tenant, value in zip(tenants, values):
+        row = table.tenants.get(_normalize_tenant(tenant), 0)
+        out.append(sum(1 for b in bounds[row] if value >= b))
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Classify synthetic devices with tenant thresholds")
+    parser.add_argument("--thresholds", default=str(DEFAULT_THRESHOLDS))
+    parser.add_argument("--devices", type=int, default=10_000_000)
+    parser.add_argument("--tenants", type=int, default=300, help="Distinct tenant ids in the data")
+    parser.add_argument("--metric", choices=sorted(METRICS), default="iap")
+    args = parser.parse_args()
+
+    classifier = MonetizationClassifier(args.thresholds)
+    known = sorted(t for t in classifier.table.tenants if t)
+    print(f"Tenants with thresholds: {', '.join(known)} (+ default)")
+    for tenant in known:
+        print(f"  {tenant}: {classifier.thresholds(tenant)[args.metric]}")
+
+    rng = np.random.default_rng(0)
+    names = np.array(known + [f"tenant{i}" for i in range(max(args.tenants - len(known), 0))])
+    tenant_codes = rng.integers(0, len(names), args.devices)
+    tenants = names[tenant_codes]
+    values = np.floor(rng.pareto(1.2, args.devices) * (5 if args.metric == "iap" else 3))
+
+    for label, column in (("dictionary-encoded tenants", (names, tenant_codes)), ("string tenants", tenants)):
+        start = time.perf_counter()
+        codes = classifier.classify(column, values, args.metric)
+        elapsed = time.perf_counter() - start
+        counts = np.bincount(codes, minlength=len(SEGMENTS))
+        print(f"Classified {args.devices} devices ({label}) in {elapsed:.3f}s "
+              f"({args.devices / elapsed / 1e6:.1f}M/s): "
+              + ", ".join(f"{s}={c}" for s, c in zip(SEGMENTS, counts)))
+
+    sample = min(args.devices, 200_000)
+    start = time.perf_counter()
+    reference = _python_classify(classifier.table, tenants[:sample], values[:sample], args.metric)
+    loop = (time.perf_counter() - start) * args.devices / sample
+    assert list(codes[:sample]) == reference
+    print(f"Per-device Python loop (extrapolated): {loop:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Semantic Ontology Diff
+
+Compares ontology snapshots as sets of hashed canonical triples (blank
+nodes labelled structurally by rdf_canon.py, so reordering or re-parsing
+a file is not a change) and reports what changed by category:
+
+- classes / properties: terms whose owl:Class / *Property declaration was
+  added or removed
+- shacl: triples in the sh: namespace or declaring shapes
+- axioms: logical statements (subClassOf, domain, range, equivalence,
+  disjointness, restrictions, lists, ...)
+- annotations: everything else (labels, comments, deprecation flags, ...)
+
+History mode walks ontology/versions/ once: each file is parsed once (a
+byte-identical successor is not parsed at all) and only the previous
+version's hash set is kept, so every adjacent pair is compared in a single
+pass.
+
+Usage:
+    python scripts/ontology_diff.py                       # all versions
+    python scripts/ontology_diff.py v010 v042             # two versions
+    python scripts/ontology_diff.py a.ttl b.ttl --json report.json
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from rdflib import Graph
+
+from rdf_canon import canonical_lines
+
+
+DEFAULT_VERSIONS_DIR = Path(__file__).parent.parent / "ontology" / "versions"
+CATEGORIES = ("classes", "properties", "axioms", "shacl", "annotations")
+
+RDF_TYPE = "<http://www.w3.org/1999/02/22-rdf-syntax-ns#type>"
+SH = "<http://www.w3.org/ns/shacl#"
+OWL = "<http://www.w3.org/2002/07/owl#"
+RDFS = "<http://www.w3.org/2000/01/rdf-schema#"
+RDF = "<http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+
+CLASS_TYPES = {OWL + "Class>", RDFS + "Class>"}
+PROPERTY_TYPES = {
+    OWL + "ObjectProperty>",
+    OWL + "DatatypeProperty>",
+    OWL + "AnnotationProperty>",
+    RDF + "Property>",
+}
+SHAPE_TYPES = {SH + "NodeShape>", SH + "PropertyShape>"}
+ANNOTATION_PREDICATES = {
+    RDFS + "label>",
+    RDFS + "comment>",
+    RDFS + "seeAlso>",
+    RDFS + "isDefinedBy>",
+    OWL + "deprecated>",
+    OWL + "versionInfo>",
+}
+AXIOM_NAMESPACES = (OWL, RDFS, RDF)
+
+
+def triple_hash(line: str) -> int:
+    """64-bit hash of a canonical N-Triples line."""
+    return int.from_bytes(hashlib.blake2b(line.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def load_triples(path: Path) -> Dict[int, str]:
+    """Parse a Turtle file once: triple hash -> canonical line."""
+    graph = Graph().parse(str(path), format="turtle")
+    return {triple_hash(line): line for line in canonical_lines(graph)}
+
+
+def classify(line: str) -> str:
+    """Category of one canonical triple line."""
+    subject, predicate, obj = line.split(" ", 2)
+    if predicate == RDF_TYPE:
+        if obj in CLASS_TYPES and not subject.startswith("_:"):
+            return "classes"
+        if obj in PROPERTY_TYPES and not subject.startswith("_:"):
+            return "properties"
+        if obj in SHAPE_TYPES:
+            return "shacl"
+    if predicate.startswith(SH):
+        return "shacl"
+    if predicate in ANNOTATION_PREDICATES:
+        return "annotations"
+    if subject.startswith("_:") or predicate.startswith(AXIOM_NAMESPACES):
+        return "axioms"
+    return "annotations"
+
+
+def semantic_diff(old: Dict[int, str], new: Dict[int, str]) -> Dict[str, Any]:
+    """
+    Categorized difference between two hashed triple sets.
+
+    Returns:
+        {"added": n, "removed": n, "<category>": {"added": [...], "removed": [...]}}
+        where classes / properties list term IRIs and the other categories
+        list canonical triples
+    """
+    added_hashes = new.keys() - old.keys()
+    removed_hashes = old.keys() - new.keys()
+    report: Dict[str, Any] = {
+        "added": len(added_hashes),
+        "removed": len(removed_hashes),
+    }
+    for category in CATEGORIES:
+        report[category] = {"added": [], "removed": []}
+    for direction, hashes, lines in (("added", added_hashes, new), ("removed", removed_hashes, old)):
+        for h in hashes:
+            line = lines[h]
+            category = classify(line)
+            entry = line.split(" ", 1)[0].strip("<>") if category in ("classes", "properties") else line
+            report[category][direction].append(entry)
+    for category in CATEGORIES:
+        for direction in ("added", "removed"):
+            report[category][direction].sort()
+    return report
+
+
+def diff_files(path_a: Path, path_b: Path) -> Dict[str, Any]:
+    """Semantic diff of two Turtle files."""
+    return semantic_diff(load_triples(path_a), load_triples(path_b))
+
+
+def diff_history(versions_dir: Path = DEFAULT_VERSIONS_DIR) -> List[Dict[str, Any]]:
+    """
+    Diff every adjacent pair of vNNN.ttl snapshots in one pass.
+
+    Returns:
+        One report per version after the first, with "from" / "to" keys
+    """
+    reports = []
+    previous: Optional[Dict[int, str]] = None
+    previous_bytes: Optional[bytes] = None
+    previous_id = None
+    for ttl in sorted(Path(versions_dir).glob("v[0-9]*.ttl")):
+        data = ttl.read_bytes()
+        if data == previous_bytes:
+            current = previous
+        else:
+            graph = Graph().parse(data=data, format="turtle")
+            current = {triple_hash(line): line for line in canonical_lines(graph)}
+        if previous is not None:
+            reports.append({"from": previous_id, "to": ttl.stem, **semantic_diff(previous, current)})
+        previous, previous_bytes, previous_id = current, data, ttl.stem
+    return reports
+
+
+def _resolve(ref: str, versions_dir: Path) -> Path:
+    path = Path(ref)
+    return path if path.suffix else versions_dir / f"{ref}.ttl"
+
+
+def _summary(report: Dict[str, Any]) -> str:
+    parts = []
+    for category in CATEGORIES:
+        added, removed = len(report[category]["added"]), len(report[category]["removed"])
+        if added or removed:
+            parts.append(f"{category} +{added}/-{removed}")
+    return ", ".join(parts) or "no changes"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Semantic diff between ontology versions")
+    parser.add_argument("old", nargs="?", help="Version id (e.g. v010) or Turtle file")
+    parser.add_argument("new", nargs="?", help="Version id or Turtle file")
+    parser.add_argument("--versions-dir", default=str(DEFAULT_VERSIONS_DIR))
+    parser.add_argument("--json", help="Write the full report to this file")
+    args = parser.parse_args()
+    versions_dir = Path(args.versions_dir)
+
+    start = time.perf_counter()
+    if args.old and args.new:
+        result: Any = diff_files(_resolve(args.old, versions_dir), _resolve(args.new, versions_dir))
+        elapsed = time.perf_counter() - start
+        print(f"{args.old} -> {args.new}: {_summary(result)}")
+        for category, label in (("classes", "class"), ("properties", "property")):
+            for direction, sign in (("added", "+"), ("removed", "-")):
+                for iri in result[category][direction]:
+                    print(f"  {sign} {label} {iri}")
+    elif args.old or args.new:
+        parser.error("give two versions, or none for the whole history")
+    else:
+        result = diff_history(versions_dir)
+        elapsed = time.perf_counter() - start
+        for report in result:
+            print(f"{report['from']} -> {report['to']}: {_summary(report)}")
+    print(f"Done in {elapsed:.2f}s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+RDF Canonical N-Triples
+
+Turns a graph into N-Triples lines whose blank node labels depend only on
+graph structure, so the same content parsed twice (or in two versions of a
+file) yields identical lines and plain set operations give a meaningful diff.
+
+Blank nodes are labelled by colour refinement, one connected group of blank
+nodes at a time: start from each node's non-blank neighbourhood, then
+repeatedly hash in the labels of neighbouring blank nodes until the
+partition stops splitting. Nodes that are still tied are interchangeable, so
+one of them is singled out and the refinement repeated until every node has
+its own label; identical copies of a whole group (e.g. the repeated
+owl:AllDisjointClasses axioms in the version snapshots) are numbered.
+Editing one axiom therefore leaves the labels of unrelated axioms alone.
+
+This is linear per refinement round and fast on OWL-shaped data
+(restrictions, RDF lists), unlike rdflib.compare.to_canonical_graph, which
+takes ~100 s on one version file.
+"""
+
+import hashlib
+from typing import Dict, Iterable, List, Set, Tuple
+
+from rdflib import BNode, Graph, Literal
+
+
+LABEL_PREFIX = "_:c"
+
+# N-Triples string escapes (as rdflib's N-Triples serializer writes them)
+_NT_ESCAPES = str.maketrans({"\\": "\\\\", "\n": "\\n", '"': '\\"', "\r": "\\r"})
+
+
+def _hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def term_nt(term) -> str:
+    """N-Triples form of a non-blank term."""
+    if isinstance(term, Literal):
+        # Not Literal.n3(): it abbreviates numbers and booleans, which N-Triples does not allow
+        quoted = f'"{str(term).translate(_NT_ESCAPES)}"'
+        if term.language:
+            return f"{quoted}@{term.language}"
+        if term.datatype:
+            return f"{quoted}^^<{term.datatype}>"
+        return quoted
+    return term.n3()
+
+
+def bnode_labels(triples: Iterable[Tuple]) -> Dict[BNode, str]:
+    """
+    Structural labels for the blank nodes of a set of triples.
+
+    Returns:
+        BNode -> canonical label ("_:c" + 16 hex digits)
+    """
+    out_edges: Dict[BNode, List[Tuple[str, object]]] = {}
+    in_edges: Dict[BNode, List[Tuple[str, object]]] = {}
+    for s, p, o in triples:
+        pred = p.n3()
+        if isinstance(s, BNode):
+            out_edges.setdefault(s, []).append((pred, o))
+            in_edges.setdefault(s, [])
+        if isinstance(o, BNode):
+            in_edges.setdefault(o, []).append((pred, s))
+            out_edges.setdefault(o, [])
+    if not out_edges:
+        return {}
+
+    def render(node, labels) -> str:
+        if isinstance(node, BNode):
+            return labels[node] if labels is not None else "_"
+        return term_nt(node)
+
+    def refine(nodes, labels) -> Dict[BNode, str]:
+        new = {}
+        for b in nodes:
+            parts = sorted(f">{p} {render(o, labels)}" for p, o in out_edges[b])
+            parts += sorted(f"<{p} {render(s, labels)}" for p, s in in_edges[b])
+            if labels is not None:
+                parts.insert(0, labels[b])
+            new[b] = _hash("\n".join(parts))
+        return new
+
+    def stabilize(nodes, labels) -> Dict[BNode, str]:
+        classes = len(set(labels.values()))
+        while classes < len(labels):
+            labels = refine(nodes, labels)
+            refined_classes = len(set(labels.values()))
+            if refined_classes == classes:
+                break
+            classes = refined_classes
+        return labels
+
+    def label_component(nodes) -> Dict[BNode, str]:
+        labels = stabilize(nodes, refine(nodes, None))
+        while True:
+            # Nodes still sharing a label: individualize one and refine again
+            groups: Dict[str, List[BNode]] = {}
+            for b, label in labels.items():
+                groups.setdefault(label, []).append(b)
+            tied = [label for label, members in groups.items() if len(members) > 1]
+            if not tied:
+                return labels
+            label = min(tied)
+            labels[groups[label][0]] = _hash(label + "*")
+            labels = stabilize(nodes, labels)
+
+    # Label each connected group of blank nodes on its own, so an edit in
+    # one axiom does not relabel blank nodes elsewhere in the graph
+    labels: Dict[BNode, str] = {}
+    seen_components: Dict[str, int] = {}
+    for start in out_edges:
+        if start in labels:
+            continue
+        nodes, stack = {start}, [start]
+        while stack:
+            b = stack.pop()
+            for _, other in out_edges[b] + in_edges[b]:
+                if isinstance(other, BNode) and other not in nodes:
+                    nodes.add(other)
+                    stack.append(other)
+        component = label_component(nodes)
+        # Qualify labels with the whole component (equal local structure in
+        # two components must not share a label); identical copies of a
+        # component are numbered
+        signature = _hash("\n".join(sorted(component.values())))
+        copies = seen_components.get(signature, 0)
+        seen_components[signature] = copies + 1
+        for b, label in component.items():
+            labels[b] = LABEL_PREFIX + _hash(f"{signature} {label} {copies}")
+    return labels
+
+
+def canonical_lines(graph: Graph) -> Set[str]:
+    """Canonical N-Triples lines (without the trailing " .") of a graph."""
+    labels = bnode_labels(graph)
+    lines = set()
+    for s, p, o in graph:
+        subject = labels[s] if isinstance(s, BNode) else s.n3()
+        obj = labels[o] if isinstance(o, BNode) else term_nt(o)
+        lines.add(f"{subject} {p.n3()} {obj}")
+    return lines
+
+
+def lines_to_graph(lines: Iterable[str]) -> Graph:
+    """Parse canonical lines back into a Graph."""
+    graph = Graph()
+    graph.parse(data="".join(f"{line} .\n" for line in lines), format="nt")
+    return graph
@@ -0,0 +1,831 @@
+#!/usr/bin/env python3
+"""
+Compiled SHACL Validation
+
+Compiles the NodeShapes of ontology/gaming_shapes.ttl and
+ontology/shapes/player_shapes.ttl into specialized Python validators, so
+instance data can be checked at volume without a generic SHACL engine:
+
+- every property shape becomes a PropertyValidator holding only the checks
+  it declares, built once: regexes are compiled, sh:in lists become
+  frozensets, datatype and range checks are closures over their constants
+- node-level constraints (sh:class, sh:or of alternatives, as in
+  EngagementLevelShape) are compiled the same way; sh:or alternatives are
+  compiled shapes themselves
+- shapes are grouped by target class, and rdfs:subClassOf (plus
+  owl:equivalentClass) from the ontology is closed once, so picking the
+  shapes of a focus node is one dictionary lookup
+
+Supported constraint components: sh:class, sh:datatype, sh:in, sh:pattern
+(+ sh:flags), sh:minLength, sh:maxLength, sh:minInclusive, sh:maxInclusive,
+sh:minExclusive, sh:maxExclusive, sh:minCount, sh:maxCount and sh:or. Any
+other component raises UnsupportedShapeError at compile time rather than
+being skipped silently.
+
+Three kinds of input are validated in batch:
+
+- validate_graph(): RDF instance data (focus nodes from sh:targetClass)
+- validate_events(): universal event dictionaries from the adapters; the
+  event_type names the class (e.g. InAppPurchase), and property values are
+  looked up by the path's local name, its snake_case form (activityTimestamp
+  -> activity_timestamp) or a known alias (belongsToDevice -> device_id),
+  first on the event and then in its "properties"
+- validate_records(): plain dictionaries of one class, e.g. device records
+
+Dictionaries hold Python values, not RDF terms. For them, int / float /
+Decimal satisfy xsd:decimal (JSON does not distinguish them), ISO strings
+satisfy xsd:dateTime, and an sh:class value is accepted if it names a
+subclass of the required class or is an identifier of another record.
+In RDF data a class used as a value (:hasEngagementLevel :HighEngagement, as
+the inference rules write it) satisfies sh:class through its superclasses.
+
+Violations carry the shape's sh:message (or a generated one when the shape
+has none).
+
+Usage:
+    from shape_compiler import ShapeCompiler
+    compiler = ShapeCompiler()
+    report = compiler.validate_events(adapter.transform_batch(source_events))
+    report = compiler.validate_records(devices, "Device")
+
+    python scripts/shape_compiler.py data.ttl
+    python scripts/shape_compiler.py --events universal.ndjson.gz --report report.json
+    python scripts/shape_compiler.py --synthetic 200000
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import sys
+import time
+from collections import Counter
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple, Union
+
+from rdflib import BNode, Graph, Literal, Namespace, URIRef
+from rdflib.collection import Collection
+from rdflib.namespace import OWL, RDF, RDFS, XSD
+from rdflib.term import Node
+
+from ontology_loader import load_graph
+from validate_extensibility import _subclass_edges, _superclass_closure
+
+
+ONTOLOGY_DIR = Path(__file__).parent.parent / "ontology"
+DEFAULT_SHAPES = (ONTOLOGY_DIR / "gaming_shapes.ttl", ONTOLOGY_DIR / "shapes" / "player_shapes.ttl")
+DEFAULT_ONTOLOGY = ONTOLOGY_DIR / "gaming_ontology_v1.ttl"
+
+SH = Namespace("http://www.w3.org/ns/shacl#")
+CORE = Namespace("http://ontology.gaming.network/core#")
+LO = Namespace("http://livingontology.io/schema#")
+
+# Record keys for paths whose value is stored under another name
+PATH_ALIASES = {
+    "belongsToDevice": ("device_id",),
+    "occursInGame": ("game_id",),
+    "attributedTo": ("campaign_id",),
+    "partOfCampaign": ("campaign_id",),
+}
+
+# Non-validating shape predicates
+_IGNORED = frozenset({
+    RDF.type, RDFS.label, RDFS.comment, SH.name, SH.description, SH.order, SH.group,
+    SH.message, SH.severity, SH.deactivated, SH.targetClass, SH.path, SH.property, SH.flags,
+})
+
+Check = Callable[[Any, "_View"], bool]
+
+
+class UnsupportedShapeError(ValueError):
+    """A shape uses a constraint component the compiler does not implement."""
+
+
+# ============================================================================
+# Results
+# ============================================================================
+
+class Violation:
+    """One failed constraint on a focus node (and value, for property shapes)."""
+
+    __slots__ = ("focus", "shape", "path", "value", "component", "message", "severity")
+
+    def __init__(self, focus: Any, shape: Node, path: Optional[URIRef], value: Any, component: str,
+                 message: str, severity: URIRef = SH.Violation):
+        self.focus = focus
+        self.shape = shape
+        self.path = path
+        self.value = value
+        self.component = component
+        self.message = message
+        self.severity = severity
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "focus": str(self.focus),
+            "shape": str(self.shape),
+            "path": str(self.path) if self.path is not None else None,
+            "value": None if self.value is None else str(self.value),
+            "component": self.component,
+            "message": self.message,
+            "severity": _local_name(self.severity),
+        }
+
+    def __repr__(self) -> str:
+        return f"Violation({self.focus!s}: {self.message})"
+
+
+class ValidationReport:
+    """Violations of a batch, with per-message counts."""
+
+    def __init__(self):
+        self.violations: List[Violation] = []
+        self.focus_nodes = 0
+        self.seconds = 0.0
+
+    @property
+    def conforms(self) -> bool:
+        return not any(v.severity == SH.Violation for v in self.violations)
+
+    def by_message(self) -> Counter:
+        return Counter(v.message for v in self.violations)
+
+    def to_dict(self, limit: Optional[int] = 1000) -> Dict[str, Any]:
+        return {
+            "conforms": self.conforms,
+            "focus_nodes": self.focus_nodes,
+            "violations": len(self.violations),
+            "by_message": dict(self.by_message().most_common()),
+            "details": [v.to_dict() for v in self.violations[:limit]],
+            "timing_ms": round(self.seconds * 1000, 3),
+        }
+
+
+# ============================================================================
+# Value access (RDF graph / dictionaries)
+# ============================================================================
+
+def _local_name(iri: Any) -> str:
+    text = str(iri)
+    for sep in ("#", "/"):
+        if sep in text:
+            text = text.rsplit(sep, 1)[-1]
+    return text
+
+
+def _snake_case(name: str) -> str:
+    return re.sub(r"(?<=[a-z0-9])([A-Z])", r"_\1", name).lower()
+
+
+class _View:
+    """How compiled checks read values and types; one subclass per input kind."""
+
+    def __init__(self, superclasses: Dict[URIRef, FrozenSet[URIRef]]):
+        self.superclasses = superclasses
+
+    def values(self, focus: Any, prop: "PropertyValidator") -> List[Any]:
+        raise NotImplementedError
+
+    def is_instance(self, value: Any, cls: URIRef) -> bool:
+        raise NotImplementedError
+
+
+class _GraphView(_View):
+    def __init__(self, graph: Graph, superclasses: Dict[URIRef, FrozenSet[URIRef]]):
+        super().__init__(superclasses)
+        self.graph = graph
+        self._types: Dict[Node, FrozenSet[URIRef]] = {}
+
+    def values(self, focus: Node, prop: "PropertyValidator") -> List[Any]:
+        return list(self.graph.objects(focus, prop.path))
+
+    def types(self, node: Node) -> FrozenSet[URIRef]:
+        types = self._types.get(node)
+        if types is None:
+            found = set()
+            for t in self.graph.objects(node, RDF.type):
+                found |= self.superclasses.get(t, {t})
+            # A class used as a value (:hasEngagementLevel :HighEngagement)
+            found |= self.superclasses.get(node, frozenset())
+            types = self._types[node] = frozenset(found)
+        return types
+
+    def is_instance(self, value: Any, cls: URIRef) -> bool:
+        return cls in self.types(value)
+
+
+_COLLECTIONS = frozenset({list, tuple, set, frozenset})
+
+
+class _RecordView(_View):
+    def __init__(self, superclasses: Dict[URIRef, FrozenSet[URIRef]], namespace: Namespace,
+                 batch_types: FrozenSet[URIRef] = frozenset()):
+        super().__init__(superclasses)
+        self.namespace = namespace
+        self.batch_types = batch_types  # classes every record of the batch belongs to
+        # Class names a string value may use: full IRI, or local name within the namespace
+        self.class_names: Dict[str, FrozenSet[URIRef]] = {}
+        for cls, supers in superclasses.items():
+            self.class_names[str(cls)] = supers
+            if str(cls).startswith(str(namespace)):
+                self.class_names[str(cls)[len(str(namespace)):]] = supers
+
+    def values(self, record: Dict[str, Any], prop: "PropertyValidator") -> Sequence[Any]:
+        get = record.get
+        for key in prop.keys:
+            value = get(key)
+            if value is not None:
+                break
+        else:
+            properties = get("properties")
+            if type(properties) is not dict:
+                return ()
+            for key in prop.keys:
+                value = properties.get(key)
+                if value is not None:
+                    break
+            else:
+                return ()
+        if type(value) in _COLLECTIONS:
+            return [v for v in value if v is not None]
+        return (value,)
+
+    def resolve(self, name: Any) -> URIRef:
+        if isinstance(name, URIRef):
+            return name
+        name = str(name)
+        return URIRef(name) if ":" in name else self.namespace[name]
+
+    def record_types(self, record: Dict[str, Any]) -> FrozenSet[URIRef]:
+        types = set()
+        for key in ("@type", "event_type"):
+            declared = record.get(key)
+            for name in (declared if isinstance(declared, (list, tuple, set)) else [declared]):
+                if name:
+                    cls = self.resolve(name)
+                    types |= self.superclasses.get(cls, {cls})
+        return frozenset(types)
+
+    def is_instance(self, value: Any, cls: URIRef) -> bool:
+        kind = type(value)
+        if kind is dict:
+            return cls in self.batch_types or cls in self.record_types(value)
+        if (kind is not str and kind is not URIRef) or not value:
+            return False
+        supers = self.class_names.get(value)
+        if supers is not None:
+            return cls in supers
+        return True  # an identifier of another record; its class is not known here
+
+
+# ============================================================================
+# Constraint compilation
+# ============================================================================
+
+def _parses_datetime(value: str) -> bool:
+    if "T" not in value:
+        return False
+    try:
+        datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+        return True
+    except ValueError:
+        return False
+
+
+def _parses_date(value: str) -> bool:
+    try:
+        date.fromisoformat(value)
+        return True
+    except ValueError:
+        return False
+
+
+# Datatype -> {Python type of a plain value: None (accepted) or a further test}.
+# Keyed by exact type, so bool is not an integer and datetime is not a date.
+_PYTHON_DATATYPES: Dict[URIRef, Dict[type, Optional[Callable[[Any], bool]]]] = {
+    XSD.string: {str: None},
+    XSD.integer: {int: None},
+    XSD.int: {int: None},
+    XSD.long: {int: None},
+    XSD.decimal: {int: None, Decimal: None, float: math.isfinite},
+    XSD.double: {int: None, Decimal: None, float: None},
+    XSD.float: {int: None, Decimal: None, float: None},
+    XSD.boolean: {bool: None},
+    XSD.dateTime: {datetime: None, str: _parses_datetime},
+    XSD.date: {date: None, str: _parses_date},
+}
+
+# Plain (non-RDF) values that checks handle without isinstance() on rdflib terms
+_PLAIN = frozenset({str, int, float, bool, Decimal, datetime, date})
+_COMPARABLE = frozenset({int, float, Decimal, datetime, date})
+
+
+def _datatype_check(datatype: URIRef) -> Check:
+    python = _PYTHON_DATATYPES.get(datatype, {})
+
+    def check(value, view):
+        kind = type(value)
+        if kind in python:
+            test = python[kind]
+            return test is None or test(value)
+        if isinstance(value, Literal):
+            if value.datatype is None:
+                return datatype == (RDF.langString if value.language else XSD.string)
+            return value.datatype == datatype and not value.ill_typed
+        return False
+    return check
+
+
+def _range_check(bound: Any, compare: Callable[[Any, Any], bool]) -> Check:
+    def check(value, view):
+        if type(value) not in _COMPARABLE:
+            if not isinstance(value, Literal):
+                return False
+            value = value.toPython()
+            if type(value) not in _COMPARABLE:
+                return False
+        try:
+            return compare(value, bound)
+        except TypeError:
+            return False
+    return check
+
+
+def _in_check(members: Sequence[Node]) -> Check:
+    terms = set(members)
+    keys = set()
+    for member in members:
+        if isinstance(member, Literal):
+            keys.add(member.toPython())
+            if member.datatype in (None, XSD.string) and not member.language:
+                # "x" and "x"^^xsd:string are the same RDF 1.1 term
+                terms.update((Literal(str(member)), Literal(str(member), datatype=XSD.string)))
+        else:
+            keys.update((str(member), _local_name(member)))
+    terms, keys = frozenset(terms), frozenset(keys)
+
+    def check(value, view):
+        if type(value) in _PLAIN:
+            return value in keys
+        if isinstance(value, Node):
+            return value in terms
+        try:
+            return value in keys
+        except TypeError:
+            return False
+    return check
+
+
+def _pattern_check(pattern: str, flags: str) -> Check:
+    regex = re.compile(pattern, sum(getattr(re, f.upper(), 0) for f in flags if f in "imsx"))
+    search = regex.search
+
+    def check(value, view):
+        return type(value) is not BNode and search(str(value)) is not None
+    return check
+
+
+def _length_check(limit: int, minimum: bool) -> Check:
+    def check(value, view):
+        if type(value) is BNode:
+            return False
+        return len(str(value)) >= limit if minimum else len(str(value)) <= limit
+    return check
+
+
+def _class_check(cls: URIRef) -> Check:
+    def check(value, view):
+        return view.is_instance(value, cls)
+    return check
+
+
+def _literal_value(graph: Graph, node: Node, predicate: URIRef) -> Any:
+    value = graph.value(node, predicate)
+    return value.toPython() if isinstance(value, Literal) else value
+
+
+class PropertyValidator:
+    """One compiled property shape."""
+
+    def __init__(self, shape: Node, path: URIRef, min_count: Optional[int], max_count: Optional[int],
+                 checks: List[Tuple[str, Check]], message: Optional[str], severity: URIRef):
+        self.shape = shape
+        self.path = path
+        name = _local_name(path)
+        # snake_case first: the adapters' universal events use it
+        self.keys = tuple(dict.fromkeys((_snake_case(name), name) + PATH_ALIASES.get(name, ())))
+        self.min_count = min_count or 0
+        self.max_count = max_count
+        self.checks = checks
+        self.message = message
+        self.severity = severity
+
+    def validate(self, focus: Any, view: _View, out: Optional[List[Violation]], label: Any = None) -> bool:
+        values = view.values(focus, self)
+        ok = True
+        if len(values) < self.min_count:
+            ok = self._fail(out, label, None, "MinCountConstraintComponent",
+                            f"expected at least {self.min_count} value(s), found {len(values)}")
+        if self.max_count is not None and len(values) > self.max_count:
+            ok = self._fail(out, label, None, "MaxCountConstraintComponent",
+                            f"expected at most {self.max_count} value(s), found {len(values)}")
+        for value in values:
+            for component, check in self.checks:
+                if not check(value, view):
+                    ok = self._fail(out, label, value, component, f"value {value!s} fails {component}")
+                    if out is None:
+                        return False
+        return ok
+
+    def _fail(self, out, focus, value, component, detail) -> bool:
+        if out is not None:
+            message = self.message or f"{_local_name(self.path)}: {detail}"
+            out.append(Violation(focus, self.shape, self.path, value, component, message, self.severity))
+        return False
+
+
+class NodeValidator:
+    """One compiled node shape: node-level checks plus its property validators."""
+
+    def __init__(self, shape: Node, targets: FrozenSet[URIRef], checks: List[Tuple[str, Check]],
+                 properties: List[PropertyValidator], message: Optional[str], severity: URIRef):
+        self.shape = shape
+        self.targets = targets
+        self.checks = checks
+        self.properties = properties
+        self.message = message
+        self.severity = severity
+        self.validate_record = _generate_record_validator(self)
+
+    def validate(self, focus: Any, view: _View, out: Optional[List[Violation]], label: Any = None) -> bool:
+        """Append violations to `out` (or, with out=None, stop at the first) and return conformance."""
+        ok = True
+        for component, check in self.checks:
+            if not check(focus, view):
+                ok = self._fail(out, label, component)
+                if out is None:
+                    return False
+        for prop in self.properties:
+            if not prop.validate(focus, view, out, label):
+                ok = False
+                if out is None:
+                    return False
+        return ok
+
+    def _fail(self, out, focus, component) -> bool:
+        if out is not None:
+            message = self.message or f"{_local_name(self.shape)}: focus node fails {component}"
+            out.append(Violation(focus, self.shape, None, None, component, message, self.severity))
+        return False
+
+
+def _generate_record_validator(validator: NodeValidator) -> Callable[..., bool]:
+    """
+    validate() for dictionaries as one generated function: the key lookups,
+    count checks and value checks of every property shape are inlined, so a
+    record costs one call per shape instead of two per property.
+    """
+    env: Dict[str, Any] = {"COLLECTIONS": _COLLECTIONS, "EMPTY": {}, "NODE": validator,
+                           "NODE_CHECKS": validator.checks}
+    lines = ["def validate_record(record, view, out, label=None):", "    ok = True"]
+    if validator.checks:
+        lines += [
+            "    for component, check in NODE_CHECKS:",
+            "        if not check(record, view):",
+            "            ok = NODE._fail(out, label, component)",
+            "            if out is None:",
+            "                return False",
+        ]
+    lines += ["    get = record.get", "    properties = None"]
+
+    def fail(prop: str, value: str, component: str, detail: str, indent: str) -> List[str]:
+        return [f"{indent}ok = {prop}._fail(out, label, {value}, {component!r}, {detail})",
+                f"{indent}if out is None:", f"{indent}    return False"]
+
+    for i, prop in enumerate(validator.properties):
+        p = f"P{i}"
+        env[p] = prop
+        first, *rest = prop.keys
+        lines += [f"    # {prop.path}", f"    v = get({first!r})"]
+        for key in rest:
+            lines += ["    if v is None:", f"        v = get({key!r})"]
+        lines += [
+            "    if v is None:",
+            "        if properties is None:",
+            "            properties = get('properties')",
+            "            if type(properties) is not dict:",
+            "                properties = EMPTY",
+            f"        v = properties.get({first!r})",
+        ]
+        for key in rest:
+            lines += ["        if v is None:", f"            v = properties.get({key!r})"]
+        lines += [
+            "    if v is None:",
+            "        values = ()",
+            "    elif type(v) in COLLECTIONS:",
+            "        values = [x for x in v if x is not None]",
+            "    else:",
+            "        values = (v,)",
+        ]
+        if prop.min_count:
+            lines += [f"    if len(values) < {prop.min_count}:"]
+            lines += fail(p, "None", "MinCountConstraintComponent",
+                          f"f'expected at least {prop.min_count} value(s), found {{len(values)}}'", "        ")
+        if prop.max_count is not None:
+            lines += [f"    if len(values) > {prop.max_count}:"]
+            lines += fail(p, "None", "MaxCountConstraintComponent",
+                          f"f'expected at most {prop.max_count} value(s), found {{len(values)}}'", "        ")
+        if prop.checks:
+            lines += ["    for v in values:"]
+            for j, (component, check) in enumerate(prop.checks):
+                env[f"C{i}_{j}"] = check
+                lines += [f"        if not C{i}_{j}(v, view):"]
+                lines += fail(p, "v", component, f"f'value {{v!s}} fails {component}'", "            ")
+    lines.append("    return ok")
+    exec(compile("\n".join(lines), f"<shape {validator.shape}>", "exec"), env)
+    return env["validate_record"]
+
+
+def _or_check(alternatives: List[NodeValidator]) -> Check:
+    def check(value, view):
+        if type(value) is dict:
+            return any(alt.validate_record(value, view, None) for alt in alternatives)
+        return any(alt.validate(value, view, None) for alt in alternatives)
+    return check
+
+
+class ShapeCompiler:
+    """Compiled validators for a set of shapes graphs, grouped by target class."""
+
+    def __init__(self, shapes: Union[Graph, Sequence[Union[str, Path]]] = DEFAULT_SHAPES,
+                 ontology: Optional[Union[Graph, str, Path]] = DEFAULT_ONTOLOGY):
+        if isinstance(shapes, Graph):
+            graph = shapes
+        else:
+            graph = Graph()
+            for path in shapes:
+                graph += load_graph(path)
+        self.shapes_graph = graph
+        ontology_graph = load_graph(ontology) if isinstance(ontology, (str, Path)) else ontology
+
+        self.superclasses = self._hierarchy([g for g in (graph, ontology_graph) if g is not None])
+        self.validators: List[NodeValidator] = [
+            self._compile_node(shape)
+            for shape in sorted(set(graph.subjects(RDF.type, SH.NodeShape)), key=str)
+            if graph.value(shape, SH.deactivated) != Literal(True)
+        ]
+        self._by_class: Dict[URIRef, List[NodeValidator]] = {}
+
+    # ---------------------------------------------------------------- compile
+
+    @staticmethod
+    def _hierarchy(graphs: List[Graph]) -> Dict[URIRef, FrozenSet[URIRef]]:
+        edges: Dict[URIRef, set] = {}
+        for graph in graphs:
+            for sub, supers in _subclass_edges(graph).items():
+                edges.setdefault(sub, set()).update(supers)
+            for a, _, b in graph.triples((None, OWL.equivalentClass, None)):
+                if isinstance(a, URIRef) and isinstance(b, URIRef):
+                    edges.setdefault(a, set()).add(b)
+                    edges.setdefault(b, set()).add(a)
+        return {cls: frozenset(supers | {cls}) for cls, supers in _superclass_closure(edges).items()}
+
+    def _severity(self, node: Node) -> URIRef:
+        return self.shapes_graph.value(node, SH.severity) or SH.Violation
+
+    def _unsupported(self, node: Node, allowed: FrozenSet[URIRef]) -> None:
+        unknown = {p for p in self.shapes_graph.predicates(node, None) if p not in allowed}
+        if unknown:
+            raise UnsupportedShapeError(
+                f"Shape {node} uses unsupported constraint(s): {', '.join(sorted(map(_local_name, unknown)))}")
+
+    def _value_checks(self, node: Node) -> List[Tuple[str, Check]]:
+        g = self.shapes_graph
+        checks: List[Tuple[str, Check]] = []
+        for cls in g.objects(node, SH["class"]):
+            checks.append(("ClassConstraintComponent", _class_check(cls)))
+        for datatype in g.objects(node, SH.datatype):
+            checks.append(("DatatypeConstraintComponent", _datatype_check(datatype)))
+        for members in g.objects(node, SH["in"]):
+            checks.append(("InConstraintComponent", _in_check(list(Collection(g, members)))))
+        flags = str(g.value(node, SH.flags) or "")
+        for pattern in g.objects(node, SH.pattern):
+            checks.append(("PatternConstraintComponent", _pattern_check(str(pattern), flags)))
+        for predicate, minimum in ((SH.minLength, True), (SH.maxLength, False)):
+            for limit in g.objects(node, predicate):
+                checks.append((f"{_local_name(predicate)[:1].upper()}{_local_name(predicate)[1:]}ConstraintComponent",
+                               _length_check(int(limit), minimum)))
+        comparisons = (
+            (SH.minInclusive, lambda v, b: v >= b),
+            (SH.maxInclusive, lambda v, b: v <= b),
+            (SH.minExclusive, lambda v, b: v > b),
+            (SH.maxExclusive, lambda v, b: v < b),
+        )
+        for predicate, compare in comparisons:
+            for bound in g.objects(node, predicate):
+                name = _local_name(predicate)
+                checks.append((f"{name[:1].upper()}{name[1:]}ConstraintComponent",
+                               _range_check(bound.toPython(), compare)))
+        for alternatives in g.objects(node, SH["or"]):
+            checks.append(("OrConstraintComponent",
+                           _or_check([self._compile_node(alt) for alt in Collection(g, alternatives)])))
+        return checks
+
+    _VALUE_COMPONENTS = frozenset({
+        SH["class"], SH.datatype, SH["in"], SH.pattern, SH.minLength, SH.maxLength,
+        SH.minInclusive, SH.maxInclusive, SH.minExclusive, SH.maxExclusive, SH["or"],
+    })
+
+    def _compile_property(self, node: Node) -> PropertyValidator:
+        g = self.shapes_graph
+        self._unsupported(node, _IGNORED | self._VALUE_COMPONENTS | {SH.minCount, SH.maxCount})
+        path = g.value(node, SH.path)
+        if not isinstance(path, URIRef):
+            raise UnsupportedShapeError(f"Property shape {node} has no predicate path")
+        return PropertyValidator(
+            node, path,
+            _literal_value(g, node, SH.minCount), _literal_value(g, node, SH.maxCount),
+            self._value_checks(node),
+            _literal_value(g, node, SH.message), self._severity(node),
+        )
+
+    def _compile_node(self, node: Node) -> NodeValidator:
+        g = self.shapes_graph
+        self._unsupported(node, _IGNORED | self._VALUE_COMPONENTS)
+        return NodeValidator(
+            node,
+            frozenset(g.objects(node, SH.targetClass)),
+            self._value_checks(node),
+            [self._compile_property(p) for p in g.objects(node, SH.property)],
+            _literal_value(g, node, SH.message), self._severity(node),
+        )
+
+    def validators_for(self, cls: URIRef) -> List[NodeValidator]:
+        """Validators whose target class is `cls` or one of its superclasses."""
+        validators = self._by_class.get(cls)
+        if validators is None:
+            classes = self.superclasses.get(cls, frozenset({cls}))
+            validators = self._by_class[cls] = [v for v in self.validators if v.targets & classes]
+        return validators
+
+    # --------------------------------------------------------------- validate
+
+    def validate_graph(self, data: Graph) -> ValidationReport:
+        """Validate the focus nodes of every shape in an RDF graph."""
+        start = time.perf_counter()
+        report = ValidationReport()
+        superclasses = dict(self.superclasses)
+        if any(True for _ in data.triples((None, RDFS.subClassOf, None))):
+            superclasses.update(self._hierarchy([self.shapes_graph, data]))
+        view = _GraphView(data, superclasses)
+        subclasses: Dict[URIRef, set] = {}
+        for sub, supers in superclasses.items():
+            for sup in supers:
+                subclasses.setdefault(sup, set()).add(sub)
+
+        for validator in self.validators:
+            focus_nodes = set()
+            for target in validator.targets:
+                for cls in subclasses.get(target, set()) | {target}:
+                    focus_nodes.update(data.subjects(RDF.type, cls))
+            report.focus_nodes += len(focus_nodes)
+            for focus in sorted(focus_nodes, key=str):
+                validator.validate(focus, view, report.violations, focus)
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def validate_records(self, records: Iterable[Dict[str, Any]], cls: Union[str, URIRef],
+                         namespace: Namespace = CORE) -> ValidationReport:
+        """Validate dictionaries that are all instances of `cls` (a local name or IRI)."""
+        start = time.perf_counter()
+        report = ValidationReport()
+        cls = _RecordView(self.superclasses, namespace).resolve(cls)
+        view = _RecordView(self.superclasses, namespace, self.superclasses.get(cls, frozenset({cls})))
+        validators = self.validators_for(cls)
+        for index, record in enumerate(records):
+            report.focus_nodes += 1
+            _validate_record(validators, record, index, view, report.violations)
+        report.seconds = time.perf_counter() - start
+        return report
+
+    def validate_events(self, events: Iterable[Dict[str, Any]], namespace: Namespace = CORE) -> ValidationReport:
+        """Validate universal events against the shapes of their event_type's class."""
+        start = time.perf_counter()
+        report = ValidationReport()
+        view = _RecordView(self.superclasses, namespace)
+        for index, event in enumerate(events):
+            report.focus_nodes += 1
+            event_type = event.get("event_type")
+            if not event_type:
+                continue
+            _validate_record(self.validators_for(view.resolve(event_type)), event, index, view,
+                             report.violations)
+        report.seconds = time.perf_counter() - start
+        return report
+
+
+def _validate_record(validators: List[NodeValidator], record: Dict[str, Any], index: int, view: _View,
+                     out: List[Violation]) -> None:
+    before = len(out)
+    for validator in validators:
+        validator.validate_record(record, view, out)
+    if len(out) > before:
+        # Label only records that failed
+        label = _record_label(record, index)
+        for violation in out[before:]:
+            violation.focus = label
+
+
+def _record_label(record: Dict[str, Any], index: int) -> str:
+    for key in ("event_id", "device_id", "session_id", "player_id", "id"):
+        if record.get(key):
+            return str(record[key])
+    return f"#{index}"
+
+
+# ============================================================================
+# Command line
+# ============================================================================
+
+def synthetic_devices(n: int, seed: int = 0, error_rate: float = 0.01) -> List[Dict[str, Any]]:
+    """Device records, a fraction of them with one invalid field."""
+    rng = random.Random(seed)
+    devices = []
+    for i in range(n):
+        device = {
+            "device_id": f"d{i}",
+            "device_type": rng.choice(("phone", "tablet", "desktop", "console")),
+            "device_os": rng.choice(("ios", "android")),
+            "country": rng.choice(("gb", "us", "de", "fr")),
+            "session_count": rng.randrange(50),
+            "total_spent": round(rng.uniform(0, 100), 2),
+            "has_engagement_level": rng.choice(("LowEngagement", "MediumEngagement", "HighEngagement")),
+        }
+        if rng.random() < error_rate:
+            field, bad = rng.choice((("country", "GBR"), ("device_type", "watch"),
+                                     ("session_count", -1), ("device_id", "")))
+            device[field] = bad
+        devices.append(device)
+    return devices
+
+
+def _iter_ndjson(path: str) -> Iterable[Dict[str, Any]]:
+    sys.path.insert(0, str(Path(__file__).parent.parent / "adapters"))
+    from streaming_pipeline import iter_records, open_text
+
+    with open_text(path, "rt") as handle:
+        yield from iter_records(handle, "ndjson")
+
+
+def _print_report(title: str, report: ValidationReport) -> None:
+    rate = report.focus_nodes / report.seconds if report.seconds else 0.0
+    print(f"{title}: {report.focus_nodes} focus nodes, {len(report.violations)} violations "
+          f"in {report.seconds:.3f}s ({rate:,.0f}/s)")
+    for message, count in report.by_message().most_common(10):
+        print(f"  {count:>8}  {message}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Validate instance data with compiled SHACL shapes")
+    parser.add_argument("data", nargs="*", help="RDF instance data files")
+    parser.add_argument("--events", action="append", default=[], help="Universal event NDJSON (optionally .gz)")
+    parser.add_argument("--records", help="NDJSON records of one class (see --class)")
+    parser.add_argument("--class", dest="cls", default="Device", help="Class of --records (default: Device)")
+    parser.add_argument("--shapes", nargs="+", default=[str(p) for p in DEFAULT_SHAPES])
+    parser.add_argument("--synthetic", type=int, metavar="N", help="Validate N synthetic device records")
+    parser.add_argument("--report", type=Path, help="Write a JSON report to this file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    compiler = ShapeCompiler(args.shapes)
+    print(f"Compiled {len(compiler.validators)} shapes in {time.perf_counter() - start:.3f}s")
+
+    reports: Dict[str, ValidationReport] = {}
+    for path in args.data:
+        reports[path] = compiler.validate_graph(load_graph(path))
+    for path in args.events:
+        reports[path] = compiler.validate_events(_iter_ndjson(path))
+    if args.records:
+        reports[args.records] = compiler.validate_records(_iter_ndjson(args.records), args.cls)
+    if args.synthetic:
+        reports["synthetic devices"] = compiler.validate_records(synthetic_devices(args.synthetic), "Device")
+
+    for title, report in reports.items():
+        _print_report(title, report)
+    if args.report is not None:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({title: report.to_dict() for title, report in reports.items()}, f, indent=2)
+        print(f"Report written to {args.report}")
+
+    if all(report.conforms for report in reports.values()):
+        print("✅ All data conforms to the shapes")
+        return 0
+    print("⚠️  Shape violations found")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+SQLite Triple Store
+
+A persistent rdflib Store on the standard-library sqlite3 module (no extra
+dependency), for graphs that should not be re-parsed into memory by every
+process:
+
+- terms are interned once (terms table); triples are integer rows with
+  SPO / POS / OSP indexes, so every triple pattern is an index lookup
+- write_graph() bulk-loads a graph into a new database file atomically
+- read-only opens use SQLite's immutable mode and memory-mapped I/O: opening
+  takes milliseconds, nothing is parsed, and any number of worker processes
+  share one copy through the OS page cache
+
+The store holds a single (default) graph. Registered with rdflib as
+"SQLiteTriples", e.g. Graph(store="SQLiteTriples").open(path, create=True).
+
+Usage:
+    python scripts/sqlite_store.py load release.sqlite ontology/worldmodeldata_universal_gaming_ontology_v1.ttl
+    python scripts/sqlite_store.py info release.sqlite
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Tuple, Union
+
+from rdflib import BNode, Graph, Literal, URIRef, plugin
+from rdflib.store import NO_STORE, VALID_STORE, Store
+
+
+SCHEMA_VERSION = 1
+MMAP_SIZE = 256 * 1024 * 1024
+
+_URI, _BNODE, _LITERAL = 0, 1, 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS terms (
+    id INTEGER PRIMARY KEY,
+    kind INTEGER NOT NULL,
+    value TEXT NOT NULL,
+    datatype TEXT NOT NULL DEFAULT '',
+    lang TEXT NOT NULL DEFAULT '',
+    UNIQUE (kind, value, datatype, lang)
+);
+CREATE TABLE IF NOT EXISTS triples (
+    s INTEGER NOT NULL, p INTEGER NOT NULL, o INTEGER NOT NULL,
+    PRIMARY KEY (s, p, o)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS triples_pos ON triples (p, o, s);
+CREATE INDEX IF NOT EXISTS triples_osp ON triples (o, s, p);
+CREATE TABLE IF NOT EXISTS namespaces (prefix TEXT PRIMARY KEY, uri TEXT NOT NULL);
+"""
+
+
+def _encode(term) -> Tuple[int, str, str, str]:
+    if isinstance(term, Literal):
+        return _LITERAL, str(term), str(term.datatype or ""), term.language or ""
+    if isinstance(term, BNode):
+        return _BNODE, str(term), "", ""
+    return _URI, str(term), "", ""
+
+
+def _decode(kind: int, value: str, datatype: str, lang: str):
+    if kind == _URI:
+        return URIRef(value)
+    if kind == _BNODE:
+        return BNode(value)
+    return Literal(value, lang=lang or None, datatype=URIRef(datatype) if datatype else None)
+
+
+class SQLiteStore(Store):
+    """rdflib Store persisting one graph in an SQLite database file."""
+
+    context_aware = False
+    formula_aware = False
+    transaction_aware = True
+
+    def __init__(self, configuration: Optional[str] = None, identifier=None, read_only: bool = False):
+        self.read_only = read_only
+        self._conn: Optional[sqlite3.Connection] = None
+        self._ids: Dict[Tuple[int, str, str, str], int] = {}
+        self._terms: Dict[int, object] = {}
+        # Prefixes bound on a read-only store live only in this process
+        self._local_namespaces: Dict[str, URIRef] = {}
+        super().__init__(configuration, identifier)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def open(self, configuration: Union[str, Path], create: bool = False) -> int:
+        path = Path(configuration)
+        if self.read_only:
+            if not path.exists():
+                return NO_STORE
+            uri = f"{path.resolve().as_uri()}?mode=ro&immutable=1"
+            self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            self._conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        else:
+            if not path.exists() and not create:
+                return NO_STORE
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(
+                "INSERT OR IGNORE INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),)
+            )
+            self._conn.commit()
+        version = self._conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if version is None or int(version[0]) != SCHEMA_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {SCHEMA_VERSION} triple store")
+        return VALID_STORE
+
+    def close(self, commit_pending_transaction: bool = False) -> None:
+        if self._conn is not None:
+            if commit_pending_transaction and not self.read_only:
+                self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+    def commit(self) -> None:
+        if not self.read_only:
+            self._conn.commit()
+
+    def rollback(self) -> None:
+        if not self.read_only:
+            self._conn.rollback()
+
+    # ------------------------------------------------------------------
+    # Term interning
+    # ------------------------------------------------------------------
+
+    def _term_id(self, term, create: bool = False) -> Optional[int]:
+        key = _encode(term)
+        term_id = self._ids.get(key)
+        if term_id is not None:
+            return term_id
+        row = self._conn.execute(
+            "SELECT id FROM terms WHERE kind = ? AND value = ? AND datatype = ? AND lang = ?", key
+        ).fetchone()
+        if row is not None:
+            term_id = row[0]
+        elif create:
+            term_id = self._conn.execute(
+                "INSERT INTO terms (kind, value, datatype, lang) VALUES (?, ?, ?, ?)", key
+            ).lastrowid
+        else:
+            return None
+        self._ids[key] = term_id
+        return term_id
+
+    def _term(self, term_id: int):
+        term = self._terms.get(term_id)
+        if term is None:
+            row = self._conn.execute(
+                "SELECT kind, value, datatype, lang FROM terms WHERE id = ?", (term_id,)
+            ).fetchone()
+            term = self._terms[term_id] = _decode(*row)
+        return term
+
+    # ------------------------------------------------------------------
+    # Triples
+    # ------------------------------------------------------------------
+
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise PermissionError("SQLite triple store is opened read-only")
+
+    def add(self, triple, context=None, quoted: bool = False) -> None:
+        self._check_writable()
+        Store.add(self, triple, context, quoted)
+        s, p, o = (self._term_id(t, create=True) for t in triple)
+        self._conn.execute("INSERT OR IGNORE INTO triples VALUES (?, ?, ?)", (s, p, o))
+
+    def addN(self, quads: Iterable) -> None:
+        self._check_writable()
+        rows = [tuple(self._term_id(t, create=True) for t in (s, p, o)) for s, p, o, _ in quads]
+        self._conn.executemany("INSERT OR IGNORE INTO triples VALUES (?, ?, ?)", rows)
+
+    def remove(self, triple_pattern, context=None) -> None:
+        self._check_writable()
+        where, params = self._where(triple_pattern)
+        if where is None:
+            return
+        self._conn.execute(f"DELETE FROM triples{where}", params)
+        Store.remove(self, triple_pattern, context)
+
+    def _where(self, triple_pattern) -> Tuple[Optional[str], list]:
+        clauses, params = [], []
+        for column, term in zip("spo", triple_pattern):
+            if term is None:
+                continue
+            term_id = self._term_id(term)
+            if term_id is None:
+                return None, []  # unknown term: nothing can match
+            clauses.append(f"{column} = ?")
+            params.append(term_id)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def triples(self, triple_pattern, context=None) -> Iterator:
+        where, params = self._where(triple_pattern)
+        if where is None:
+            return
+        term = self._term
+        for s, p, o in self._conn.execute(f"SELECT s, p, o FROM triples{where}", params).fetchall():
+            yield (term(s), term(p), term(o)), iter(())
+
+    def __len__(self, context=None) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM triples").fetchone()[0]
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    # ------------------------------------------------------------------
+    # Namespaces
+    # ------------------------------------------------------------------
+
+    def bind(self, prefix: str, namespace: URIRef, override: bool = True) -> None:
+        if self.read_only:
+            if override or prefix not in dict(self.namespaces()):
+                self._local_namespaces[prefix] = URIRef(namespace)
+            return
+        if override:
+            self._conn.execute("DELETE FROM namespaces WHERE uri = ?", (str(namespace),))
+            self._conn.execute("INSERT OR REPLACE INTO namespaces VALUES (?, ?)", (prefix, str(namespace)))
+        else:
+            self._conn.execute("INSERT OR IGNORE INTO namespaces VALUES (?, ?)", (prefix, str(namespace)))
+
+    def namespace(self, prefix: str) -> Optional[URIRef]:
+        return dict(self.namespaces()).get(prefix)
+
+    def prefix(self, namespace: URIRef) -> Optional[str]:
+        for prefix, uri in self.namespaces():
+            if uri == URIRef(namespace):
+                return prefix
+        return None
+
+    def namespaces(self) -> Iterator[Tuple[str, URIRef]]:
+        merged = {prefix: URIRef(uri) for prefix, uri in self._conn.execute("SELECT prefix, uri FROM namespaces")}
+        merged.update(self._local_namespaces)
+        return iter(list(merged.items()))
+
+
+plugin.register("SQLiteTriples", Store, "sqlite_store", "SQLiteStore")
+
+
+def write_graph(graph: Graph, path: Union[str, Path]) -> None:
+    """
+    Bulk-load a graph (and its prefixes) into a new database file.
+
+    Written to a temporary file and renamed, so readers never see a partial
+    store.
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    if tmp.exists():
+        tmp.unlink()
+    conn = sqlite3.connect(str(tmp))
+    try:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.executescript(_SCHEMA)
+        conn.execute("INSERT INTO meta VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        ids: Dict[Tuple[int, str, str, str], int] = {}
+        rows = []
+        for triple in graph:
+            row = []
+            for term in triple:
+                key = _encode(term)
+                term_id = ids.get(key)
+                if term_id is None:
+                    term_id = ids[key] = len(ids) + 1
+                row.append(term_id)
+            rows.append(row)
+        conn.executemany(
+            "INSERT INTO terms (id, kind, value, datatype, lang) VALUES (?, ?, ?, ?, ?)",
+            ((term_id, *key) for key, term_id in ids.items()),
+        )
+        conn.executemany("INSERT OR IGNORE INTO triples VALUES (?, ?, ?)", rows)
+        conn.executemany(
+            "INSERT OR REPLACE INTO namespaces VALUES (?, ?)",
+            ((prefix, str(uri)) for prefix, uri in graph.namespaces()),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp, path)
+
+
+def open_graph(path: Union[str, Path], read_only: bool = True) -> Graph:
+    """
+    Open a store file as a Graph.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    store = SQLiteStore(read_only=read_only)
+    if store.open(str(path)) != VALID_STORE:
+        raise FileNotFoundError(path)
+    return Graph(store=store)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="SQLite-backed rdflib triple store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    load = sub.add_parser("load", help="Parse RDF files into a new store file")
+    load.add_argument("store")
+    load.add_argument("files", nargs="+")
+    load.add_argument("--format", default="turtle")
+    info = sub.add_parser("info", help="Open a store read-only and report size and timing")
+    info.add_argument("store")
+    args = parser.parse_args()
+
+    if args.command == "load":
+        start = time.perf_counter()
+        graph = Graph()
+        for name in args.files:
+            graph.parse(name, format=args.format)
+        write_graph(graph, args.store)
+        print(f"Wrote {len(graph)} triples to {args.store} in {time.perf_counter() - start:.2f}s")
+        return 0
+
+    start = time.perf_counter()
+    graph = open_graph(args.store)
+    opened = time.perf_counter() - start
+    print(f"{args.store}: {len(graph)} triples, {Path(args.store).stat().st_size} bytes, "
+          f"opened in {opened * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
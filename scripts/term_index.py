@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Namespace-Aware Term Index
+
+One pass over a graph's triples builds a lookup from local name to the
+terms that carry it:
+
+    local name -> [TermEntry(namespace, iri, types), ...]
+
+plus an IRI -> entry map, so "does ug:Player exist?", "is it a class?" and
+"which namespaces define `Session`?" are dictionary lookups instead of
+triple-pattern scans or string-prefix tests over every subject.
+
+Used by build_universal_release.py to resolve legacy core terms to UG/UB
+targets; nothing in it is builder-specific, so validators can share it.
+
+Usage:
+    from term_index import TermIndex
+    index = TermIndex.from_graph(graph)
+    index.lookup("Player", namespaces=(UG, UB))
+"""
+
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+
+from rdflib import Graph, URIRef
+from rdflib.namespace import OWL, RDF, RDFS
+
+
+CLASS_TYPES = frozenset({OWL.Class, RDFS.Class})
+PROPERTY_TYPES = frozenset({
+    OWL.ObjectProperty,
+    OWL.DatatypeProperty,
+    OWL.AnnotationProperty,
+    RDF.Property,
+})
+
+
+def split_iri(iri: str):
+    """Split an IRI into (namespace, local name) at the last '#' or '/'."""
+    cut = max(iri.rfind("#"), iri.rfind("/")) + 1
+    return iri[:cut], iri[cut:]
+
+
+@dataclass
+class TermEntry:
+    namespace: str
+    iri: URIRef
+    types: Set[URIRef] = field(default_factory=set)
+
+    @property
+    def kind(self) -> Optional[str]:
+        """Either "class", "property" or None (untyped / other)."""
+        if self.types & CLASS_TYPES:
+            return "class"
+        if self.types & PROPERTY_TYPES:
+            return "property"
+        return None
+
+
+class TermIndex:
+    """Local name / IRI / rdf:type index over the URI subjects of one or more graphs."""
+
+    def __init__(self):
+        self.by_local: Dict[str, List[TermEntry]] = {}
+        self.by_iri: Dict[URIRef, TermEntry] = {}
+
+    @classmethod
+    def from_graph(cls, *graphs: Graph) -> "TermIndex":
+        index = cls()
+        for graph in graphs:
+            index.add_graph(graph)
+        return index
+
+    def add_graph(self, graph: Graph) -> None:
+        """Index every URI subject of a graph (single pass over its triples)."""
+        by_iri = self.by_iri
+        type_pred = RDF.type
+        for s, p, o in graph:
+            entry = by_iri.get(s)
+            if entry is None:
+                if not isinstance(s, URIRef):
+                    continue
+                namespace, local = split_iri(str(s))
+                entry = by_iri[s] = TermEntry(namespace, s)
+                self.by_local.setdefault(local, []).append(entry)
+            if p == type_pred:
+                entry.types.add(o)
+
+    def __contains__(self, iri) -> bool:
+        return URIRef(iri) in self.by_iri
+
+    def __len__(self) -> int:
+        return len(self.by_iri)
+
+    def get(self, iri) -> Optional[TermEntry]:
+        return self.by_iri.get(URIRef(iri))
+
+    def lookup(
+        self,
+        local: str,
+        namespaces: Optional[Iterable[str]] = None,
+        kind: Optional[str] = None,
+    ) -> List[TermEntry]:
+        """
+        Terms with a given local name.
+
+        Args:
+            local: Local name
+            namespaces: Only these namespaces, returned in this preference order
+            kind: Only "class" / "property" terms
+
+        Returns:
+            Matching entries (empty list if none)
+        """
+        entries = self.by_local.get(local, [])
+        if kind is not None:
+            entries = [e for e in entries if e.kind == kind]
+        if namespaces is not None:
+            rank = {str(ns): i for i, ns in enumerate(namespaces)}
+            entries = sorted((e for e in entries if e.namespace in rank), key=lambda e: rank[e.namespace])
+        return entries
+
+    def iris_of_type(self, types: Iterable[URIRef]) -> Set[str]:
+        """IRIs (as strings) typed with any of the given rdf:types."""
+        wanted: FrozenSet[URIRef] = frozenset(types)
+        return {str(e.iri) for e in self.by_iri.values() if e.types & wanted}
+
+    def classes(self) -> Set[str]:
+        return self.iris_of_type(CLASS_TYPES)
+
+    def properties(self) -> Set[str]:
+        return self.iris_of_type(PROPERTY_TYPES)
+
+
+def main() -> int:
+    """Benchmark index construction and lookups against the prefix-scan approach."""
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else (
+        Path(__file__).parent.parent / "ontology" / "versions" / "v042.ttl"
+    )
+    graph = Graph().parse(str(path), format="turtle")
+    locals_ = [split_iri(str(s))[1] for s in set(graph.subjects()) if isinstance(s, URIRef)]
+    namespaces = sorted({split_iri(str(s))[0] for s in graph.subjects() if isinstance(s, URIRef)})
+
+    start = time.perf_counter()
+    scan = {}
+    for s in graph.subjects(None, None):
+        if isinstance(s, URIRef):
+            for ns in namespaces:
+                if str(s).startswith(ns):
+                    scan.setdefault(split_iri(str(s))[1], set()).add(ns)
+    scan_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = TermIndex.from_graph(graph)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for local in locals_:
+        index.lookup(local, namespaces=namespaces[:2])
+    lookup_s = time.perf_counter() - start
+
+    print(f"{path.name}: {len(graph)} triples, {len(index)} subjects, {len(namespaces)} namespaces")
+    print(f"  prefix scan of subjects: {scan_s * 1000:.1f} ms")
+    print(f"  TermIndex build:         {build_s * 1000:.1f} ms")
+    print(f"  {len(locals_)} lookups:          {lookup_s * 1000:.2f} ms "
+          f"({lookup_s / max(len(locals_), 1) * 1e6:.2f} us each)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
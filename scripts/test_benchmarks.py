@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test Benchmark Suite
+
+Runs a tiny-scale subset of the benchmarks and checks the result shape and
+the regression comparison.
+"""
+
+import sys
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from benchmarks import (
+    Benchmark,
+    collect_benchmarks,
+    compare,
+    run_benchmarks,
+    _synthetic_events,
+    MixpanelAdapter,
+)
+
+
+def test_collect_covers_all_suites():
+    """Every ontology file, both validators, each adapter and each video scale is present"""
+    names = [b.name for b in collect_benchmarks(events=10, video_scales=(5, 50))]
+    ontology = Path(__file__).parent.parent / "ontology"
+    assert sum(1 for n in names if n.startswith("parse.")) == len(list(ontology.rglob("*.ttl")))
+    for expected in ("build_release", "validate_coverage", "validate_extensibility",
+                     "transform_batch.UnityAnalyticsAdapter", "transform_batch.MixpanelAdapter",
+                     "transform_batch.AdinmoAdapter", "transform_batch.ExampleGameAdapter",
+                     "video_correlate.5", "video_correlate.50"):
+        assert expected in names, expected
+
+
+def test_run_small_subset():
+    """Adapters and video correlation run at small scale with throughput recorded"""
+    benchmarks = [b for b in collect_benchmarks(events=120, video_scales=(50,))
+                  if b.name.startswith(("transform_batch.", "video_correlate."))]
+    results = run_benchmarks(benchmarks, repeat=2)
+    assert set(results) == {b.name for b in benchmarks}
+    for result in results.values():
+        assert result["repeat"] == 2
+        assert 0 < result["min_s"] <= result["median_s"]
+        assert result["units"] in (120, 50)
+        assert result["per_unit_us"] > 0
+
+
+def test_synthetic_events_transform():
+    """Synthetic events are valid input for their adapter"""
+    events = _synthetic_events(MixpanelAdapter, 20)
+    assert len(MixpanelAdapter("Mixpanel", {}).transform_batch(events)) == 20
+
+
+def test_compare_flags_regressions():
+    """Only benchmarks slower than the threshold are reported"""
+    previous = {"a": {"min_s": 1.0}, "b": {"min_s": 1.0}, "gone": {"min_s": 1.0}}
+    current = {"a": {"min_s": 1.5}, "b": {"min_s": 1.1}, "new": {"min_s": 9.0}}
+    assert compare(current, previous, threshold=1.2) == ["a"]
+
+
+def test_setup_is_not_timed():
+    """setup() runs once, outside the timed region"""
+    calls = []
+    bench = Benchmark("noop", lambda state: state.append(1), setup=lambda: calls.append(0) or [])
+    results = run_benchmarks([bench], repeat=3)
+    assert calls == [0]
+    assert results["noop"]["repeat"] == 3
+
+
+if __name__ == "__main__":
+    test_collect_covers_all_suites()
+    test_run_small_subset()
+    test_synthetic_events_transform()
+    test_compare_flags_regressions()
+    test_setup_is_not_timed()
+    print("✅ All benchmark suite tests passed")
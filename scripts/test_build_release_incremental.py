@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test Incremental Release Build
+
+Builds the release from the repository's ontology files into a temporary
+directory and checks that incremental builds match a full build, that a
+no-op rebuild is skipped and that edits only recompute the touched terms.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from rdflib import Graph
+from rdflib.compare import isomorphic
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from build_universal_release import BuildConfig, build_release, run_build
+
+
+ONTOLOGY = Path(__file__).parent.parent / "ontology"
+
+
+def _config(tmp: Path) -> BuildConfig:
+    shutil.copy(ONTOLOGY / "gaming_ontology_v1.ttl", tmp / "core.ttl")
+    return BuildConfig(
+        repo_root=tmp,
+        core_ttl=tmp / "core.ttl",
+        universal_hb_ttl=ONTOLOGY / "universal" / "human_behavior_foundation.ttl",
+        universal_gaming_ttl=ONTOLOGY / "universal" / "gaming_foundation_v1.ttl",
+        out_canonical=tmp / "universal" / "release.ttl",
+        out_docker_copy=tmp / "docker" / "release.ttl",
+    )
+
+
+def _parse(path: Path) -> Graph:
+    return Graph().parse(str(path), format="turtle")
+
+
+def test_incremental_matches_full_build():
+    """Fresh build, no-op rebuild and a one-term edit all match build_release()."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg = _config(Path(tmp))
+
+        stats = run_build(cfg)
+        assert not stats["up_to_date"]
+        assert stats["core_terms_reused"] == 0
+        assert cfg.manifest.exists()
+        assert isomorphic(_parse(cfg.out_canonical), build_release(cfg)[0])
+        assert cfg.out_docker_copy.read_bytes() == cfg.out_canonical.read_bytes()
+        if stats["second_output"] == "hardlink":
+            assert os.path.samefile(cfg.out_canonical, cfg.out_docker_copy)
+
+        start = time.perf_counter()
+        assert run_build(cfg)["up_to_date"]
+        assert time.perf_counter() - start < 1.0
+
+        with open(cfg.core_ttl, "a", encoding="utf-8") as f:
+            f.write('\n<http://ontology.gaming.network/core#GameSession> '
+                    '<http://www.w3.org/2000/01/rdf-schema#comment> "edited"@en .\n')
+        stats = run_build(cfg)
+        assert not stats["up_to_date"]
+        assert stats["core_terms_recomputed"] == 1
+        assert stats["core_terms_reused"] == stats["core_terms_absorbed"] - 1
+        assert isomorphic(_parse(cfg.out_canonical), build_release(cfg)[0])
+
+
+def test_stale_output_is_rebuilt():
+    """A deleted or modified output forces a rebuild even with unchanged inputs."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg = _config(Path(tmp))
+        run_build(cfg)
+        cfg.out_docker_copy.unlink()
+        assert not run_build(cfg)["up_to_date"]
+        assert cfg.out_docker_copy.exists()
+        assert run_build(cfg)["up_to_date"]
+        assert run_build(cfg, full=True)["core_terms_reused"] == 0
+
+
+if __name__ == "__main__":
+    test_incremental_matches_full_build()
+    test_stale_output_is_rebuilt()
+    print("✅ All incremental release build tests passed")
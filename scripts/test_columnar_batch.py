@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test Columnar Batch Transform
+
+Checks that GameSourceAdapter.transform_columns() produces the same universal
+events as the row-oriented transform_batch().
+"""
+
+import sys
+from pathlib import Path
+
+# Add adapters directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "adapters"))
+
+from adinmo_adapter import AdinmoAdapter
+from mixpanel_adapter import MixpanelAdapter
+from unity_adapter import UnityAnalyticsAdapter
+from game_source_adapter_template import ExampleGameAdapter
+
+
+SAMPLE_EVENTS = {
+    UnityAnalyticsAdapter: [
+        {"event_id": "u1", "event_name": "level_start", "user_id": "user123", "session_id": "s1",
+         "timestamp": 1699123456, "parameters": {"level_number": 5, "difficulty": "medium"}},
+        {"event_id": "u2", "event_name": "Custom_IAP_Bundle", "userId": "user456", "app_id": "app1",
+         "time": 1699123456000, "parameters": {"product_id": "item001", "amount": 9.99}},
+        {"event_id": "u3", "event_name": "session_start", "user_id": "user123",
+         "timestamp": "2023-11-05T12:30:56Z"},
+    ],
+    MixpanelAdapter: [
+        {"event_id": "m1", "event_name": "session_start", "distinct_id": "d1", "time": 1699123456,
+         "properties": {"sessionCount": 42, "session_id": "s9"}},
+        {"event_id": "m2", "event_name": "iap_purchase", "user_id": "d2", "time": 1699123500,
+         "properties": {"iapCount": 3, "cost": 4.99, "game_id": "flick"}},
+    ],
+    AdinmoAdapter: [
+        {"event_id": "a1", "table": "tracker_events", "EVENT_TYPE": "click", "ANON_DEVICE_ID": "dev1",
+         "SESSION_ID": "s1", "GAME_ID": 42, "ACTIVITY_TS": "2025-01-01T00:00:00Z", "AD_TYPE": "banner"},
+        {"event_id": "a2", "table": "tracker_events", "EVENT_TYPE": "video_complete", "anon_device_id": "dev2",
+         "ACTIVITY_TS": 1735689600, "COUNTRY": "gb"},
+        {"event_id": "a3", "table": "iap", "ANON_DEVICE_ID": "dev1", "ACTIVITY_TS": 1735689600123},
+    ],
+    ExampleGameAdapter: [
+        {"event_id": "e1", "event_name": "level_complete", "user_id": "user1", "timestamp": 1699123456,
+         "properties": {"iapCount": 1}},
+    ],
+}
+
+
+def _to_columns(events):
+    keys = sorted({k for e in events for k in e})
+    return {k: [e.get(k) for e in events] for k in keys}
+
+
+def test_columnar_matches_row_transform():
+    """transform_columns() rows equal transform_batch() output."""
+    for adapter_cls, events in SAMPLE_EVENTS.items():
+        adapter = adapter_cls(source_name=adapter_cls.__name__, mapping_config={})
+        expected = adapter.transform_batch(events)
+        batch = adapter.transform_columns(_to_columns(events))
+
+        assert len(batch) == len(events)
+        for exp, got in zip(expected, batch):
+            assert got == exp, (adapter_cls.__name__, got, exp)
+
+
+def test_columnar_output_is_lazy():
+    """Universal columns are available without materializing rows."""
+    adapter = UnityAnalyticsAdapter(source_name="UnityAnalytics", mapping_config={})
+    batch = adapter.transform_columns(_to_columns(SAMPLE_EVENTS[UnityAnalyticsAdapter]))
+
+    assert batch.columns["event_type"] == ["EngagementEvent", "MonetizationEvent", "GameSession"]
+    assert batch.columns["device_id"] == ["user123", "user456", "user123"]
+    assert batch.columns["game_id"] == [None, "app1", None]
+
+
+if __name__ == "__main__":
+    test_columnar_matches_row_transform()
+    test_columnar_output_is_lazy()
+    print("Columnar batch tests passed")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test Event ID Generator
+
+Checks the uuid4 / content_hash / counter event ID strategies and that source
+IDs always take priority.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add adapters directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "adapters"))
+
+from adinmo_adapter import AdinmoAdapter
+from mixpanel_adapter import MixpanelAdapter
+
+
+EVENTS = [
+    {"event_name": "iap_purchase", "distinct_id": "d1", "time": 1699123456},
+    {"event_name": "iap_purchase", "distinct_id": "d1", "time": 1699123457},
+    {"event_name": "session_start", "distinct_id": "d1", "time": 1699123456},
+    {"event_name": "iap_purchase", "distinct_id": "d2", "time": 1699123456},
+]
+
+
+def _adapter(strategy, cls=MixpanelAdapter, **config):
+    return cls(source_name="Src", mapping_config={"event_id_strategy": strategy, **config})
+
+
+def test_source_id_wins():
+    """An existing source ID is used under every strategy."""
+    for strategy in ("uuid4", "content_hash", "counter"):
+        adapter = _adapter(strategy)
+        assert adapter.transform_event({"insert_id": 17, "event_name": "move"})["event_id"] == "17"
+
+
+def test_content_hash_is_deterministic():
+    """Same content -> same ID across runs; any differing field -> new ID."""
+    first = [e["event_id"] for e in _adapter("content_hash").transform_batch(EVENTS)]
+    second = [e["event_id"] for e in _adapter("content_hash").transform_batch(EVENTS)]
+    assert first == second
+    assert len(set(first)) == len(EVENTS)
+    other_source = MixpanelAdapter(source_name="Other", mapping_config={"event_id_strategy": "content_hash"})
+    assert other_source.transform_event(EVENTS[0])["event_id"] != first[0]
+
+
+def test_content_hash_uses_all_name_columns():
+    """Adinmo event names span table + EVENT_TYPE; both feed the hash."""
+    adapter = _adapter("content_hash", AdinmoAdapter)
+    base = {"table": "tracker_events", "ANON_DEVICE_ID": "dev1", "ACTIVITY_TS": 1735689600}
+    click = adapter.transform_event(dict(base, EVENT_TYPE="click"))["event_id"]
+    view = adapter.transform_event(dict(base, EVENT_TYPE="view"))["event_id"]
+    assert click != view
+
+
+def test_counter_is_monotonic():
+    """The counter strategy numbers events per worker."""
+    adapter = _adapter("counter", event_id_worker="w0")
+    ids = [e["event_id"] for e in adapter.transform_batch(EVENTS)]
+    assert ids == [f"Src-w0-{os.getpid():x}-{i}" for i in range(len(EVENTS))]
+
+
+def test_columnar_matches_rows():
+    """transform_columns() generates the same deterministic IDs."""
+    events = EVENTS + [{"event_id": "x", "event_name": "move", "distinct_id": "d3", "time": 1}]
+    columns = {k: [e.get(k) for e in events] for k in sorted({k for e in events for k in e})}
+    adapter = _adapter("content_hash")
+    expected = [e["event_id"] for e in adapter.transform_batch(events)]
+    assert adapter.transform_columns(columns).columns["event_id"] == expected
+
+
+def test_unknown_strategy_rejected():
+    """An unknown strategy fails at construction."""
+    try:
+        _adapter("sequential")
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError")
+
+
+if __name__ == "__main__":
+    test_source_id_wins()
+    test_content_hash_is_deterministic()
+    test_content_hash_uses_all_name_columns()
+    test_counter_is_monotonic()
+    test_columnar_matches_rows()
+    test_unknown_strategy_rejected()
+    print("All event ID generator tests passed")
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Test Event Type Resolver
+
+Checks exact matches, ordered pattern fallbacks and the bounded memo cache.
+"""
+
+import sys
+from pathlib import Path
+
+# Add adapters directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "adapters"))
+
+from event_type_resolver import EventTypeResolver
+from unity_adapter import UnityAnalyticsAdapter
+
+
+def test_pattern_priority_follows_declaration_order():
+    """Earlier rules win even when a later rule matches further left."""
+    adapter = UnityAnalyticsAdapter(source_name="UnityAnalytics", mapping_config={})
+
+    assert adapter.map_event_type({"event_name": "Purchase"}) == "MonetizationEvent"
+    assert adapter.map_event_type({"event_name": "purchase_after_level"}) == "EngagementEvent"
+    assert adapter.map_event_type({"event_name": "iap_session"}) == "MonetizationEvent"
+    assert adapter.map_event_type({"event_name": "tutorial_step"}) == "GameEvent"
+    assert adapter.map_event_type({}) == "GameEvent"
+
+
+def test_cache_is_bounded():
+    """The memo cache never grows past cache_size."""
+    resolver = EventTypeResolver({"a": "A"}, [(r"b", "B")], cache_size=4)
+    for i in range(20):
+        resolver.resolve(f"b{i}")
+
+    assert resolver.cache_info() == {"size": 4, "max_size": 4}
+    assert resolver.resolve("A") == "A"
+    assert resolver.resolve("b19") == "B"
+
+
+if __name__ == "__main__":
+    test_pattern_priority_follows_declaration_order()
+    test_cache_is_bounded()
+    print("Event type resolver tests passed")
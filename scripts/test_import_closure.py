@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test Import Closure
+
+Checks offline owl:imports resolution through ontology/module_registry.json,
+shared-import deduplication and module include/exclude views.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from import_closure import COMPOSED_ENTRYPOINT, load_closure
+from ontology_loader import cache_stats, clear_memo
+
+
+GAMING = "http://ontology.gaming.network/universal/gaming"
+HUMAN_BEHAVIOR = "http://ontology.gaming.network/universal/human_behavior"
+FLAGSHIP = "http://ontology.gaming.network/universal/gaming_ontology"
+GAME_DESIGN = "http://ontology.gaming.network/extensions/game_design"
+
+
+def test_composed_closure_offline():
+    """The composed entrypoint resolves to local modules, each loaded once."""
+    with tempfile.TemporaryDirectory() as tmp:
+        clear_memo()
+        closure = load_closure(COMPOSED_ENTRYPOINT, cache_dir=tmp)
+        modules = closure.modules()
+        assert modules[0] == COMPOSED_ENTRYPOINT
+        assert {GAMING, HUMAN_BEHAVIOR, FLAGSHIP, GAME_DESIGN} <= set(modules)
+        assert len(modules) == len(set(modules)) == len(closure.graphs)
+        # human_behavior is imported by several modules but parsed once
+        assert cache_stats()["misses"] == len(closure.graphs)
+        assert not closure.unresolved
+
+
+def test_module_toggles():
+    """Excluding a module drops imports only reachable through it."""
+    with tempfile.TemporaryDirectory() as tmp:
+        closure = load_closure(COMPOSED_ENTRYPOINT, cache_dir=tmp)
+        without_design = closure.modules(exclude=["extension_game_design"])
+        assert GAME_DESIGN not in without_design and GAMING in without_design
+
+        only_root = closure.modules(exclude=["flagship_universal", "extension_game_design",
+                                             "extension_character_mechanics"])
+        assert only_root == [COMPOSED_ENTRYPOINT]
+
+        view = closure.union(include=[GAMING])
+        assert len(view) == len(closure.graphs[GAMING])
+
+        dataset = closure.to_dataset(exclude=["flagship_universal"])
+        assert {str(g.identifier) for g in dataset.graphs() if len(g)} == set(
+            closure.modules(exclude=["flagship_universal"])
+        )
+
+
+if __name__ == "__main__":
+    test_composed_closure_offline()
+    test_module_toggles()
+    print("All import closure tests passed")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test Incremental Inference Maintenance
+
+Checks that batch-by-batch maintenance matches a full recompute, that tier
+changes retract the old classification, and that advance() applies the
+passage of time.
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from rdflib import Literal
+from rdflib.namespace import RDF
+
+from incremental_inference import DATA, IncrementalInference, event_triples, synthetic_batches
+from rule_engine import CORE, FactIndex, RuleEngine, load_rules
+
+
+NOW = datetime(2026, 3, 1, tzinfo=timezone.utc)
+DEVICE = DATA["device/d1"]
+
+
+def _event(n, session, days_ago=0, amount=None, game="g1"):
+    return {
+        "event_id": f"e{n}",
+        "event_type": "MonetizationEvent" if amount is not None else "GameplayEvent",
+        "device_id": "d1",
+        "session_id": session,
+        "game_id": game,
+        "activity_timestamp": NOW - timedelta(days=days_ago),
+        "properties": {"amount": amount} if amount is not None else {},
+    }
+
+
+def _full(events, now):
+    facts = FactIndex(t for e in events for t in event_triples(e))
+    derived = []
+    RuleEngine(load_rules()).run(facts, now, on_derive=derived.append)
+    terms = facts.dictionary.terms
+    return {(terms[s], terms[p], terms[o]) for s, p, o in derived}
+
+
+def test_event_triples():
+    """Sessions, games, timestamps and purchases become core triples"""
+    triples = set(event_triples(_event(1, "s1", amount=4.99)))
+    session = DATA["session/s1"]
+    assert (DEVICE, RDF.type, CORE.Device) in triples
+    assert (DEVICE, CORE.hasSession, session) in triples
+    assert (session, CORE.occursInGame, DATA["game/g1"]) in triples
+    assert (session, CORE.hasInAppPurchase, DATA["purchase/e1"]) in triples
+    assert event_triples({"event_id": "x", "device_id": "d1"}) == [(DEVICE, RDF.type, CORE.Device)]
+    assert event_triples({"event_id": "x"}) == []
+
+    # Purchases are what whale_thresholds counts: ad revenue is not one, an
+    # InAppPurchase without an amount still is
+    ad = dict(_event(2, "s1", amount=0.1), properties={"ad_type": "rewarded", "revenue": 0.1})
+    assert not any(p == CORE.hasInAppPurchase for _, p, _ in event_triples(ad))
+    iap = dict(_event(3, "s1"), event_type="InAppPurchase")
+    assert (session, CORE.hasInAppPurchase, DATA["purchase/e3"]) in event_triples(iap)
+
+
+def test_tier_changes_retract_old_classification():
+    """Crossing an engagement or spend boundary replaces the old tier"""
+    inference = IncrementalInference()
+    inference.apply_events([_event(1, "s1", amount=5), _event(2, "s2")], NOW)
+    facts = inference.facts
+    assert (DEVICE, RDF.type, CORE.LowEngagement) in facts
+    assert (DEVICE, RDF.type, CORE.Minnow) in facts
+    assert (DEVICE, CORE.sessionCount, Literal(2)) in facts
+
+    stats = inference.apply_events([_event(3, "s3", amount=20, game="g2")], NOW)
+    assert stats["retracted"] > 0
+    assert (DEVICE, RDF.type, CORE.LowEngagement) not in facts
+    assert (DEVICE, RDF.type, CORE.MediumEngagement) in facts
+    assert (DEVICE, RDF.type, CORE.Minnow) not in facts
+    assert (DEVICE, RDF.type, CORE.Dolphin) in facts
+    assert (DEVICE, CORE.sessionCount, Literal(2)) not in facts
+    assert (DEVICE, CORE.sessionCount, Literal(3)) in facts
+    assert (DEVICE, RDF.type, CORE.CrossGamePlayer) in facts
+
+
+def test_matches_full_recompute():
+    """After several batches the conclusions equal a from-scratch run"""
+    inference = IncrementalInference()
+    seen = []
+    for batch in synthetic_batches(devices=60, batches=6, batch_size=80, seed=3, now=NOW):
+        inference.apply_events(batch, NOW)
+        seen.extend(batch)
+        assert set(inference.conclusions()) == _full(seen, NOW)
+
+
+def test_advance_applies_time():
+    """Retention follows NOW() without new events"""
+    inference = IncrementalInference()
+    inference.apply_events([_event(1, "s1", days_ago=1), _event(2, "s2", days_ago=1),
+                            _event(3, "s3", days_ago=1)], NOW)
+    assert (DEVICE, RDF.type, CORE.Retained) in inference.facts
+    later = NOW + timedelta(days=20)
+    stats = inference.advance(later)
+    assert (DEVICE, RDF.type, CORE.Retained) not in inference.facts
+    assert (DEVICE, RDF.type, CORE.AtRisk) in inference.facts
+    assert stats["retracted"] and stats["asserted"]
+    assert set(inference.conclusions()) == _full([_event(i, f"s{i}", days_ago=1) for i in (1, 2, 3)], later)
+
+
+if __name__ == "__main__":
+    test_event_triples()
+    test_tier_changes_retract_old_classification()
+    test_matches_full_recompute()
+    test_advance_applies_time()
+    print("✅ All incremental inference tests passed")
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test Mapping Compiler
+
+Checks that the YAML / Turtle source mappings compile into working adapters
+and that compiled specs are cached on disk by file hash.
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import warnings
+from pathlib import Path
+
+# Add adapters directory to path
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT / "adapters"))
+
+from mapping_compiler import (
+    MappedAdapter,
+    MissingTimestampError,
+    compile_mapping,
+    compile_yaml_mapping,
+    discover_mapping_files,
+    load_mapped_adapter,
+    mapping_cache_key,
+)
+
+
+MIXPANEL_YAML = REPO_ROOT / "sources" / "mixpanel" / "mixpanel_to_universal_mapping.yaml"
+ADINMO_YAML = REPO_ROOT / "sources" / "adinmo" / "adinmo_to_universal_mapping.yaml"
+MIXPANEL_TTL = REPO_ROOT / "mappings" / "mixpanel_to_universal.ttl"
+
+
+def test_all_mappings_compile():
+    """Every source mapping file compiles to a JSON-serializable spec."""
+    files = discover_mapping_files(REPO_ROOT)
+    assert MIXPANEL_YAML in files and MIXPANEL_TTL in files
+    for path in files:
+        spec = compile_mapping(path)
+        json.dumps(spec)
+        assert spec["event_type_columns"] and spec["timestamp_columns"]
+
+
+def test_yaml_adapter_transforms():
+    """The Mixpanel YAML yields event, identifier and property rules."""
+    adapter = load_mapped_adapter(MIXPANEL_YAML, cache_dir=False)
+    event = adapter.transform_event({
+        "event_name": "iap_purchase", "distinct_id": "d1", "timestamp": 1699123456,
+        "properties": {"iapCount": 2, "coins": 40, "unmapped": 1},
+    })
+    assert event["event_type"] == "MonetizationEvent"
+    assert event["device_id"] == "d1"
+    assert event["properties"] == {"total_iaps": 2, "currency_balance": 40}
+    assert adapter.source_name == "mixpanel"
+
+
+def test_table_layout_adapter():
+    """The Adinmo YAML maps tables to classes and keeps top-level columns."""
+    adapter = load_mapped_adapter(ADINMO_YAML, cache_dir=False)
+    event = adapter.transform_event({
+        "table": "impressions", "ANON_DEVICE_ID": "dev1", "SESSION_ID": "s1", "GAME_ID": 7,
+        "ACTIVITY_TS": "2025-01-01T00:00:00Z", "BID_ID": "b1", "PLACEMENT_KEY": None,
+    })
+    assert event["event_type"] == "Impression"
+    assert (event["device_id"], event["session_id"], event["game_id"]) == ("dev1", "s1", 7)
+    assert event["properties"] == {"bid_id": "b1"}
+
+
+def test_ttl_adapter_transforms():
+    """The Turtle mapping's hasValue restrictions become exact event rules, typed like the YAML ones."""
+    adapter = load_mapped_adapter(MIXPANEL_TTL, cache_dir=False)
+    event = adapter.transform_event({"eventName": "iap_purchase", "distinctId": "d2", "time": 1699123456,
+                                     "properties": {"sessionCount": 5}})
+    assert event["event_type"] == "MonetizationEvent"  # g:Purchase, a MonetizationEvent
+    yaml_rules = load_mapped_adapter(MIXPANEL_YAML, cache_dir=False).event_type_exact
+    assert all(yaml_rules[name] == event_type for name, event_type in adapter.event_type_exact.items())
+    assert event["device_id"] == "d2"
+    assert event["properties"] == {"session_count": 5}
+
+
+def test_mapping_without_event_rules_warns():
+    """A mapping that types nothing as an event is flagged, not silently all GameEvent."""
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        load_mapped_adapter(REPO_ROOT / "mappings" / "adinmo_to_universal.ttl", cache_dir=False)
+    assert any("no event rules" in str(w.message) for w in caught)
+
+
+def test_disk_cache_keyed_by_hash():
+    """A cached spec is reused until the mapping file changes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        mapping = tmp / "mixpanel_to_universal_mapping.yaml"
+        shutil.copy(MIXPANEL_YAML, mapping)
+        cache_dir = tmp / "cache"
+
+        load_mapped_adapter(mapping, cache_dir=cache_dir)
+        cache_file = cache_dir / f"{mapping_cache_key(mapping)}.json"
+        assert cache_file.exists()
+
+        # Served from the cache file, not recompiled
+        spec = json.loads(cache_file.read_text())
+        spec["event_type_default"] = "CachedDefault"
+        cache_file.write_text(json.dumps(spec))
+        assert load_mapped_adapter(mapping, cache_dir=cache_dir).transform_event({"time": 1699123456})["event_type"] == "CachedDefault"
+
+        # Editing the mapping changes the key
+        mapping.write_text(mapping.read_text() + "\n# edited\n")
+        adapter = load_mapped_adapter(mapping, cache_dir=cache_dir)
+        assert adapter.transform_event({"time": 1699123456})["event_type"] == "GameEvent"
+        assert len(list(cache_dir.glob("*.json"))) == 2
+
+
+def test_overrides():
+    """mapping_overrides adjusts a compiled spec (e.g. real timestamp column names)."""
+    adapter = MappedAdapter("Mixpanel", {
+        "mapping_file": str(MIXPANEL_YAML), "mapping_cache_dir": False,
+        "mapping_overrides": {"timestamp_columns": ["time"], "timestamp_numeric_unit": "s"},
+    })
+    assert adapter.map_timestamp({"time": 0.5}).year == 1970
+
+
+def test_timestamp_fallbacks():
+    """Hand-adapter timestamp columns back up the mapped ones; misses are loud."""
+    spec = compile_yaml_mapping(str(MIXPANEL_YAML))
+    assert spec["timestamp_columns"][:2] == ["timestamp", "TIMESTAMP"]
+    assert "time" in spec["timestamp_columns"] and "ACTIVITY_TS" in spec["timestamp_columns"]
+
+    adapter = MappedAdapter("mixpanel", {"mapping_spec": spec})
+    assert adapter.map_timestamp({"time": 1699123456}).year == 2023
+    assert adapter.transform_columns({"time": [1699123456]}).columns["activity_timestamp"][0].year == 2023
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        adapter.map_timestamp({})
+        adapter.map_timestamp({"when": 1})
+    assert len(caught) == 1 and "without a usable timestamp" in str(caught[0].message)
+
+    strict = MappedAdapter("mixpanel", {"mapping_spec": spec, "require_timestamp": True})
+    for run in (lambda: strict.map_timestamp({}), lambda: strict.transform_columns({"event_name": ["x"]})):
+        try:
+            run()
+        except MissingTimestampError as e:
+            assert "time" in str(e)
+        else:
+            raise AssertionError("expected MissingTimestampError")
+
+
+if __name__ == "__main__":
+    test_all_mappings_compile()
+    test_yaml_adapter_transforms()
+    test_table_layout_adapter()
+    test_ttl_adapter_transforms()
+    test_mapping_without_event_rules_warns()
+    test_disk_cache_keyed_by_hash()
+    test_overrides()
+    test_timestamp_fallbacks()
+    print("All mapping compiler tests passed")
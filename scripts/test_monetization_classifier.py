@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test Vectorized Monetization Classifier
+
+Checks tenant thresholds and the default fallback, agreement with a
+per-device loop, dictionary-encoded tenant input and hot reload.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import numpy as np
+
+from monetization_classifier import (
+    SEGMENTS, MonetizationClassifier, _python_classify, factorize,
+)
+
+
+THRESHOLDS_TTL = """@prefix : <http://ontology.gaming.network/core#> .
+:DefaultMonetizationThresholds a :MonetizationThresholds ;
+    :whaleIapThreshold 5 ; :dolphinIapThreshold 2 ; :minnowIapThreshold 1 .
+:AcmeMonetizationThresholds a :MonetizationThresholds ;
+    :appliesToTenant "acme" ;
+    :whaleIapThreshold %d ; :dolphinIapThreshold 3 ; :minnowIapThreshold 1 .
+"""
+
+
+def _write(path, whale):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(THRESHOLDS_TTL % whale)
+
+
+def test_tenant_boundaries():
+    classifier = MonetizationClassifier()
+    tenants = ["flick", "flick", "Avakin", "avakin", "avakin", "unknown", "unknown", "flick"]
+    values = [425, 424, 34190, 34189, 99, 5, 4, 0]
+    labels = list(classifier.labels(classifier.classify(tenants, values)))
+    assert labels == ["Whale", "Dolphin", "Whale", "Dolphin", "NonPayer", "Whale", "Dolphin", "NonPayer"]
+
+
+def test_monetary_falls_back_to_default():
+    classifier = MonetizationClassifier()
+    assert classifier.thresholds("flick")["monetary"] == {"Minnow": 0.01, "Dolphin": 10.0, "Whale": 50.0}
+    codes = classifier.classify("flick", [0, 0.01, 10, 49.99, 50, float("nan")], metric="monetary")
+    assert list(classifier.labels(codes)) == ["NonPayer", "Minnow", "Dolphin", "Dolphin", "Whale", "NonPayer"]
+
+
+def test_matches_python_loop():
+    classifier = MonetizationClassifier()
+    rng = np.random.default_rng(1)
+    names = np.array(["flick", "avakin", "adinmo", "other", "another"])
+    tenants = names[rng.integers(0, len(names), 20_000)]
+    values = np.floor(rng.pareto(1.0, 20_000) * 50)
+    codes = classifier.classify(tenants, values)
+    assert list(codes) == _python_classify(classifier.table, tenants, values, "iap")
+    assert set(codes) <= set(range(len(SEGMENTS)))
+
+
+def test_dictionary_encoded_tenants():
+    classifier = MonetizationClassifier()
+    names = ["flick", "avakin", "other"]
+    codes = np.array([0, 1, 2, 0, 1])
+    values = [500, 500, 500, 1, 100]
+    tenants = [names[c] for c in codes]
+    assert list(classifier.classify((names, codes), values)) == list(classifier.classify(tenants, values))
+
+    distinct, inverse = factorize(np.array(tenants))
+    assert [distinct[i] for i in inverse] == tenants
+
+
+def test_hot_reload():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "thresholds.ttl"
+        _write(path, 200)
+        classifier = MonetizationClassifier(path, check_interval=0)
+        assert list(classifier.labels(classifier.classify("acme", [150]))) == ["Dolphin"]
+
+        _write(path, 150)
+        os.utime(path, ns=(0, 10**18))  # distinct mtime even on coarse filesystems
+        assert list(classifier.labels(classifier.classify("acme", [150]))) == ["Whale"]
+        assert classifier.reloads == 2
+
+        # An invalid file keeps the last good table
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(THRESHOLDS_TTL.replace("dolphinIapThreshold 3", "dolphinIapThreshold 999") % 150)
+        assert list(classifier.labels(classifier.classify("acme", [150]))) == ["Whale"]
+        assert classifier.reloads == 2
+
+        # So does a syntactically broken one
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(THRESHOLDS_TTL[:-20])
+        os.utime(path, ns=(0, 2 * 10**18))
+        assert list(classifier.labels(classifier.classify("acme", [150]))) == ["Whale"]
+        assert classifier.reloads == 2
+
+        # And a missing one, checked once per interval
+        path.unlink()
+        classifier.check_interval = 3600
+        classifier._checked = 0.0
+        assert list(classifier.labels(classifier.classify("acme", [150]))) == ["Whale"]
+        assert time.monotonic() - classifier._checked < 3600
+
+
+def test_unordered_thresholds_rejected():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "thresholds.ttl"
+        _write(path, 2)
+        try:
+            MonetizationClassifier(path)
+        except ValueError as e:
+            assert "acme" in str(e)
+        else:
+            raise AssertionError("expected ValueError")
+
+
+if __name__ == "__main__":
+    test_tenant_boundaries()
+    test_monetary_falls_back_to_default()
+    test_matches_python_loop()
+    test_dictionary_encoded_tenants()
+    test_hot_reload()
+    test_unordered_thresholds_rejected()
+    print("✅ All monetization classifier tests passed")
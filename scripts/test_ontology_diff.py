@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test Semantic Ontology Diff
+
+Checks categorization of changes and that blank node structures or
+reordering alone do not show up as changes.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ontology_diff import diff_files, diff_history
+
+
+HEADER = """
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix sh: <http://www.w3.org/ns/shacl#> .
+@prefix ex: <http://example.org/> .
+"""
+OLD = HEADER + """
+ex:A a owl:Class ; rdfs:label "A" ;
+    rdfs:subClassOf [ a owl:Restriction ; owl:onProperty ex:p ; owl:someValuesFrom ex:B ] .
+ex:B a owl:Class .
+ex:p a owl:ObjectProperty .
+ex:old a owl:DatatypeProperty .
+ex:Shape a sh:NodeShape ; sh:property [ sh:path ex:p ; sh:minCount 1 ] .
+"""
+REORDERED = HEADER + """
+ex:Shape sh:property [ sh:minCount 1 ; sh:path ex:p ] ; a sh:NodeShape .
+ex:old a owl:DatatypeProperty .
+ex:p a owl:ObjectProperty .
+ex:B a owl:Class .
+ex:A rdfs:subClassOf [ owl:someValuesFrom ex:B ; owl:onProperty ex:p ; a owl:Restriction ] ;
+    rdfs:label "A" ; a owl:Class .
+"""
+NEW = HEADER + """
+ex:A a owl:Class ; rdfs:label "A (renamed)" ;
+    rdfs:subClassOf [ a owl:Restriction ; owl:onProperty ex:p ; owl:someValuesFrom ex:B ] .
+ex:B a owl:Class .
+ex:C a owl:Class ; rdfs:subClassOf ex:B .
+ex:p a owl:ObjectProperty .
+ex:Shape a sh:NodeShape ; sh:property [ sh:path ex:p ; sh:minCount 2 ] .
+"""
+
+
+def test_semantic_diff():
+    """Reordering is no change; edits land in the right categories."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for name, body in (("v001", OLD), ("v002", REORDERED), ("v003", NEW)):
+            (tmp / f"{name}.ttl").write_text(body)
+
+        same = diff_files(tmp / "v001.ttl", tmp / "v002.ttl")
+        assert same["added"] == same["removed"] == 0
+
+        report = diff_files(tmp / "v001.ttl", tmp / "v003.ttl")
+        assert report["classes"] == {"added": ["http://example.org/C"], "removed": []}
+        assert report["properties"] == {"added": [], "removed": ["http://example.org/old"]}
+        assert report["axioms"]["added"] == [
+            "<http://example.org/C> <http://www.w3.org/2000/01/rdf-schema#subClassOf> <http://example.org/B>"
+        ]
+        assert report["axioms"]["removed"] == []
+        assert len(report["annotations"]["added"]) == len(report["annotations"]["removed"]) == 1
+        # The changed property shape is a new blank node: all its sh: triples differ
+        assert any("minCount" in line and '"2"' in line for line in report["shacl"]["added"])
+        assert any("minCount" in line and '"1"' in line for line in report["shacl"]["removed"])
+
+        history = diff_history(tmp)
+        assert [(r["from"], r["to"], r["added"]) for r in history][0] == ("v001", "v002", 0)
+        assert history[1]["classes"] == report["classes"]
+
+
+if __name__ == "__main__":
+    test_semantic_diff()
+    print("✅ All semantic diff tests passed")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test Ontology Loader
+
+Checks the in-process memo, the on-disk snapshot cache and the hit/miss
+counters of the shared ontology loader.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import ontology_loader
+from ontology_loader import cache_stats, clear_memo, load_graph
+
+
+TTL = """
+@prefix ex: <http://example.org/> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+ex:A a owl:Class .
+ex:B a owl:Class .
+"""
+
+
+def test_memo_disk_and_invalidation():
+    """Parse once, then memo hit; snapshot hit in a fresh process; edits miss."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        ttl = tmp / "a.ttl"
+        ttl.write_text(TTL)
+        cache_dir = tmp / "cache"
+        clear_memo()
+
+        first = load_graph(ttl, cache_dir=cache_dir)
+        assert len(first) == 2
+        assert load_graph(ttl, cache_dir=cache_dir) is first
+        assert cache_stats() == {"memory_hits": 1, "disk_hits": 0, "misses": 1}
+        assert len(list(cache_dir.glob("*.pickle"))) == 1
+
+        clear_memo()  # simulate a new process
+        snapshot = load_graph(ttl, cache_dir=cache_dir)
+        assert snapshot is not first
+        assert set(snapshot) == set(first)
+        assert dict(snapshot.namespaces())["ex"] == ontology_loader.rdflib.URIRef("http://example.org/")
+        assert cache_stats() == {"memory_hits": 0, "disk_hits": 1, "misses": 0}
+
+        ttl.write_text(TTL + "ex:C a owl:Class .\n")
+        assert len(load_graph(ttl, cache_dir=cache_dir)) == 3
+        assert cache_stats()["misses"] == 1
+
+
+def test_disk_cache_disabled():
+    """cache_dir=False parses without writing snapshots."""
+    with tempfile.TemporaryDirectory() as tmp:
+        ttl = Path(tmp) / "b.ttl"
+        ttl.write_text(TTL)
+        clear_memo()
+        load_graph(ttl, cache_dir=False)
+        assert cache_stats()["misses"] == 1
+        assert list(Path(tmp).iterdir()) == [ttl]
+
+
+if __name__ == "__main__":
+    test_memo_disk_and_invalidation()
+    test_disk_cache_disabled()
+    print("All ontology loader tests passed")
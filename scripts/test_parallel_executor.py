@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test Parallel Executor
+
+Checks that process-pool transforms match the serial adapter output and order.
+"""
+
+import sys
+from pathlib import Path
+
+# Add adapters directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "adapters"))
+
+from adinmo_adapter import AdinmoAdapter
+from mixpanel_adapter import MixpanelAdapter
+
+
+def test_parallel_matches_serial_order():
+    """Sharded results come back in input order for unmodified adapters."""
+    mixpanel_events = [
+        {"event_id": f"m{i}", "event_name": ["session_start", "iap_purchase", "move"][i % 3],
+         "distinct_id": f"d{i % 5}", "time": 1699123456 + i, "properties": {"sessionCount": i}}
+        for i in range(1000)
+    ]
+    adinmo_events = [
+        {"event_id": f"a{i}", "table": "tracker_events", "EVENT_TYPE": "click",
+         "ANON_DEVICE_ID": f"dev{i}", "ACTIVITY_TS": 1735689600 + i}
+        for i in range(300)
+    ]
+
+    for adapter, events in ((MixpanelAdapter("Mixpanel", {}), mixpanel_events),
+                            (AdinmoAdapter("Adinmo", {}), adinmo_events)):
+        with adapter.parallel(workers=2, shard_size=64) as executor:
+            assert executor.transform_batch(events) == adapter.transform_batch(events)
+            streamed = [e for shard in executor.transform_chunks([events[:100], events[100:]]) for e in shard]
+            assert [e["event_id"] for e in streamed] == [e["event_id"] for e in events]
+
+
+def test_parallel_counter_ids_unique():
+    """Workers sharing one event_id_worker label still generate distinct IDs."""
+    events = [{"event_name": "move", "distinct_id": f"d{i}", "time": 1699123456} for i in range(400)]
+    adapter = MixpanelAdapter("Mixpanel", {"event_id_strategy": "counter", "event_id_worker": "w0"})
+    with adapter.parallel(workers=2, shard_size=16) as executor:
+        ids = [e["event_id"] for e in executor.transform_batch(events)]
+    assert len(set(ids)) == len(ids)
+    assert all(i.startswith("Mixpanel-w0-") for i in ids)
+
+
+def test_exception_terminates_pool():
+    """Leaving the context on an error terminates the workers instead of draining them."""
+    events = [{"event_name": "move", "distinct_id": f"d{i}", "time": 1699123456} for i in range(2000)]
+    executor = MixpanelAdapter("Mixpanel", {}).parallel(workers=2, shard_size=10)
+    workers = list(executor._pool._pool)
+
+    def close():
+        raise AssertionError("close() waits for queued shards")
+    executor.close = close
+
+    try:
+        with executor:
+            next(executor.transform_chunks([events]))
+            raise KeyError("boom")
+    except KeyError:
+        pass
+    assert not any(worker.is_alive() for worker in workers)
+
+
+if __name__ == "__main__":
+    test_parallel_matches_serial_order()
+    test_parallel_counter_ids_unique()
+    test_exception_terminates_pool()
+    print("Parallel executor tests passed")
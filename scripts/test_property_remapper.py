@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test Property Remapper
+
+Checks that the compiled PropertyRemapper matches the classic
+per-event mapping loop and that adapters pick up mapping_config overrides.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+# Add adapters directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "adapters"))
+
+from mixpanel_adapter import MixpanelAdapter
+from property_remapper import PropertyRemapper, normalize_property_name
+
+
+def _classic(mappings, source_props):
+    properties = {}
+    for source_key, universal_key in mappings.items():
+        if source_key in source_props:
+            properties[universal_key] = source_props[source_key]
+    return properties
+
+
+def test_matches_classic_loop():
+    """Same output as the classic loop, including shared universal keys."""
+    mappings = MixpanelAdapter.property_mappings
+    remapper = PropertyRemapper(mappings)
+    rng = random.Random(7)
+    keys = list(mappings) + [f"extra{i}" for i in range(20)]
+    for _ in range(2000):
+        props = {k: rng.random() for k in rng.sample(keys, rng.randint(0, len(keys)))}
+        assert remapper.remap(props) == _classic(mappings, props)
+
+
+def test_shared_target_priority():
+    """The later table entry wins regardless of event key order."""
+    remapper = PropertyRemapper({"sessionCount": "session_count", "session_count": "session_count"})
+    assert remapper.remap({"session_count": 2, "sessionCount": 1}) == {"session_count": 2}
+
+
+def test_skip_none_and_keep_unmapped():
+    """None values can be skipped; unmapped keys can be kept normalized."""
+    remapper = PropertyRemapper({"cost": "amount"}, skip_none=True, keep_unmapped=True)
+    assert remapper.remap({"cost": None, "moveCount": 3}) == {"move_count": 3}
+    assert remapper.cache_info().currsize == 1
+
+
+def test_normalize_property_name():
+    """camelCase / PascalCase names become snake_case."""
+    assert normalize_property_name("sessionAdCount") == "session_ad_count"
+    assert normalize_property_name("HTTPResponseCode") == "http_response_code"
+    assert normalize_property_name("already_snake") == "already_snake"
+
+
+def test_mapping_config_overrides():
+    """mapping_config["property_mappings"] extends the adapter's table."""
+    adapter = MixpanelAdapter(source_name="Mixpanel", mapping_config={"property_mappings": {"cost": "price"}})
+    assert adapter.map_properties({"properties": {"cost": 1.5}}) == {"price": 1.5}
+
+
+if __name__ == "__main__":
+    test_matches_classic_loop()
+    test_shared_target_priority()
+    test_skip_none_and_keep_unmapped()
+    test_normalize_property_name()
+    test_mapping_config_overrides()
+    print("All property remapper tests passed")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test Provenance Modes
+
+Checks the mapping_config["provenance"] options for source_metadata
+("full", "reference", "none") across the row, columnar and streaming paths.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add adapters directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "adapters"))
+
+from mixpanel_adapter import MixpanelAdapter
+from streaming_pipeline import run_pipeline
+
+
+EVENTS = [
+    {"event_id": f"m{i}", "event_name": "iap_purchase", "distinct_id": f"d{i % 3}",
+     "time": 1699123456 + i, "properties": {"cost": 0.99}}
+    for i in range(10)
+]
+
+
+def _adapter(mode):
+    return MixpanelAdapter(source_name="Mixpanel", mapping_config={"provenance": mode})
+
+
+def test_default_is_full():
+    """Without configuration the original event is embedded, as before."""
+    adapter = MixpanelAdapter(source_name="Mixpanel", mapping_config={})
+    event = adapter.transform_event(EVENTS[0])
+    assert event["source_metadata"] == {"source_name": "Mixpanel", "original_event": EVENTS[0]}
+
+
+def test_reference_mode_records_index():
+    """Reference mode stores source indices that resolve back to the source event."""
+    adapter = _adapter("reference")
+    batch = adapter.transform_batch(EVENTS[4:], start_index=4)
+    assert [e["source_metadata"]["source_index"] for e in batch] == list(range(4, 10))
+    assert all("original_event" not in e["source_metadata"] for e in batch)
+    for event in batch:
+        assert adapter.resolve_original_event(event, EVENTS) is EVENTS[int(event["event_id"][1:])]
+
+
+def test_none_mode_drops_lineage():
+    """None mode keeps only the source name."""
+    adapter = _adapter("none")
+    event = adapter.transform_event(EVENTS[0])
+    assert event["source_metadata"] == {"source_name": "Mixpanel"}
+    assert adapter.resolve_original_event(event, EVENTS) is None
+
+
+def test_columnar_modes_match_rows():
+    """transform_columns() honours the provenance mode and drops the source batch."""
+    columns = {k: [e.get(k) for e in EVENTS] for k in sorted({k for e in EVENTS for k in e})}
+    for mode in ("reference", "none"):
+        adapter = _adapter(mode)
+        batch = adapter.transform_columns(columns)
+        assert batch.source is None
+        expected = adapter.transform_batch(EVENTS)
+        assert [e["source_metadata"] for e in batch] == [e["source_metadata"] for e in expected]
+
+        offset = adapter.transform_columns(columns, start_index=100)
+        expected = adapter.transform_batch(EVENTS, start_index=100)
+        assert [e["source_metadata"] for e in offset] == [e["source_metadata"] for e in expected]
+
+
+def test_streaming_indices_span_chunks():
+    """Streaming uses record numbers across chunk boundaries."""
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "in.ndjson"
+        dst = Path(tmp) / "out.ndjson"
+        src.write_text("".join(json.dumps(e) + "\n" for e in EVENTS))
+        run_pipeline(_adapter("reference"), src, dst, chunk_size=3)
+        out = [json.loads(line) for line in dst.read_text().splitlines()]
+    assert [e["source_metadata"]["source_index"] for e in out] == list(range(len(EVENTS)))
+
+
+def test_unknown_mode_rejected():
+    """An unknown provenance mode fails at construction."""
+    try:
+        _adapter("sometimes")
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError")
+
+
+if __name__ == "__main__":
+    test_default_is_full()
+    test_reference_mode_records_index()
+    test_none_mode_drops_lineage()
+    test_columnar_modes_match_rows()
+    test_streaming_indices_span_chunks()
+    test_unknown_mode_rejected()
+    print("All provenance mode tests passed")
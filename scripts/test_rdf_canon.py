@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test RDF Canonical N-Triples
+
+Checks that blank node labels are stable across parses and that repeated
+identical blank node structures are kept apart rather than merged.
+"""
+
+import sys
+from pathlib import Path
+
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import XSD
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from rdf_canon import canonical_lines, lines_to_graph, term_nt
+
+
+TTL = """
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix ex: <http://example.org/> .
+ex:A owl:disjointUnionOf ( ex:B ex:C ) ;
+    ex:label "multi\\nline"@en .
+[] a owl:AllDisjointClasses ; owl:members ( ex:B ex:C ) .
+[] a owl:AllDisjointClasses ; owl:members ( ex:B ex:C ) .
+"""
+
+
+def test_stable_and_lossless():
+    """Two parses give the same lines; duplicate axioms keep their triples."""
+    first = Graph().parse(data=TTL, format="turtle")
+    second = Graph().parse(data=TTL, format="turtle")
+    lines = canonical_lines(first)
+    assert lines == canonical_lines(second)
+    assert len(lines) == len(first) == 18
+    assert all(line.startswith(("_:c", "<")) for line in lines)
+
+    round_trip = lines_to_graph(lines)
+    assert len(round_trip) == len(first)
+    assert canonical_lines(round_trip) == lines
+
+
+def test_changed_structure_changes_labels():
+    """Editing a list member changes the labels along that list only."""
+    before = canonical_lines(Graph().parse(data=TTL, format="turtle"))
+    after = canonical_lines(Graph().parse(data=TTL.replace("( ex:B ex:C ) ;", "( ex:B ex:D ) ;"), format="turtle"))
+    assert before != after
+    assert len(before & after) > len(before) // 2
+
+
+def test_literals_are_n_triples():
+    """Literals keep full N-Triples form (no Turtle shorthand for numbers)."""
+    assert term_nt(Literal(1)) == f'"1"^^<{XSD.integer}>'
+    assert term_nt(Literal('say "hi"\\\r\n', lang="en")) == '"say \\"hi\\"\\\\\\r\\n"@en'
+    assert term_nt(URIRef("http://example.org/a")) == "<http://example.org/a>"
+
+
+if __name__ == "__main__":
+    test_stable_and_lossless()
+    test_changed_structure_changes_labels()
+    test_literals_are_n_triples()
+    print("✅ All RDF canonicalization tests passed")
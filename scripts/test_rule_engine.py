@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test Forward-Chaining Rule Engine
+
+Checks parsing of ontology/inference_rules.ttl, stratification, the
+derived classifications and semi-naive evaluation of recursive rules.
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from rdflib import Graph, Literal, Namespace
+from rdflib.namespace import RDF
+
+from rule_engine import CORE, FactIndex, RuleEngine, RuleSyntaxError, infer, load_rules, parse_rules, stratify
+
+
+NOW = datetime(2026, 1, 31, tzinfo=timezone.utc)
+EX = Namespace("http://example.org/")
+
+
+def _device_graph() -> Graph:
+    """device1: 3 sessions in 2 games, £15 spent; device2: 1 old session, nothing spent."""
+    g = Graph()
+    d1, d2 = CORE.device1, CORE.device2
+    g.add((d1, RDF.type, CORE.Device))
+    g.add((d2, RDF.type, CORE.Device))
+    for i, (game, days_ago) in enumerate([(CORE.gameA, 1), (CORE.gameA, 3), (CORE.gameB, 5)]):
+        session = CORE[f"s1_{i}"]
+        g.add((d1, CORE.hasSession, session))
+        g.add((session, CORE.occursInGame, game))
+        g.add((session, CORE.activityTimestamp, Literal(NOW - timedelta(days=days_ago))))
+    for i, amount in enumerate(("5.00", "10.00")):
+        purchase = CORE[f"p1_{i}"]
+        g.add((CORE[f"s1_{i}"], CORE.hasInAppPurchase, purchase))
+        g.add((purchase, CORE.amount, Literal(Decimal(amount))))
+    g.add((d2, CORE.hasSession, CORE.s2_0))
+    g.add((CORE.s2_0, CORE.occursInGame, CORE.gameA))
+    g.add((CORE.s2_0, CORE.activityTimestamp, Literal(NOW - timedelta(days=20))))
+    return g
+
+
+def test_parse_inference_rules():
+    """All commented rules are parsed; aggregates sit above what they aggregate"""
+    rules = load_rules()
+    stratify(rules)
+    assert [r.number for r in rules] == list(range(1, 16))
+    by_number = {r.number: r for r in rules}
+    assert {r.number for r in rules if r.is_aggregate} == {12, 13, 15}
+    assert by_number[15].stratum > by_number[1].stratum
+    assert len(by_number[9].body) == 4 and len(by_number[9].filters) == 2
+
+
+def test_derived_classifications():
+    """Counts, totals and tiers follow the rules"""
+    derived, stats = infer(_device_graph(), now=NOW)
+    d1, d2 = CORE.device1, CORE.device2
+    assert set(derived.objects(d1, CORE.sessionCount)) == {Literal(3)}
+    assert [o.value for o in derived.objects(d1, CORE.totalSpent)] == [Decimal("15.00")]
+    assert set(derived.objects(d1, CORE.playsGame)) == {CORE.gameA, CORE.gameB}
+    assert (d1, RDF.type, CORE.MediumEngagement) in derived
+    assert (d1, RDF.type, CORE.Dolphin) in derived
+    assert (d1, RDF.type, CORE.Retained) in derived
+    assert (d1, RDF.type, CORE.CrossGamePlayer) in derived
+    assert (d1, CORE.playsMultipleGames, Literal(True)) in derived
+    assert (d2, RDF.type, CORE.LowEngagement) in derived
+    assert (d2, RDF.type, CORE.Churned) in derived
+    assert (d2, RDF.type, CORE.CrossGamePlayer) not in derived
+    # device2 has no purchases, so no totalSpent (and no NonPayer), as in SPARQL
+    assert not list(derived.objects(d2, CORE.totalSpent))
+
+    assert stats["derived"] == len(derived)
+    assert stats["rules"]["rule12"]["derived"] == 2
+    assert stats["rules"]["rule01"]["solutions"] == 4
+    assert all(s["seconds"] >= 0 for s in stats["rules"].values())
+
+
+def test_recursive_rules_reach_fixpoint():
+    """Semi-naive evaluation computes a transitive closure"""
+    rules = parse_rules("""
+@prefix ex: <http://example.org/> .
+# RULE 1: Base
+# CONSTRUCT { ?a ex:ancestor ?b . } WHERE { ?a ex:parent ?b . }
+# RULE 2: Step
+# CONSTRUCT { ?a ex:ancestor ?c . } WHERE { ?a ex:parent ?b . ?b ex:ancestor ?c . }
+""")
+    facts = FactIndex((EX[f"n{i}"], EX.parent, EX[f"n{i + 1}"]) for i in range(20))
+    stats = RuleEngine(rules).run(facts, NOW)
+    assert stats["derived"] == 20 * 21 // 2
+    assert (EX.n0, EX.ancestor, EX.n20) in facts
+    assert stats["iterations"] <= 22
+
+
+def test_filter_errors_are_false():
+    """Comparing incompatible values drops the solution instead of raising"""
+    rules = parse_rules("""
+@prefix ex: <http://example.org/> .
+# RULE 1: Big
+# CONSTRUCT { ?x a ex:Big . } WHERE { ?x ex:size ?n . FILTER (?n > 10 || ?n = "huge") }
+""")
+    facts = FactIndex([(EX.a, EX.size, Literal(11)), (EX.b, EX.size, Literal("huge")),
+                       (EX.c, EX.size, Literal("small")), (EX.d, EX.size, Literal(2))])
+    RuleEngine(rules).run(facts, NOW)
+    big = {s for s, p, o in facts if o == EX.Big}
+    assert big == {EX.a, EX.b}
+
+
+def test_unsupported_rules_raise():
+    """Variable predicates and recursion through aggregates are rejected"""
+    for text in (
+        "# RULE 1: Var\n# CONSTRUCT { ?s ?p ?o . } WHERE { ?s ?p ?o . }",
+        "@prefix ex: <http://example.org/> .\n"
+        "# RULE 1: Loop\n# CONSTRUCT { ?x ex:n ?c . } WHERE { SELECT ?x (COUNT(?y) AS ?c) "
+        "WHERE { ?x ex:n ?y . } GROUP BY ?x }",
+    ):
+        try:
+            RuleEngine(parse_rules(text))
+        except RuleSyntaxError:
+            continue
+        raise AssertionError(f"accepted: {text}")
+
+
+if __name__ == "__main__":
+    test_parse_inference_rules()
+    test_derived_classifications()
+    test_recursive_rules_reach_fixpoint()
+    test_filter_errors_are_false()
+    test_unsupported_rules_raise()
+    print("✅ All rule engine tests passed")
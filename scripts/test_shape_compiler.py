@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Test Compiled SHACL Validation
+
+Checks the compiled gaming_shapes.ttl / player_shapes.ttl validators on RDF
+data, universal events and plain records, and that the generated record
+validators agree with the interpreted ones.
+"""
+
+import sys
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from rdflib import Graph
+
+from shape_compiler import (
+    CORE, LO, ShapeCompiler, UnsupportedShapeError, _RecordView, synthetic_devices,
+)
+
+
+DATA_TTL = """@prefix : <http://ontology.gaming.network/core#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+
+:d1 a :Device ; :deviceId "d1" ; :deviceType "phone" ; :country "gb" ;
+    :sessionCount 3 ; :totalSpent 12.5 ; :hasEngagementLevel :HighEngagement .
+:d2 a :Device ; :deviceType "watch" ; :country "GBR" ; :sessionCount -1 ;
+    :totalSpent "12" .
+:s1 a :GameSession ; :sessionId "s1" ; :activityTimestamp "2026-01-01T00:00:00Z"^^xsd:dateTime ;
+    :belongsToDevice :d1 .
+:s2 a :Session ; :sessionId "s2" ; :belongsToDevice :s1 .
+:lvl a :EngagementLevel .
+"""
+
+_compiler = None
+
+
+def _shapes():
+    global _compiler
+    if _compiler is None:
+        _compiler = ShapeCompiler()
+    return _compiler
+
+
+def test_graph_validation():
+    data = Graph().parse(data=DATA_TTL, format="turtle")
+    report = _shapes().validate_graph(data)
+    failed = {(str(v.focus).rsplit("#", 1)[-1], v.message) for v in report.violations}
+    assert not report.conforms
+    assert not any(focus == "d1" for focus, _ in failed)
+    assert ("d2", "Device must have exactly one non-empty device ID") in failed
+    assert ("d2", "Device type must be one of: phone, tablet, desktop, console, other") in failed
+    assert ("d2", "Country must be a 2-letter lowercase code") in failed
+    assert ("d2", "Session count must be a non-negative integer") in failed
+    assert ("d2", "Total spent must be a non-negative decimal") in failed  # xsd:string, not xsd:decimal
+    # GameSession is a Session through rdfs:subClassOf
+    assert not any(focus == "s1" for focus, _ in failed)
+    assert ("s2", "Session must have exactly one activity timestamp") in failed
+    assert ("s2", "Session must belong to exactly one device") in failed  # s1 is not a Device
+    # Node-level sh:or: an EngagementLevel that is none of Low/Medium/High
+    assert ("lvl", "Engagement level must be one of: LowEngagement, MediumEngagement, HighEngagement") in failed
+
+
+def test_events():
+    ts = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    events = [
+        {"event_id": "e1", "event_type": "InAppPurchase", "device_id": "d1", "activity_timestamp": ts,
+         "properties": {"amount": 4.99, "currency": "USD"}},
+        {"event_id": "e2", "event_type": "InAppPurchase", "device_id": "d1",
+         "activity_timestamp": "2026-01-01T00:00:00Z", "properties": {"amount": 0, "currency": "usd"}},
+        {"event_id": "e3", "event_type": "GameSession", "session_id": "s1", "device_id": "d1",
+         "activity_timestamp": ts},
+        {"event_id": "e4", "event_type": "GameSession", "session_id": "s2"},
+        {"event_id": "e5", "event_type": "GameEvent"},
+    ]
+    report = _shapes().validate_events(events)
+    failed = sorted((v.focus, v.message) for v in report.violations)
+    assert report.focus_nodes == 5
+    assert failed == [
+        ("e2", "Currency must be a 3-letter uppercase code (e.g., GBP, USD)"),
+        ("e2", "In-app purchase must have exactly one positive amount"),
+        ("e4", "Session must belong to exactly one device"),
+        ("e4", "Session must have exactly one activity timestamp"),
+    ]
+
+
+def test_player_records():
+    players = [
+        {"player_id": "p_1", "cohort": "Whale", "engagement_level": "High", "total_sessions": 10,
+         "total_revenue": Decimal("99.5")},
+        {"player_id": "p 2", "cohort": "Shark", "engagement_level": LO.Low, "total_sessions": True,
+         "total_revenue": 1},
+    ]
+    report = _shapes().validate_records(players, "Player", namespace=LO)
+    assert {v.focus for v in report.violations} == {"p 2"}
+    assert report.by_message() == {
+        "Player ID must be alphanumeric with underscores or hyphens": 1,
+        "Cohort must be one of: Whale, Dolphin, Minnow, NonPayer, Churned": 1,
+        "Total sessions must be a non-negative integer": 2,  # bool is not an integer
+    }
+
+    # lo:SessionShape has no sh:message on most properties: messages are generated
+    report = _shapes().validate_records([{"session_id": "s1", "duration": 5}], "Session", namespace=LO)
+    messages = sorted(report.by_message())
+    assert messages == ["playerId: expected at least 1 value(s), found 0",
+                        "startTime: expected at least 1 value(s), found 0"]
+
+
+def test_generated_matches_interpreted():
+    compiler = _shapes()
+    devices = synthetic_devices(2000, error_rate=0.2)
+    devices.append({"device_id": ["a", "b"], "country": "gb"})
+    view = _RecordView(compiler.superclasses, CORE, compiler.superclasses[CORE.Device])
+    for validator in compiler.validators_for(CORE.Device):
+        for device in devices:
+            generated, interpreted = [], []
+            ok = validator.validate_record(device, view, generated)
+            assert ok == validator.validate(device, view, interpreted)
+            assert [(v.component, v.message, v.value) for v in generated] == \
+                   [(v.component, v.message, v.value) for v in interpreted]
+            assert validator.validate_record(device, view, None) == ok
+    report = compiler.validate_records(devices, "Device")
+    assert "Device must have exactly one non-empty device ID" in report.by_message()
+
+
+def test_unsupported_component():
+    shapes = Graph().parse(data="""
+        @prefix sh: <http://www.w3.org/ns/shacl#> .
+        @prefix : <http://example.org/> .
+        :S a sh:NodeShape ; sh:targetClass :T ;
+            sh:property [ sh:path :p ; sh:uniqueLang true ] .
+    """, format="turtle")
+    try:
+        ShapeCompiler(shapes, ontology=None)
+    except UnsupportedShapeError as e:
+        assert "uniqueLang" in str(e)
+    else:
+        raise AssertionError("expected UnsupportedShapeError")
+
+
+if __name__ == "__main__":
+    test_graph_validation()
+    test_events()
+    test_player_records()
+    test_generated_matches_interpreted()
+    test_unsupported_component()
+    print("✅ All shape compiler tests passed")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test SQLite Triple Store
+
+Checks bulk loading, read-only pattern queries, the writable rdflib plugin
+and the ontology loader's sqlite backend.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+from rdflib import BNode, Graph, Literal, URIRef
+from rdflib.namespace import OWL, RDF, RDFS, XSD
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ontology_loader import cache_stats, clear_memo, load_graph
+from sqlite_store import open_graph, write_graph
+
+
+TTL = """
+@prefix ex: <http://example.org/> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+ex:A a owl:Class ; rdfs:label "A"@en, "A" ; ex:weight 1.5 .
+ex:B a owl:Class ; rdfs:subClassOf [ a owl:Restriction ; owl:onProperty ex:p ] .
+"""
+EX = "http://example.org/"
+
+
+def test_read_only_store():
+    """A bulk-loaded store answers every pattern like the in-memory graph."""
+    source = Graph().parse(data=TTL, format="turtle")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "g.sqlite"
+        write_graph(source, path)
+        graph = open_graph(path)
+
+        assert len(graph) == len(source) == 8
+        assert set(graph.subjects(RDF.type, OWL.Class)) == {URIRef(EX + "A"), URIRef(EX + "B")}
+        assert set(graph.objects(URIRef(EX + "A"), RDFS.label)) == {Literal("A", lang="en"), Literal("A")}
+        assert graph.value(URIRef(EX + "A"), URIRef(EX + "weight")) == Literal("1.5", datatype=XSD.decimal)
+        restriction = graph.value(URIRef(EX + "B"), RDFS.subClassOf)
+        assert isinstance(restriction, BNode)
+        assert (restriction, OWL.onProperty, URIRef(EX + "p")) in graph
+        assert list(graph.triples((URIRef(EX + "missing"), None, None))) == []
+        assert dict(graph.namespaces())["ex"] == URIRef(EX)
+
+        try:
+            graph.add((URIRef(EX + "C"), RDF.type, OWL.Class))
+            raise AssertionError("read-only store accepted a write")
+        except PermissionError:
+            pass
+        graph.close()
+
+
+def test_writable_plugin():
+    """Graph(store="SQLiteTriples") persists adds and removes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "w.sqlite")
+        graph = Graph(store="SQLiteTriples")
+        graph.open(path, create=True)
+        graph.parse(data=TTL, format="turtle")
+        graph.remove((URIRef(EX + "A"), RDFS.label, None))
+        graph.commit()
+        graph.close()
+
+        reopened = open_graph(path)
+        assert len(reopened) == 6
+        assert (URIRef(EX + "A"), RDF.type, OWL.Class) in reopened
+
+
+def test_loader_sqlite_backend():
+    """The loader builds the store once, then opens it without parsing."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        ttl = tmp / "a.ttl"
+        ttl.write_text(TTL)
+        clear_memo()
+        first = load_graph(ttl, cache_dir=tmp / "cache", backend="sqlite")
+        assert len(first) == 8
+        assert len(list((tmp / "cache").glob("*.sqlite"))) == 1
+        clear_memo()
+        assert len(load_graph(ttl, cache_dir=tmp / "cache", backend="sqlite")) == 8
+        assert cache_stats() == {"memory_hits": 0, "disk_hits": 1, "misses": 0}
+        try:
+            load_graph(ttl, cache_dir=False, backend="sqlite")
+            raise AssertionError("sqlite backend accepted cache_dir=False")
+        except ValueError:
+            pass
+
+
+if __name__ == "__main__":
+    test_read_only_store()
+    test_writable_plugin()
+    test_loader_sqlite_backend()
+    print("✅ All SQLite store tests passed")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test Streaming Pipeline
+
+Round-trips NDJSON (gzip) and CSV exports through the streaming pipeline.
+"""
+
+import gzip
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add adapters directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "adapters"))
+
+from streaming_pipeline import iter_records, load_adapter, run_pipeline
+
+
+def test_ndjson_gzip_round_trip():
+    """Every input event is transformed and written, in order."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "mixpanel.ndjson.gz"
+        output = Path(tmp) / "universal.ndjson.gz"
+        with gzip.open(source, "wt", encoding="utf-8") as f:
+            for i in range(2500):
+                f.write(json.dumps({"event_id": f"e{i}", "event_name": "iap_purchase",
+                                    "distinct_id": f"d{i % 7}", "time": 1699123456 + i}) + "\n")
+
+        stats = run_pipeline(load_adapter("mixpanel"), source, output, chunk_size=100, queue_size=1)
+
+        assert stats == {"events_in": 2500, "events_out": 2500, "chunks": 25}
+        with gzip.open(output, "rt", encoding="utf-8") as f:
+            events = [json.loads(line) for line in f]
+        assert [e["event_id"] for e in events] == [f"e{i}" for i in range(2500)]
+        assert {e["event_type"] for e in events} == {"MonetizationEvent"}
+
+
+def test_csv_input():
+    """Timestamp cells are coerced to numbers and JSON cells decoded before mapping."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / "unity.csv"
+        output = Path(tmp) / "universal.ndjson"
+        source.write_text(
+            "event_id,event_name,user_id,timestamp,parameters\n"
+            'u1,purchase,user1,1699123456,"{""amount"": 9.99}"\n'
+            "u2,level_start,user2,,\n",
+            encoding="utf-8",
+        )
+
+        run_pipeline(load_adapter("unity"), source, output)
+
+        events = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+        assert events[0]["properties"] == {"amount": 9.99}
+        assert events[0]["source_metadata"]["original_event"]["timestamp"] == 1699123456
+        assert "timestamp" not in events[1]["source_metadata"]["original_event"]
+
+
+def test_csv_ids_stay_strings():
+    """Only declared numeric columns are coerced, and only plain decimal numbers."""
+    handle = io.StringIO(
+        "user_id,session_id,BID_PRICE,DWELL_TIME,ACTUAL_REVENUE\n"
+        "007,0x1F,0.25,1200,NaN\n"
+        "12e45,00,inf,0012,-1.5\n"
+    )
+    rows = list(iter_records(handle, "csv", {"BID_PRICE", "DWELL_TIME", "ACTUAL_REVENUE"}))
+    assert rows[0] == {"user_id": "007", "session_id": "0x1F", "BID_PRICE": 0.25, "DWELL_TIME": 1200,
+                       "ACTUAL_REVENUE": "NaN"}
+    assert rows[1] == {"user_id": "12e45", "session_id": "00", "BID_PRICE": "inf", "DWELL_TIME": "0012",
+                       "ACTUAL_REVENUE": -1.5}
+
+
+if __name__ == "__main__":
+    test_ndjson_gzip_round_trip()
+    test_csv_input()
+    test_csv_ids_stay_strings()
+    print("Streaming pipeline tests passed")
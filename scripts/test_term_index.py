@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test Term Index
+
+Checks local-name / namespace / type lookups of the term index and the
+UG-vs-UB target preference of the release builder.
+"""
+
+import sys
+from pathlib import Path
+
+from rdflib import Graph, URIRef
+from rdflib.namespace import OWL
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from build_universal_release import CORE, UB, UG, _resolve_target
+from term_index import TermIndex, split_iri
+
+
+TTL = """
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix ug: <http://ontology.gaming.network/universal/gaming#> .
+@prefix ub: <http://ontology.gaming.network/universal/human_behavior#> .
+ug:Player a owl:Class .
+ub:Player a owl:Class .
+ub:activityTimestamp a owl:DatatypeProperty .
+ug:session a owl:Class .
+ub:session a owl:ObjectProperty .
+ug:untyped ug:note "x" .
+"""
+
+
+def _index() -> TermIndex:
+    return TermIndex.from_graph(Graph().parse(data=TTL, format="turtle"))
+
+
+def test_lookup():
+    """Entries are grouped by local name, ordered by namespace preference."""
+    index = _index()
+    assert split_iri(str(UG.Player)) == (str(UG), "Player")
+    assert len(index) == 6
+    assert [e.namespace for e in index.lookup("Player", namespaces=(UB, UG))] == [str(UB), str(UG)]
+    assert [e.iri for e in index.lookup("session", kind="property")] == [UB.session]
+    assert index.lookup("missing") == []
+    assert UG.untyped in index and index.get(UG.untyped).kind is None
+    assert index.get(UB.activityTimestamp).types == {OWL.DatatypeProperty}
+    assert index.classes() == {str(UG.Player), str(UB.Player), str(UG.session)}
+    assert index.properties() == {str(UB.activityTimestamp), str(UB.session)}
+
+
+def test_resolve_target_preference():
+    """UG wins, UB is used when only UB has the term, same kind beats name-only."""
+    index = _index()
+    assert _resolve_target(CORE.Player, {}, index, "class") == UG.Player
+    assert _resolve_target(CORE.activityTimestamp, {}, index, "property") == UB.activityTimestamp
+    assert _resolve_target(CORE.session, {}, index, "property") == UB.session
+    assert _resolve_target(CORE.session, {}, index, "class") == UG.session
+    assert _resolve_target(CORE.brandNew, {}, index, "class") == UG.brandNew
+    explicit = {CORE.Player: URIRef(str(UB) + "Player")}
+    assert _resolve_target(CORE.Player, explicit, index, "class") == UB.Player
+
+
+if __name__ == "__main__":
+    test_lookup()
+    test_resolve_target_preference()
+    print("✅ All term index tests passed")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test Timestamp Parser
+
+Checks that the vectorized column parser agrees with the scalar parser.
+"""
+
+import sys
+import warnings
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+# Add adapters directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "adapters"))
+
+from timestamp_parser import MISSING_EPOCH, TimestampParser, parse_timestamp
+
+
+ISO_VALUES = [
+    "2023-11-05T12:30:56Z",
+    "2023-11-05T12:30:56.250",
+    "2023-11-05 08:00",
+    "2023-11-05T12:30:56+01:00",  # offset: slow path
+    "not a timestamp",
+    None,
+]
+EPOCH_VALUES = [1699123456, 1699123456789, 1699123456.5, None, 0]
+
+
+def test_column_parse_matches_scalar_parse():
+    """to_datetimes() equals parse_timestamp() row by row."""
+    for unit in ("auto", "s"):
+        for values in (ISO_VALUES, EPOCH_VALUES, ISO_VALUES + EPOCH_VALUES):
+            parser = TimestampParser(unit)
+            expected = [parse_timestamp(v, unit) for v in values]
+            assert parser.to_datetimes(values, key="ts") == expected
+
+
+def test_bulk_iso_matches_scalar_parse():
+    """Strings NumPy accepts but parse_timestamp() rejects take the per-row path."""
+    for values in (["2023-11-05T12:30:56", "  2023-11-05T12:30:56"],
+                   ["2023-11-05T12:30:56", "-2023-11-05T12:30"],
+                   ["2023-11-05T12:30:56", "0000-01-01", "2023-13-01", "2023-11-05\n"]):
+        result = TimestampParser().to_datetimes(values, key="ts")
+        assert result == [parse_timestamp(v) for v in values]
+        assert all(v is None or isinstance(v, datetime) for v in result)
+    assert parse_timestamp(True) is None
+
+
+def test_epoch_conversion():
+    """to_epoch_us() converts both numeric and ISO columns."""
+    parser = TimestampParser()
+    epoch = list(parser.to_epoch_us(EPOCH_VALUES, key="time"))
+    assert epoch[:3] == [1699123456000000, 1699123456789000, 1699123456500000]
+    assert epoch[3:] == [MISSING_EPOCH, MISSING_EPOCH]
+
+    epoch = list(parser.to_epoch_us(ISO_VALUES, key="iso"))
+    utc = datetime(2023, 11, 5, 12, 30, 56, tzinfo=timezone.utc)
+    assert epoch[0] == int(utc.timestamp()) * 1000000
+    assert epoch[3] == epoch[0] - 3600 * 1000000
+    assert epoch[4:] == [MISSING_EPOCH, MISSING_EPOCH]
+    assert parser.format_cache_info() == {"time": "epoch", "iso": "iso8601"}
+
+
+def test_epoch_non_finite():
+    """NaN / inf epoch values are missing, from arrays and from lists."""
+    values = [1699123456.5, float("nan"), float("inf"), 0.0]
+    expected = [1699123456500000, MISSING_EPOCH, MISSING_EPOCH, MISSING_EPOCH]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")  # no invalid-cast RuntimeWarning
+        for column in (values, np.array(values)):
+            assert list(TimestampParser().to_epoch_us(column, key="time")) == expected
+
+
+if __name__ == "__main__":
+    test_column_parse_matches_scalar_parse()
+    test_bulk_iso_matches_scalar_parse()
+    test_epoch_conversion()
+    test_epoch_non_finite()
+    print("Timestamp parser tests passed")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test Extensibility Validation
+
+Validates small extensions against a temporary module registry: imports are
+resolved through the registry and subclass axioms are followed transitively.
+"""
+
+import json
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from import_closure import ModuleRegistry
+import validate_extensibility
+from validate_extensibility import BaseClassIndex, base_class_index, validate_extension
+from ontology_loader import load_graph
+
+
+PREFIXES = """
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix base: <http://example.org/base#> .
+@prefix ext: <http://example.org/ext#> .
+"""
+BASE = PREFIXES + """
+<http://example.org/base> a owl:Ontology .
+base:Agent a owl:Class .
+base:Player rdfs:subClassOf base:Agent .
+"""
+EXTENSION = PREFIXES + """
+<http://example.org/ext> a owl:Ontology ;
+    owl:imports <http://example.org/base>, <http://example.org/unknown> .
+ext:Facet rdfs:subClassOf base:Player .
+ext:Combat rdfs:subClassOf ext:Facet .
+ext:Other rdfs:subClassOf ext:Nowhere .
+ext:plays a owl:ObjectProperty ; rdfs:domain base:Agent ; rdfs:range base:Missing .
+"""
+UNATTACHED = PREFIXES + """
+<http://example.org/loose> a owl:Ontology ; owl:imports <http://example.org/base> .
+ext:Loose a owl:Class .
+"""
+
+
+def _registry(tmp: Path) -> ModuleRegistry:
+    (tmp / "base.ttl").write_text(BASE)
+    (tmp / "module_registry.json").write_text(json.dumps({
+        "iri_to_local_path": {"http://example.org/base": "base.ttl"},
+        "modules": [{"id": "base", "ontology_iri": "http://example.org/base"}],
+    }))
+    return ModuleRegistry(tmp / "module_registry.json")
+
+
+def test_base_class_index():
+    """Declared classes and subClassOf endpoints are members; ancestors are transitive."""
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / "base.ttl").write_text(BASE)
+        index = BaseClassIndex([load_graph(Path(tmp) / "base.ttl", cache_dir=False)])
+        assert "http://example.org/base#Agent" in index
+        assert "http://example.org/base#Player" in index
+        assert len(index) == 2
+
+
+def test_base_class_index_built_once():
+    """Concurrent callers for the same import set share one index."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        registry = _registry(tmp)
+        validate_extensibility._base_indexes.clear()
+        imports = frozenset({"http://example.org/base"})
+        with ThreadPoolExecutor(4) as pool:
+            indexes = list(pool.map(lambda _: base_class_index(imports, registry), range(8)))
+        assert all(index is indexes[0] for index in indexes)
+        assert "http://example.org/base#Player" in indexes[0]
+
+
+def test_validate_extension():
+    """Transitive subclasses count; unregistered imports and undefined classes are reported."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        registry = _registry(tmp)
+        (tmp / "ext.ttl").write_text(EXTENSION)
+        (tmp / "loose.ttl").write_text(UNATTACHED)
+
+        result = validate_extension(tmp / "ext.ttl", registry)
+        assert result["valid"]
+        assert (result["classes_extending_base"], result["subclass_axioms"]) == (2, 3)
+        assert result["properties_attached_to_base"] == 1
+        assert result["undefined_references"] == [
+            "http://example.org/base#Missing", "http://example.org/ext#Nowhere",
+        ]
+        assert any("http://example.org/unknown" in w for w in result["warnings"])
+
+        loose = validate_extension(tmp / "loose.ttl", registry)
+        assert not loose["valid"]
+        assert loose["classes_extending_base"] == loose["subclass_axioms"] == 0
+
+        (tmp / "broken.ttl").write_text("this is not turtle")
+        assert "error" in validate_extension(tmp / "broken.ttl", registry)
+
+
+if __name__ == "__main__":
+    test_base_class_index()
+    test_base_class_index_built_once()
+    test_validate_extension()
+    print("✅ All extensibility validation tests passed")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test Universal Coverage Validation
+
+Checks set-based coverage of a source ontology by a mapping graph and the
+JSON report of the full validation run.
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from validate_universal_coverage import SOURCES, validate_coverage, validate_source
+
+
+SOURCE = """
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix src: <http://example.org/source#> .
+src:Session a owl:Class .
+src:Purchase a owl:Class .
+src:userId a owl:DatatypeProperty .
+src:note a owl:AnnotationProperty .
+"""
+MAPPING = """
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix src: <http://example.org/source#> .
+@prefix ug: <http://ontology.gaming.network/universal/gaming#> .
+src:Session owl:equivalentClass ug:GameSession .
+ug:playerId owl:equivalentProperty src:userId .
+"""
+
+
+def test_validate_source():
+    """Terms mentioned anywhere in the mapping count as covered."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        (tmp / "source.ttl").write_text(SOURCE)
+        (tmp / "mapping.ttl").write_text(MAPPING)
+        result = validate_source("example", tmp / "source.ttl", tmp / "mapping.ttl")
+        assert (result["classes_covered"], result["classes_total"]) == (1, 2)
+        assert (result["properties_covered"], result["properties_total"]) == (1, 1)
+        assert result["terms"]["classes"] == {
+            "http://example.org/source#Purchase": False,
+            "http://example.org/source#Session": True,
+        }
+        assert set(result["timing_ms"]) == {"load", "coverage"}
+
+
+def test_json_report():
+    """The full run writes per-source, per-term results."""
+    with tempfile.TemporaryDirectory() as tmp:
+        report_path = Path(tmp) / "coverage.json"
+        status = validate_coverage(report_path, max_workers=2)
+        report = json.loads(report_path.read_text())
+        assert status == (0 if report["all_classes_covered"] else 1)
+        assert set(report["sources"]) == {f"{key}_coverage" for key, _, _, _ in SOURCES}
+        for entry in report["sources"].values():
+            assert len(entry["terms"]["classes"]) == entry["classes_total"]
+            assert sum(entry["terms"]["classes"].values()) == entry["classes_covered"]
+
+
+if __name__ == "__main__":
+    test_validate_source()
+    test_json_report()
+    print("✅ All coverage validation tests passed")
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test Video Adapter
+
+Checks VideoAdapter.correlate_with_game_events() against a brute-force
+nearest-event scan.
+"""
+
+import random
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add adapters directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "adapters"))
+
+from video_adapter import VideoAdapter
+
+
+def _brute_force(adapter, video_frames, game_events, tolerance_seconds):
+    """Reference implementation: scan every event for every frame."""
+    correlated = []
+    for frame in video_frames:
+        frame_timestamp = frame.get("timestamp", 0.0)
+        closest_event = None
+        min_time_diff = float("inf")
+        for game_event in game_events:
+            game_timestamp = adapter._extract_game_event_timestamp(game_event)
+            if game_timestamp is None:
+                continue
+            time_diff = abs(frame_timestamp - game_timestamp)
+            if time_diff < min_time_diff and time_diff <= tolerance_seconds:
+                min_time_diff = time_diff
+                closest_event = game_event
+        if closest_event:
+            correlated.append({
+                "video_frame": frame,
+                "game_event": closest_event,
+                "correlation_score": 1.0 - (min_time_diff / tolerance_seconds),
+                "time_difference": min_time_diff
+            })
+    return correlated
+
+
+def test_correlation_matches_brute_force():
+    """Sorted-index correlation returns exactly the brute-force result."""
+    adapter = VideoAdapter()
+    rng = random.Random(7)
+    for _ in range(50):
+        game_events = []
+        for i in range(rng.randint(0, 40)):
+            ts = rng.choice([rng.randint(0, 60), round(rng.uniform(0, 60), 1)])
+            form = rng.randint(0, 3)
+            if form == 0:
+                activity_timestamp = datetime.fromtimestamp(ts, tz=timezone.utc)
+            elif form == 1:
+                activity_timestamp = datetime.fromtimestamp(ts, tz=timezone.utc).isoformat()
+            elif form == 2:
+                activity_timestamp = ts
+            else:
+                activity_timestamp = None
+            game_events.append({"event_type": f"E{i}", "activity_timestamp": activity_timestamp})
+        video_frames = [{"timestamp": i / 3} for i in range(rng.randint(0, 200))]
+        tolerance = rng.choice([0.5, 1.0, 2.0])
+
+        expected = _brute_force(adapter, video_frames, game_events, tolerance)
+        assert adapter.correlate_with_game_events(video_frames, game_events, tolerance) == expected
+
+
+if __name__ == "__main__":
+    test_correlation_matches_brute_force()
+    print("Video adapter tests passed")
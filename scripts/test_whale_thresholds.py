@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test Streaming Whale Threshold Derivation
+
+Checks the sketch against exact per-device counts, merging of partitions
+that split a device's purchases, and that regenerated thresholds keep the
+tenant_thresholds.ttl shape and load in the classifier.
+"""
+
+import random
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from monetization_classifier import DEFAULT_THRESHOLDS, MonetizationClassifier
+from ontology_loader import load_graph
+from whale_thresholds import (
+    PartitionSketch, derive_thresholds, expected_whales, is_iap, merge_partitions,
+    read_thresholds, render_thresholds, split_layout,
+)
+
+
+def _iap(device):
+    return {"event_type": "InAppPurchase", "device_id": device}
+
+
+def _partitions(n_partitions=5, devices=3000, seed=3):
+    """IAP events per partition; heavy devices buy in every partition."""
+    rng = random.Random(seed)
+    partitions = []
+    for _ in range(n_partitions):
+        events = []
+        for d in range(devices):
+            events += [_iap(f"d{d}")] * (int(rng.paretovariate(1.2)) - 1)
+        rng.shuffle(events)
+        partitions.append(events)
+    return partitions
+
+
+def test_is_iap():
+    assert is_iap({"event_type": "InAppPurchase"})
+    assert is_iap({"event_type": "MonetizationEvent", "properties": {"amount": 0.99}})
+    assert not is_iap({"event_type": "MonetizationEvent", "properties": {"ad_type": "rewarded"}})
+    assert not is_iap({"event_type": "MonetizationEvent", "properties": {"currency_balance": 40}})
+    assert not is_iap({"event_type": "MonetizationEvent", "properties": {"ad_type": "video", "revenue": 0.1}})
+    assert not is_iap({"event_type": "GameSession"})
+
+
+def test_merged_top_k_matches_exact():
+    partitions = _partitions()
+    exact = Counter(e["device_id"] for events in partitions for e in events)
+    sketches = []
+    for i, events in enumerate(partitions):
+        sketch = PartitionSketch("Flick", f"p{i}", capacity=64)
+        for start in range(0, len(events), 1000):
+            sketch.add_events(events[start:start + 1000])
+        assert len(sketch.candidates) <= 2 * 64
+        sketches.append(sketch)
+
+    merged = merge_partitions(sketches)["flick"]
+    assert merged.total == sum(exact.values())
+    top = merged.top(13)
+    assert [count for _, count in top] == sorted(exact.values(), reverse=True)[:13]
+    assert all(count >= exact[device] for device, count in top)  # upper bounds
+
+
+def test_small_sketch_overestimates_within_bound():
+    sketch = PartitionSketch("t", width=256, depth=4)
+    counts = Counter({f"d{i}": (i % 7) + 1 for i in range(2000)})
+    sketch.add_counts(counts)
+    estimates = sketch.estimate(list(counts))
+    errors = [int(e) - counts[k] for k, e in zip(counts, estimates)]
+    assert min(errors) >= 0
+    assert sum(err <= sketch.error_bound for err in errors) >= 0.95 * len(errors)
+
+
+def test_regenerated_thresholds_load():
+    text = Path(DEFAULT_THRESHOLDS).read_text(encoding="utf-8")
+    blocks = read_thresholds(load_graph(DEFAULT_THRESHOLDS), text)
+    by_tenant = {b.tenant: b for b in blocks}
+    assert blocks[0].tenant is None
+    assert [b.tenant for b in blocks[1:]] == ["flick", "avakin", "adinmo"]
+    assert expected_whales(by_tenant["flick"]) == 13
+    assert expected_whales(by_tenant["avakin"]) == 25
+
+    flick = PartitionSketch("flick")
+    flick.add_counts({f"f{i}": 1000 + i for i in range(20)})
+    newco = PartitionSketch("new-co")
+    newco.add_counts({f"n{i}": 10 * i for i in range(1, 20)})
+    blocks = derive_thresholds(blocks, {"flick": flick, "new-co": newco}, whales={"new-co": 5})
+    rendered = render_thresholds(blocks, *split_layout(text))
+    assert "# Author: Gi Fernando" in rendered and "To add a new tenant" in rendered
+    assert "# These provide fallback values for new tenants\n:DefaultMonetizationThresholds" in rendered
+    assert "# - 13th highest IAP count: 1,007 (after aggregation across 1 partition)" in rendered
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "thresholds.ttl"
+        path.write_text(rendered, encoding="utf-8")
+        classifier = MonetizationClassifier(path)
+        assert classifier.thresholds("flick")["iap"]["Whale"] == 1007
+        assert classifier.thresholds("avakin")["iap"]["Whale"] == 34190
+        assert classifier.thresholds("new-co")["iap"] == {"Minnow": 1.0, "Dolphin": 2.0, "Whale": 150.0}
+        assert classifier.thresholds("new-co")["monetary"]["Whale"] == 50.0
+
+
+if __name__ == "__main__":
+    test_is_iap()
+    test_merged_top_k_matches_exact()
+    test_small_sketch_overestimates_within_bound()
+    test_regenerated_thresholds_load()
+    print("✅ All whale threshold tests passed")
@@ -2,113 +2,231 @@
 """
 Validate Extensibility
 
-Validates that extension mechanisms work correctly (video, cross-game, human behavior).
+Validates that extension mechanisms work correctly: every ontology under
+extensions/ and ontology/extensions/ is checked (in parallel) against the
+modules it imports, resolved through ontology/module_registry.json.
 
 Author: Gi Fernando
 Copyright: © 2025 Gi Fernando. All rights reserved.
 Date: 2025-12-27
 """
 
+import argparse
 import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from rdflib import Graph, Namespace
-from rdflib.namespace import RDF, RDFS, OWL
+from typing import Any, Dict, FrozenSet, List, Optional, Set
+from rdflib import Graph, URIRef
+from rdflib.namespace import RDFS, OWL, XSD
+
+from import_closure import ModuleRegistry, load_closure
+from ontology_loader import cache_stats, load_graph
+from term_index import TermIndex
+
+
+BASE_PATH = Path(__file__).parent.parent
+EXTENSION_DIRS = (BASE_PATH / "extensions", BASE_PATH / "ontology" / "extensions")
 
 
 def load_ontology(file_path: Path) -> Graph:
-    """Load an ontology file into an RDF graph."""
-    g = Graph()
+    """Load an ontology file into an RDF graph (shared, cached; do not mutate)."""
     try:
-        g.parse(str(file_path), format="turtle")
-        return g
+        return load_graph(file_path)
     except Exception as e:
         print(f"Error loading {file_path}: {e}", file=sys.stderr)
         return None
 
 
-def validate_extension(extension_path: Path, base_ontology_path: Path, extension_name: str) -> bool:
-    """Validate that an extension properly extends the base ontology."""
+def _superclass_closure(edges: Dict[URIRef, Set[URIRef]]) -> Dict[URIRef, Set[URIRef]]:
+    """Transitive closure of a subClassOf adjacency map (cycle-safe)."""
+    closure: Dict[URIRef, Set[URIRef]] = {}
+    for start in edges:
+        seen: Set[URIRef] = set()
+        stack = list(edges[start])
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            if node in closure:
+                seen |= closure[node]
+            else:
+                stack.extend(edges.get(node, ()))
+        closure[start] = seen
+    return closure
+
+
+def _subclass_edges(graph: Graph) -> Dict[URIRef, Set[URIRef]]:
+    edges: Dict[URIRef, Set[URIRef]] = {}
+    for s, _, o in graph.triples((None, RDFS.subClassOf, None)):
+        if isinstance(s, URIRef) and isinstance(o, URIRef):
+            edges.setdefault(s, set()).add(o)
+    return edges
+
+
+class BaseClassIndex:
+    """
+    Set of classes defined by a group of base modules.
+
+    Contains every declared class plus everything reachable through the
+    transitive rdfs:subClassOf closure, so membership is one set lookup.
+    """
+
+    def __init__(self, graphs: List[Graph]):
+        self.classes: Set[str] = set()
+        edges: Dict[URIRef, Set[URIRef]] = {}
+        for graph in graphs:
+            self.classes |= TermIndex.from_graph(graph).iris_of_type((OWL.Class, RDFS.Class))
+            for sub, supers in _subclass_edges(graph).items():
+                edges.setdefault(sub, set()).update(supers)
+        self.superclasses = _superclass_closure(edges)
+        for sub, supers in self.superclasses.items():
+            self.classes.add(str(sub))
+            self.classes.update(str(c) for c in supers)
+
+    def __contains__(self, iri) -> bool:
+        return str(iri) in self.classes
+
+    def __len__(self) -> int:
+        return len(self.classes)
+
+
+_base_indexes: Dict[FrozenSet[str], "Future[BaseClassIndex]"] = {}
+_base_lock = threading.Lock()
+
+
+def base_class_index(imports: FrozenSet[str], registry: ModuleRegistry) -> BaseClassIndex:
+    """
+    Index of the import closure of a set of modules, built once per set.
+
+    The lock only guards the future table: the first caller for a set loads
+    and indexes it outside the lock while callers for the same set wait on
+    its future, so different sets are built concurrently.
+    """
+    with _base_lock:
+        future = _base_indexes.get(imports)
+        owner = future is None
+        if owner:
+            future = _base_indexes[imports] = Future()
+    if not owner:
+        return future.result()
+
+    try:
+        graphs: Dict[str, Graph] = {}
+        for iri in sorted(imports):
+            graphs.update(load_closure(iri, registry, max_workers=1).graphs)
+        future.set_result(BaseClassIndex(list(graphs.values())))
+    except BaseException as e:
+        with _base_lock:
+            del _base_indexes[imports]  # let a later call retry
+        future.set_exception(e)
+    return future.result()
+
+
+def validate_extension(extension_path: Path, registry: ModuleRegistry) -> Dict[str, Any]:
+    """
+    Validate that an extension properly extends the modules it imports.
+
+    The extension's owl:imports are resolved through the module registry;
+    its rdfs:subClassOf axioms (followed transitively through the
+    extension's own hierarchy) and property domains/ranges must reach
+    classes of the imported modules.
+    """
+    result: Dict[str, Any] = {"path": extension_path, "warnings": [], "valid": False}
     extension_graph = load_ontology(extension_path)
-    base_graph = load_ontology(base_ontology_path)
-    
-    if extension_graph is None or base_graph is None:
-        print(f"❌ Failed to load ontologies for {extension_name}")
-        return False
-    
-    # Check that extension imports base ontology
-    imports_found = False
-    for s, p, o in extension_graph.triples((None, OWL.imports, None)):
-        if str(base_ontology_path) in str(o) or extension_name in str(o):
-            imports_found = True
-            break
-    
-    if not imports_found:
-        print(f"⚠️  {extension_name} may not properly import base ontology")
-    
-    # Check that extension has classes that extend base classes
-    extension_classes = []
-    base_classes = []
-    
-    for s, p, o in extension_graph.triples((None, RDFS.subClassOf, None)):
-        extension_classes.append((str(s), str(o)))
-    
-    for s, p, o in base_graph.triples((None, RDF.type, OWL.Class)):
-        base_classes.append(str(s))
-    for s, p, o in base_graph.triples((None, RDF.type, RDFS.Class)):
-        base_classes.append(str(s))
-    
-    valid_extensions = 0
-    for ext_class, base_class in extension_classes:
-        if base_class in base_classes:
-            valid_extensions += 1
-    
-    print(f"{extension_name}:")
-    print(f"  Classes extending base: {valid_extensions}/{len(extension_classes)}")
-    
-    return valid_extensions > 0
-
-
-def validate_extensibility():
+    if extension_graph is None:
+        result["error"] = "Failed to load ontology"
+        return result
+
+    imports = sorted(str(o) for o in extension_graph.objects(None, OWL.imports))
+    resolved = frozenset(iri for iri in imports if registry.resolve(iri) is not None)
+    for iri in imports:
+        if iri not in resolved:
+            result["warnings"].append(f"import not in module registry: {iri}")
+    if not resolved:
+        result["warnings"].append("no import resolves to a registered base module")
+    base = base_class_index(resolved, registry) if resolved else BaseClassIndex([])
+
+    # Subclass axioms, followed through the extension's own hierarchy
+    edges = _subclass_edges(extension_graph)
+    closure = _superclass_closure(edges)
+    axioms = [(sub, sup) for sub, supers in edges.items() for sup in supers]
+    extending = sum(1 for _, sup in axioms if sup in base or any(c in base for c in closure.get(sup, ())))
+
+    # Properties attached to base classes through domain/range
+    properties = TermIndex.from_graph(extension_graph).iris_of_type(
+        (OWL.ObjectProperty, OWL.DatatypeProperty)
+    )
+    attached = sum(
+        1 for prop in properties
+        if any(c in base for pred in (RDFS.domain, RDFS.range) for c in extension_graph.objects(URIRef(prop), pred))
+    )
+
+    # Referenced classes that neither the extension nor its imports define
+    own_classes = TermIndex.from_graph(extension_graph).iris_of_type((OWL.Class, RDFS.Class))
+    own_classes.update(str(sub) for sub in edges)
+    referenced = {str(sup) for _, sup in axioms}
+    for prop in properties:
+        for pred in (RDFS.domain, RDFS.range):
+            referenced.update(str(c) for c in extension_graph.objects(URIRef(prop), pred) if isinstance(c, URIRef))
+    undefined = sorted(
+        iri for iri in referenced
+        if iri not in base and iri not in own_classes
+        and not iri.startswith((str(XSD), str(RDFS)))
+    )
+    if undefined:
+        result["warnings"].append(
+            f"{len(undefined)} referenced classes not defined by the extension or its imports "
+            f"(e.g. {', '.join(undefined[:3])})"
+        )
+
+    result.update({
+        "imports": imports,
+        "undefined_references": undefined,
+        "base_classes": len(base),
+        "subclass_axioms": len(axioms),
+        "classes_extending_base": extending,
+        "properties": len(properties),
+        "properties_attached_to_base": attached,
+        "valid": bool(resolved) and (extending + attached) > 0,
+    })
+    return result
+
+
+def discover_extensions(directories=EXTENSION_DIRS) -> List[Path]:
+    return sorted(path for directory in directories if directory.exists() for path in directory.glob("*.ttl"))
+
+
+def validate_extensibility(registry_path: Optional[Path] = None, max_workers: int = 4) -> int:
     """Validate all extension mechanisms."""
-    base_path = Path(__file__).parent.parent
-    
+    registry = ModuleRegistry(registry_path) if registry_path else ModuleRegistry()
+    extensions = discover_extensions()
+
     print("Extensibility Validation")
     print("=" * 60)
     print()
-    
-    # Universal foundation
-    universal_foundation = base_path / "universal" / "human_behavior_foundation.ttl"
-    
-    # Video extension
-    video_extension = base_path / "extensions" / "video_playthrough_extension.ttl"
-    video_valid = validate_extension(
-        video_extension,
-        universal_foundation,
-        "Video Extension"
-    )
-    print()
-    
-    # Cross-game extension
-    cross_game_extension = base_path / "extensions" / "cross_game_extension.ttl"
-    gaming_foundation = base_path / "universal" / "gaming_foundation_v1.ttl"
-    cross_game_valid = validate_extension(
-        cross_game_extension,
-        gaming_foundation,
-        "Cross-Game Extension"
-    )
-    print()
-    
-    # Human behavior extension
-    human_behavior_extension = base_path / "extensions" / "human_behavior_extension.ttl"
-    human_behavior_valid = validate_extension(
-        human_behavior_extension,
-        universal_foundation,
-        "Human Behavior Extension"
-    )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(lambda path: validate_extension(path, registry), extensions))
+
+    for result in results:
+        print(f"{result['path'].relative_to(BASE_PATH)}:")
+        if "error" in result:
+            print(f"  ❌ {result['error']}")
+            print()
+            continue
+        for warning in result["warnings"]:
+            print(f"  ⚠️  {warning}")
+        print(f"  Classes extending base: {result['classes_extending_base']}/{result['subclass_axioms']}")
+        print(f"  Properties attached to base: {result['properties_attached_to_base']}/{result['properties']}")
+        print()
+
+    print(f"Ontology cache: {cache_stats()}")
     print()
-    
+
     # Overall validation
-    if video_valid and cross_game_valid and human_behavior_valid:
+    if all(result["valid"] for result in results):
         print("✅ All extensions properly extend base ontologies")
         return 0
     else:
@@ -116,6 +234,13 @@ def validate_extensibility():
         return 1
 
 
-if __name__ == "__main__":
-    sys.exit(validate_extensibility())
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Validate ontology extensions against their imported modules")
+    parser.add_argument("--registry", type=Path, help="Module registry (default: ontology/module_registry.json)")
+    parser.add_argument("--workers", type=int, default=4, help="Extensions validated concurrently")
+    args = parser.parse_args()
+    return validate_extensibility(args.registry, args.workers)
 
+
+if __name__ == "__main__":
+    sys.exit(main())
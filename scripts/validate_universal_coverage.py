@@ -10,20 +10,44 @@ Copyright: © 2025 Gi Fernando. All rights reserved.
 Date: 2025-12-27
 """
 
+import argparse
 import sys
 import json
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Set
-from rdflib import Graph, Namespace
+from typing import Any, Dict, List, Optional, Set
+from rdflib import Graph, URIRef
 from rdflib.namespace import RDF, RDFS, OWL
 
+from ontology_loader import cache_stats, load_graph
+from term_index import TermIndex
+
+
+BASE_PATH = Path(__file__).parent.parent
+
+# (key, display name, source patterns, mapping ontology)
+SOURCES = [
+    ("unity", "Unity Analytics",
+     BASE_PATH / "sources" / "unity" / "unity_analytics_patterns.ttl",
+     BASE_PATH / "mappings" / "unity_to_universal.ttl"),
+    ("mixpanel", "Mixpanel",
+     BASE_PATH / "sources" / "mixpanel" / "mixpanel_patterns.ttl",
+     BASE_PATH / "mappings" / "mixpanel_to_universal.ttl"),
+    # GOP is a structural reference; use generic framework for now
+    ("gop", "GOP",
+     BASE_PATH / "sources" / "gop" / "gop_patterns.ttl",
+     BASE_PATH / "mappings" / "game_source_to_universal.ttl"),
+    ("adinmo", "Adinmo",
+     BASE_PATH / "sources" / "adinmo" / "adinmo_patterns.ttl",
+     BASE_PATH / "mappings" / "adinmo_to_universal.ttl"),
+]
+
 
 def load_ontology(file_path: Path) -> Graph:
-    """Load an ontology file into an RDF graph."""
-    g = Graph()
+    """Load an ontology file into an RDF graph (shared, cached; do not mutate)."""
     try:
-        g.parse(str(file_path), format="turtle")
-        return g
+        return load_graph(file_path)
     except Exception as e:
         print(f"Error loading {file_path}: {e}", file=sys.stderr)
         return None
@@ -31,33 +55,78 @@ def load_ontology(file_path: Path) -> Graph:
 
 def extract_classes(graph: Graph) -> Set[str]:
     """Extract all class URIs from an ontology graph."""
-    classes = set()
     if graph is None:
-        return classes
-    
-    for s, p, o in graph.triples((None, RDF.type, OWL.Class)):
-        classes.add(str(s))
-    for s, p, o in graph.triples((None, RDF.type, RDFS.Class)):
-        classes.add(str(s))
-    
-    return classes
+        return set()
+    return TermIndex.from_graph(graph).iris_of_type((OWL.Class, RDFS.Class))
 
 
 def extract_properties(graph: Graph) -> Set[str]:
     """Extract all property URIs from an ontology graph."""
-    properties = set()
     if graph is None:
-        return properties
-    
-    for s, p, o in graph.triples((None, RDF.type, OWL.DatatypeProperty)):
-        properties.add(str(s))
-    for s, p, o in graph.triples((None, RDF.type, OWL.ObjectProperty)):
-        properties.add(str(s))
-    
-    return properties
+        return set()
+    return TermIndex.from_graph(graph).iris_of_type((OWL.DatatypeProperty, OWL.ObjectProperty))
+
+
+def mentioned_iris(graph: Graph) -> Set[str]:
+    """All IRIs used as subject, predicate or object in a graph (one pass)."""
+    iris: Set[str] = set()
+    if graph is None:
+        return iris
+    add = iris.add
+    for triple in graph:
+        for term in triple:
+            if isinstance(term, URIRef):
+                add(str(term))
+    return iris
+
+
+def _display_path(path: Path) -> str:
+    try:
+        return str(path.resolve().relative_to(BASE_PATH.resolve()))
+    except ValueError:
+        return str(path)
+
+
+def validate_source(key: str, source_path: Path, mapping_path: Path) -> Dict[str, Any]:
+    """
+    Coverage of one source's classes and properties by its mapping ontology.
+
+    A source term is covered when its IRI appears anywhere in the mapping
+    graph (subject, predicate or object).
+    """
+    start = time.perf_counter()
+    source_graph = load_ontology(source_path)
+    mapping_graph = load_ontology(mapping_path)
+    loaded = time.perf_counter()
+
+    index = TermIndex.from_graph(source_graph) if source_graph is not None else TermIndex()
+    classes = index.iris_of_type((OWL.Class, RDFS.Class))
+    properties = index.iris_of_type((OWL.DatatypeProperty, OWL.ObjectProperty))
+    mapped = mentioned_iris(mapping_graph)
+    covered_classes = classes & mapped
+    covered_properties = properties & mapped
+    done = time.perf_counter()
+
+    return {
+        "source": key,
+        "source_file": _display_path(source_path),
+        "mapping_file": _display_path(mapping_path),
+        "classes_covered": len(covered_classes),
+        "classes_total": len(classes),
+        "properties_covered": len(covered_properties),
+        "properties_total": len(properties),
+        "terms": {
+            "classes": {iri: iri in covered_classes for iri in sorted(classes)},
+            "properties": {iri: iri in covered_properties for iri in sorted(properties)},
+        },
+        "timing_ms": {
+            "load": round((loaded - start) * 1000, 3),
+            "coverage": round((done - loaded) * 1000, 3),
+        },
+    }
 
 
-def validate_coverage():
+def validate_coverage(report_path: Optional[Path] = None, max_workers: int = 4) -> int:
     """
     Validate that all source patterns are covered by the universal foundation.
 
@@ -65,110 +134,49 @@ def validate_coverage():
     Source ontologies intentionally use *different namespaces* than the universal ontology.
     Coverage should therefore be assessed via the mapping ontologies (mappings/*_to_universal.ttl),
     not by raw URI intersection.
+
+    Args:
+        report_path: Write a JSON report (per-term coverage + timing) here
+        max_workers: Source/mapping pairs validated concurrently
     """
-    base_path = Path(__file__).parent.parent
-    
-    # Load source ontologies
-    unity_graph = load_ontology(base_path / "sources" / "unity" / "unity_analytics_patterns.ttl")
-    mixpanel_graph = load_ontology(base_path / "sources" / "mixpanel" / "mixpanel_patterns.ttl")
-    gop_graph = load_ontology(base_path / "sources" / "gop" / "gop_patterns.ttl")
-    adinmo_graph = load_ontology(base_path / "sources" / "adinmo" / "adinmo_patterns.ttl")
-    gaming_graph = load_ontology(base_path / "universal" / "gaming_foundation_v1.ttl")
-
-    # Load mapping ontologies
-    unity_mapping = load_ontology(base_path / "mappings" / "unity_to_universal.ttl")
-    mixpanel_mapping = load_ontology(base_path / "mappings" / "mixpanel_to_universal.ttl")
-    gop_mapping = load_ontology(base_path / "mappings" / "game_source_to_universal.ttl")  # GOP is a structural reference; use generic framework for now
-    adinmo_mapping = load_ontology(base_path / "mappings" / "adinmo_to_universal.ttl")
-
-    def appears_in_graph(uri: str, g: Graph) -> bool:
-        """Return True if uri appears as subject/predicate/object anywhere in graph."""
-        if g is None:
-            return False
-        from rdflib import URIRef
-        u = URIRef(uri)
-        for _ in g.triples((u, None, None)):
-            return True
-        for _ in g.triples((None, u, None)):
-            return True
-        for _ in g.triples((None, None, u)):
-            return True
-        return False
-    
-    # Extract classes and properties
-    unity_classes = extract_classes(unity_graph) if unity_graph else set()
-    mixpanel_classes = extract_classes(mixpanel_graph) if mixpanel_graph else set()
-    gop_classes = extract_classes(gop_graph) if gop_graph else set()
-    adinmo_classes = extract_classes(adinmo_graph) if adinmo_graph else set()
-    gaming_classes = extract_classes(gaming_graph) if gaming_graph else set()
-    
-    unity_props = extract_properties(unity_graph) if unity_graph else set()
-    mixpanel_props = extract_properties(mixpanel_graph) if mixpanel_graph else set()
-    gop_props = extract_properties(gop_graph) if gop_graph else set()
-    adinmo_props = extract_properties(adinmo_graph) if adinmo_graph else set()
-    gaming_props = extract_properties(gaming_graph) if gaming_graph else set()
-    
-    # Validation results (coverage via mappings)
-    results = {
-        "unity_coverage": {
-            "classes_covered": sum(1 for c in unity_classes if appears_in_graph(c, unity_mapping)),
-            "classes_total": len(unity_classes),
-            "properties_covered": sum(1 for p in unity_props if appears_in_graph(p, unity_mapping)),
-            "properties_total": len(unity_props)
-        },
-        "mixpanel_coverage": {
-            "classes_covered": sum(1 for c in mixpanel_classes if appears_in_graph(c, mixpanel_mapping)),
-            "classes_total": len(mixpanel_classes),
-            "properties_covered": sum(1 for p in mixpanel_props if appears_in_graph(p, mixpanel_mapping)),
-            "properties_total": len(mixpanel_props)
-        },
-        "gop_coverage": {
-            "classes_covered": sum(1 for c in gop_classes if appears_in_graph(c, gop_mapping)),
-            "classes_total": len(gop_classes),
-            "properties_covered": sum(1 for p in gop_props if appears_in_graph(p, gop_mapping)),
-            "properties_total": len(gop_props)
-        },
-        "adinmo_coverage": {
-            "classes_covered": sum(1 for c in adinmo_classes if appears_in_graph(c, adinmo_mapping)),
-            "classes_total": len(adinmo_classes),
-            "properties_covered": sum(1 for p in adinmo_props if appears_in_graph(p, adinmo_mapping)),
-            "properties_total": len(adinmo_props)
-        }
-    }
-    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        coverage: List[Dict[str, Any]] = list(pool.map(
+            lambda entry: validate_source(entry[0], entry[2], entry[3]), SOURCES
+        ))
+    elapsed = time.perf_counter() - start
+    results = {f"{entry['source']}_coverage": entry for entry in coverage}
+
     # Print results
     print("Universal Foundation Coverage Validation")
     print("=" * 60)
     print()
-    
-    print("Unity Analytics Coverage:")
-    print(f"  Classes: {results['unity_coverage']['classes_covered']}/{results['unity_coverage']['classes_total']}")
-    print(f"  Properties: {results['unity_coverage']['properties_covered']}/{results['unity_coverage']['properties_total']}")
-    print()
-    
-    print("Mixpanel Coverage:")
-    print(f"  Classes: {results['mixpanel_coverage']['classes_covered']}/{results['mixpanel_coverage']['classes_total']}")
-    print(f"  Properties: {results['mixpanel_coverage']['properties_covered']}/{results['mixpanel_coverage']['properties_total']}")
-    print()
-    
-    print("GOP Coverage:")
-    print(f"  Classes: {results['gop_coverage']['classes_covered']}/{results['gop_coverage']['classes_total']}")
-    print(f"  Properties: {results['gop_coverage']['properties_covered']}/{results['gop_coverage']['properties_total']}")
-    print()
 
-    print("Adinmo Coverage:")
-    print(f"  Classes: {results['adinmo_coverage']['classes_covered']}/{results['adinmo_coverage']['classes_total']}")
-    print(f"  Properties: {results['adinmo_coverage']['properties_covered']}/{results['adinmo_coverage']['properties_total']}")
+    for key, name, _, _ in SOURCES:
+        entry = results[f"{key}_coverage"]
+        print(f"{name} Coverage:")
+        print(f"  Classes: {entry['classes_covered']}/{entry['classes_total']}")
+        print(f"  Properties: {entry['properties_covered']}/{entry['properties_total']}")
+        print()
+
+    print(f"Ontology cache: {cache_stats()}")
     print()
-    
+
     # Overall validation
-    all_covered = (
-        results['unity_coverage']['classes_covered'] == results['unity_coverage']['classes_total'] and
-        results['mixpanel_coverage']['classes_covered'] == results['mixpanel_coverage']['classes_total'] and
-        results['gop_coverage']['classes_covered'] == results['gop_coverage']['classes_total'] and
-        results['adinmo_coverage']['classes_covered'] == results['adinmo_coverage']['classes_total']
-    )
-    
+    all_covered = all(entry["classes_covered"] == entry["classes_total"] for entry in coverage)
+
+    if report_path is not None:
+        report = {
+            "all_classes_covered": all_covered,
+            "sources": results,
+            "timing_ms": {"total": round(elapsed * 1000, 3)},
+            "ontology_cache": cache_stats(),
+        }
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {report_path}")
+        print()
+
     if all_covered:
         print("✅ All source patterns are covered by universal foundation")
         return 0
@@ -177,6 +185,13 @@ def validate_coverage():
         return 1
 
 
-if __name__ == "__main__":
-    sys.exit(validate_coverage())
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Validate source coverage by the universal foundation")
+    parser.add_argument("--report", type=Path, help="Write a JSON coverage report to this file")
+    parser.add_argument("--workers", type=int, default=4, help="Source/mapping pairs validated concurrently")
+    args = parser.parse_args()
+    return validate_coverage(args.report, args.workers)
 
+
+if __name__ == "__main__":
+    sys.exit(main())
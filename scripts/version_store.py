@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Delta-Encoded Ontology Version Store
+
+Packs the full snapshots in ontology/versions/ (vNNN.ttl + vNNN.json
+sidecar) into one compressed file:
+
+- every distinct canonical N-Triples line (see rdf_canon.py) stored once,
+  versions refer to lines by integer ID
+- v001 as base snapshot, then per version only the added/removed IDs
+  (byte-identical successors cost an empty delta)
+- a full checkpoint every `checkpoint_interval` versions, so a checkout
+  replays at most checkpoint_interval - 1 deltas
+- the JSON sidecar metadata and (when they change) prefix bindings
+
+diff(vA, vB) composes the deltas between the two versions as ID sets and
+never builds either graph.
+
+Usage:
+    python scripts/version_store.py build
+    python scripts/version_store.py checkout v017 -o /tmp/v017.ttl
+    python scripts/version_store.py diff v010 v042
+    python scripts/version_store.py stats
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from rdflib import Graph
+
+from rdf_canon import canonical_lines, lines_to_graph
+
+
+FORMAT_VERSION = 1
+DEFAULT_VERSIONS_DIR = Path(__file__).parent.parent / "ontology" / "versions"
+DEFAULT_STORE = DEFAULT_VERSIONS_DIR / "version_store.json.gz"
+DEFAULT_CHECKPOINT_INTERVAL = 8
+
+
+class VersionStore:
+    """Base snapshot + triple-level deltas + periodic checkpoints."""
+
+    def __init__(self, triples: List[str], versions: List[Dict[str, Any]],
+                 checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL):
+        self.triples = triples
+        self.versions = versions
+        self.checkpoint_interval = checkpoint_interval
+        self._position = {v["id"]: i for i, v in enumerate(versions)}
+
+    # ------------------------------------------------------------------
+    # Building / persistence
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, versions_dir: Path = DEFAULT_VERSIONS_DIR,
+              checkpoint_interval: int = DEFAULT_CHECKPOINT_INTERVAL) -> "VersionStore":
+        """
+        Build a store from vNNN.ttl snapshots (and optional vNNN.json sidecars).
+
+        Args:
+            versions_dir: Directory holding the snapshots
+            checkpoint_interval: Versions between full checkpoints (>= 1)
+        """
+        if checkpoint_interval < 1:
+            raise ValueError("checkpoint_interval must be >= 1")
+        triple_ids: Dict[str, int] = {}
+        versions: List[Dict[str, Any]] = []
+        previous: Set[int] = set()
+        previous_bytes: Optional[bytes] = None
+        previous_prefixes: Optional[Dict[str, str]] = None
+
+        for ttl in sorted(Path(versions_dir).glob("v[0-9]*.ttl")):
+            data = ttl.read_bytes()
+            if data == previous_bytes:
+                current, prefixes = previous, previous_prefixes
+            else:
+                graph = Graph().parse(data=data, format="turtle")
+                # Sorted so triple IDs (and the store bytes) are reproducible
+                current = {
+                    triple_ids.setdefault(line, len(triple_ids))
+                    for line in sorted(canonical_lines(graph))
+                }
+                prefixes = {p: str(ns) for p, ns in graph.namespace_manager.namespaces()}
+
+            sidecar = ttl.with_suffix(".json")
+            record: Dict[str, Any] = {
+                "id": ttl.stem,
+                "metadata": json.loads(sidecar.read_text(encoding="utf-8")) if sidecar.exists() else {},
+                "added": sorted(current - previous),
+                "removed": sorted(previous - current),
+            }
+            if len(versions) % checkpoint_interval == 0:
+                record["checkpoint"] = sorted(current)
+            if prefixes != previous_prefixes:
+                record["prefixes"] = prefixes
+            versions.append(record)
+            previous, previous_bytes, previous_prefixes = current, data, prefixes
+
+        triples = [None] * len(triple_ids)
+        for line, i in triple_ids.items():
+            triples[i] = line
+        return cls(triples, versions, checkpoint_interval)
+
+    def save(self, path: Path = DEFAULT_STORE) -> None:
+        payload = {
+            "format": FORMAT_VERSION,
+            "checkpoint_interval": self.checkpoint_interval,
+            "triples": self.triples,
+            "versions": self.versions,
+        }
+        data = gzip.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), mtime=0)
+        tmp = Path(path).with_name(f".{Path(path).name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_STORE) -> "VersionStore":
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+        if payload.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported version store format: {payload.get('format')!r}")
+        return cls(payload["triples"], payload["versions"], payload["checkpoint_interval"])
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @property
+    def ids(self) -> List[str]:
+        return [v["id"] for v in self.versions]
+
+    def _index(self, version_id: str) -> int:
+        try:
+            return self._position[version_id]
+        except KeyError:
+            raise KeyError(f"Unknown version: {version_id}") from None
+
+    def metadata(self, version_id: str) -> Dict[str, Any]:
+        return self.versions[self._index(version_id)]["metadata"]
+
+    def checkout_ids(self, version_id: str) -> Set[int]:
+        """Triple IDs of a version: nearest checkpoint at or before it, plus deltas."""
+        target = self._index(version_id)
+        start = target
+        while "checkpoint" not in self.versions[start]:
+            start -= 1
+        current = set(self.versions[start]["checkpoint"])
+        for record in self.versions[start + 1:target + 1]:
+            current.difference_update(record["removed"])
+            current.update(record["added"])
+        return current
+
+    def checkout_lines(self, version_id: str) -> Set[str]:
+        triples = self.triples
+        return {triples[i] for i in self.checkout_ids(version_id)}
+
+    def checkout(self, version_id: str) -> Graph:
+        """Reconstruct a version as a Graph (blank nodes canonically relabelled)."""
+        graph = lines_to_graph(self.checkout_lines(version_id))
+        for index in range(self._index(version_id), -1, -1):
+            prefixes = self.versions[index].get("prefixes")
+            if prefixes is not None:
+                for prefix, namespace in prefixes.items():
+                    graph.bind(prefix, namespace, override=True, replace=True)
+                break
+        return graph
+
+    def diff_ids(self, version_a: str, version_b: str) -> Tuple[Set[int], Set[int]]:
+        """
+        Net (added, removed) triple IDs going from version_a to version_b.
+
+        Composes the deltas in between; neither version is materialized.
+        """
+        a, b = self._index(version_a), self._index(version_b)
+        reverse = a > b
+        if reverse:
+            a, b = b, a
+        added: Set[int] = set()
+        removed: Set[int] = set()
+        for record in self.versions[a + 1:b + 1]:
+            for i in record["removed"]:
+                if i in added:
+                    added.discard(i)
+                else:
+                    removed.add(i)
+            for i in record["added"]:
+                if i in removed:
+                    removed.discard(i)
+                else:
+                    added.add(i)
+        return (removed, added) if reverse else (added, removed)
+
+    def diff(self, version_a: str, version_b: str) -> Tuple[Set[str], Set[str]]:
+        """Net (added, removed) canonical N-Triples lines from version_a to version_b."""
+        added, removed = self.diff_ids(version_a, version_b)
+        triples = self.triples
+        return {triples[i] for i in added}, {triples[i] for i in removed}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "versions": len(self.versions),
+            "distinct_triples": len(self.triples),
+            "checkpoints": sum(1 for v in self.versions if "checkpoint" in v),
+            "empty_deltas": sum(1 for v in self.versions[1:] if not v["added"] and not v["removed"]),
+            "delta_entries": sum(len(v["added"]) + len(v["removed"]) for v in self.versions[1:]),
+        }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Delta-encoded store for ontology/versions")
+    parser.add_argument("--store", default=str(DEFAULT_STORE))
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Pack the snapshots into the store")
+    build.add_argument("--versions-dir", default=str(DEFAULT_VERSIONS_DIR))
+    build.add_argument("--interval", type=int, default=DEFAULT_CHECKPOINT_INTERVAL)
+    checkout = sub.add_parser("checkout", help="Reconstruct one version as Turtle")
+    checkout.add_argument("version")
+    checkout.add_argument("-o", "--output", help="Output file (default: stdout)")
+    diff = sub.add_parser("diff", help="Triples added/removed between two versions")
+    diff.add_argument("version_a")
+    diff.add_argument("version_b")
+    sub.add_parser("stats", help="Store statistics")
+    args = parser.parse_args()
+    store_path = Path(args.store)
+
+    if args.command == "build":
+        start = time.perf_counter()
+        store = VersionStore.build(Path(args.versions_dir), args.interval)
+        store.save(store_path)
+        snapshot_bytes = sum(p.stat().st_size for p in Path(args.versions_dir).glob("v[0-9]*.*"))
+        store_bytes = store_path.stat().st_size
+        print(f"Wrote {store_path} in {time.perf_counter() - start:.2f}s")
+        print(f"  {store.stats()}")
+        print(f"  snapshots: {snapshot_bytes} bytes, store: {store_bytes} bytes "
+              f"({snapshot_bytes / store_bytes:.0f}x smaller)")
+        return 0
+
+    store = VersionStore.load(store_path)
+    if args.command == "checkout":
+        ttl = store.checkout(args.version).serialize(format="turtle")
+        if args.output:
+            Path(args.output).write_text(ttl, encoding="utf-8")
+        else:
+            sys.stdout.write(ttl)
+    elif args.command == "diff":
+        added, removed = store.diff(args.version_a, args.version_b)
+        for line in sorted(removed):
+            print(f"- {line} .")
+        for line in sorted(added):
+            print(f"+ {line} .")
+        print(f"{len(added)} added, {len(removed)} removed", file=sys.stderr)
+    else:
+        print(json.dumps(store.stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
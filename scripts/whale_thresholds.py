@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Streaming Whale Threshold Derivation
+
+Regenerates the whale cutoffs of ontology/tenant_thresholds.ttl ("13th
+highest IAP count after aggregation across 14 partitions") from IAP events,
+in bounded memory and without materializing a per-device table:
+
+- each (tenant, partition) stream feeds a PartitionSketch: a count-min
+  sketch of IAP counts per device (conservative update, so estimates are
+  upper bounds that stay tight for heavy hitters) plus a bounded set of
+  heavy-hitter candidates, pruned to the `capacity` largest estimates
+- sketches of the same tenant are merged by adding their tables (count-min
+  sketches with the same shape and seed are additive) and taking the union
+  of the candidates, which are then re-estimated against the merged table,
+  so a device spread over several partitions is counted once in total
+- the whale threshold is the K-th highest merged estimate; K comes from
+  --whales, or from the "Nth highest" wording of the tenant's existing
+  skos:definition
+
+Memory per partition is depth x width counters plus at most 2 x capacity
+candidates, whatever the number of devices. A candidate's estimate exceeds
+its true count by at most e/width x (IAP events in the tenant) with
+probability 1 - exp(-depth); the bound is written next to each threshold.
+A device must be among the `capacity` heaviest of at least one partition to
+be found, so keep capacity well above K (the default is 1024).
+
+IAP events are those incremental_inference.is_iap() accepts (the same test
+event_triples() uses for totalSpent): InAppPurchase, or a MonetizationEvent
+with an amount and no ad_type.
+
+Usage:
+    python scripts/whale_thresholds.py --source adinmo --tenant adinmo part-*.ndjson.gz -o thresholds.ttl
+    python scripts/whale_thresholds.py --universal flick=flick/*.ndjson avakin=avakin/*.ndjson --workers 4
+    python scripts/whale_thresholds.py --synthetic 200000 --partitions 14
+"""
+
+import argparse
+import hashlib
+import heapq
+import math
+import random
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+from rdflib import Graph, Literal, URIRef
+from rdflib.namespace import RDF, RDFS, SKOS
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT / "adapters"))
+
+from incremental_inference import is_iap
+from monetization_classifier import CORE, DEFAULT_THRESHOLDS, METRICS, _normalize_tenant
+from ontology_loader import load_graph
+
+
+DEFAULT_WIDTH = 1 << 16
+DEFAULT_DEPTH = 4
+DEFAULT_CAPACITY = 1024
+DEFAULT_WHALES = 10
+CHUNK_SIZE = 10000
+
+_NTH_HIGHEST = re.compile(r"(\d+)(?:st|nd|rd|th) highest IAP count", re.IGNORECASE)
+
+
+def _key_hashes(keys: Sequence[str]) -> "np.ndarray":
+    """Stable 64-bit hashes (identical across processes, unlike hash())."""
+    return np.fromiter(
+        (int.from_bytes(hashlib.blake2b(k.encode("utf-8"), digest_size=8).digest(), "little") for k in keys),
+        dtype=np.uint64, count=len(keys),
+    )
+
+
+class PartitionSketch:
+    """Count-min sketch of IAP counts per device plus heavy-hitter candidates."""
+
+    def __init__(self, tenant: str, partition: str = "", width: int = DEFAULT_WIDTH,
+                 depth: int = DEFAULT_DEPTH, capacity: int = DEFAULT_CAPACITY):
+        if np is None:
+            raise ImportError("whale_thresholds requires NumPy")
+        self.tenant = tenant
+        self.partition = partition
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+        self.candidates: Dict[str, int] = {}  # device -> count estimate (upper bound)
+        self._floor = 0
+
+    def _cells(self, keys: Sequence[str]) -> "np.ndarray":
+        # Double hashing: row i uses h1 + i * h2 (Kirsch-Mitzenmacher)
+        hashes = _key_hashes(keys)
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((h1[None, :] + rows * h2[None, :]) % np.uint64(self.width)).astype(np.intp)
+
+    def estimate(self, keys: Sequence[str]) -> "np.ndarray":
+        if not keys:
+            return np.zeros(0, dtype=np.int64)
+        return self.table[np.arange(self.depth)[:, None], self._cells(keys)].min(axis=0)
+
+    def add_counts(self, counts: Dict[str, int]) -> None:
+        """Add IAP counts per device (one update per distinct device)."""
+        if not counts:
+            return
+        keys = list(counts)
+        values = np.fromiter(counts.values(), dtype=np.int64, count=len(keys))
+        rows = np.broadcast_to(np.arange(self.depth)[:, None], (self.depth, len(keys)))
+        cells = self._cells(keys)
+        # Conservative update: raise each cell only as far as the key's new estimate
+        updated = self.table[rows, cells].min(axis=0) + values
+        np.maximum.at(self.table, (rows, cells), np.broadcast_to(updated, rows.shape))
+        self.total += int(values.sum())
+
+        floor = self._floor
+        candidates = self.candidates
+        for key, value in zip(keys, updated.tolist()):
+            if value >= floor or key in candidates:
+                candidates[key] = value
+        if len(candidates) > 2 * self.capacity:
+            self._prune()
+
+    def add_events(self, events: Iterable[Dict[str, Any]]) -> None:
+        """Count the IAP events of a batch of universal events."""
+        self.add_counts(Counter(e.get("device_id") for e in events if is_iap(e) and e.get("device_id")))
+
+    def _prune(self) -> None:
+        kept = heapq.nlargest(self.capacity, self.candidates.items(), key=lambda kv: kv[1])
+        self.candidates = dict(kept)
+        self._floor = kept[-1][1] if kept else 0
+
+    def merge(self, other: "PartitionSketch") -> "PartitionSketch":
+        """Add another partition of the same tenant into this sketch."""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError(f"Cannot merge sketches of shape {other.depth}x{other.width} "
+                             f"into {self.depth}x{self.width}")
+        self.table += other.table
+        self.total += other.total
+        keys = list(set(self.candidates) | set(other.candidates))
+        self.candidates = dict(zip(keys, self.estimate(keys).tolist()))
+        self._floor = 0
+        if len(self.candidates) > 2 * self.capacity:
+            self._prune()
+        return self
+
+    def top(self, k: int) -> List[Tuple[str, int]]:
+        """The k heaviest candidates as (device, estimated IAP count), largest first."""
+        return heapq.nlargest(k, self.candidates.items(), key=lambda kv: (kv[1], kv[0]))
+
+    @property
+    def error_bound(self) -> float:
+        """Additive overestimate bound (holds with probability 1 - exp(-depth))."""
+        return math.e / self.width * self.total
+
+
+def merge_partitions(sketches: Iterable[PartitionSketch]) -> Dict[str, PartitionSketch]:
+    """Merge partition sketches per tenant."""
+    merged: Dict[str, PartitionSketch] = {}
+    for sketch in sketches:
+        tenant = _normalize_tenant(sketch.tenant)
+        if tenant in merged:
+            merged[tenant].merge(sketch)
+            merged[tenant].partition = f"{merged[tenant].partition},{sketch.partition}"
+        else:
+            merged[tenant] = sketch
+    return merged
+
+
+def sketch_partition(tenant: str, partition: str, chunks: Iterable[List[Dict[str, Any]]],
+                     **sketch_options: Any) -> PartitionSketch:
+    """Stream one partition's universal event chunks into a sketch."""
+    sketch = PartitionSketch(tenant, partition, **sketch_options)
+    for chunk in chunks:
+        sketch.add_events(chunk)
+    return sketch
+
+
+def _sketch_file(tenant: str, path: str, source: Optional[str], sketch_options: Dict[str, Any]) -> PartitionSketch:
+    """Read (and, for source exports, transform) one partition file; runs in worker processes too."""
+    from streaming_pipeline import csv_numeric_columns, load_adapter, read_chunks, transform_chunks
+
+    if source:
+        adapter = load_adapter(source)
+        chunks = transform_chunks(adapter, read_chunks(path, chunk_size=CHUNK_SIZE,
+                                                       numeric_columns=csv_numeric_columns(adapter)))
+    else:
+        chunks = read_chunks(path, chunk_size=CHUNK_SIZE)
+    return sketch_partition(tenant, path, chunks, **sketch_options)
+
+
+# ============================================================================
+# Threshold triples
+# ============================================================================
+
+class TenantThresholds:
+    """One :MonetizationThresholds block, ready to render."""
+
+    def __init__(self, node: URIRef, tenant: Optional[str], label: str, values: Dict[URIRef, Any],
+                 definition: Optional[str] = None, comments: Sequence[str] = ()):
+        self.node = node
+        self.tenant = tenant
+        self.label = label
+        self.values = values
+        self.definition = definition
+        self.comments = list(comments)
+
+
+def read_thresholds(graph: Graph, text: str = "") -> List[TenantThresholds]:
+    """Threshold blocks of a tenant_thresholds graph, in file order if `text` is given (default first)."""
+    properties = [p for triple in METRICS.values() for p in triple]
+    blocks = []
+    nodes = sorted(graph.subjects(RDF.type, CORE.MonetizationThresholds),
+                   key=lambda n: (n != CORE.DefaultMonetizationThresholds,
+                                  text.find(f":{_local_name(n)} "), str(n)))
+    for node in nodes:
+        tenant = graph.value(node, CORE.appliesToTenant)
+        definition = graph.value(node, SKOS.definition)
+        blocks.append(TenantThresholds(
+            node,
+            str(tenant) if tenant is not None else None,
+            str(graph.value(node, RDFS.label) or _local_name(node)),
+            {p: graph.value(node, p).toPython() for p in properties if graph.value(node, p) is not None},
+            str(definition) if definition is not None else None,
+        ))
+    return blocks
+
+
+def expected_whales(block: TenantThresholds, default: int = DEFAULT_WHALES) -> int:
+    """K for a tenant, from the "Nth highest IAP count" wording of its definition."""
+    match = _NTH_HIGHEST.search(block.definition or "")
+    return int(match.group(1)) if match else default
+
+
+def _local_name(node: URIRef) -> str:
+    return str(node).rsplit("#", 1)[-1]
+
+
+def _ordinal(n: int) -> str:
+    suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+
+def derive_thresholds(blocks: List[TenantThresholds], sketches: Dict[str, PartitionSketch],
+                      whales: Optional[Dict[str, int]] = None,
+                      default_whales: int = DEFAULT_WHALES) -> List[TenantThresholds]:
+    """
+    Replace the whale IAP threshold of every sketched tenant.
+
+    Tenants without a block get one (other thresholds from the default);
+    blocks of tenants without a sketch are kept unchanged. A derived whale
+    cutoff below the tenant's dolphin / minnow threshold lowers those to
+    keep the thresholds ordered.
+    """
+    whales = {_normalize_tenant(t): k for t, k in (whales or {}).items()}
+    by_tenant = {_normalize_tenant(b.tenant): b for b in blocks if b.tenant is not None}
+    default = next((b for b in blocks if b.tenant is None), None)
+    out = list(blocks)
+
+    for tenant, sketch in sorted(sketches.items()):
+        block = by_tenant.get(tenant)
+        if block is None:
+            name = "".join(part.capitalize() for part in re.split(r"[^0-9A-Za-z]+", tenant) if part)
+            block = TenantThresholds(
+                CORE[f"{name}MonetizationThresholds"], tenant, f"{name} Monetization Thresholds",
+                {p: v for p, v in (default.values if default else {}).items() if p in METRICS["iap"]},
+            )
+            out.append(block)
+        k = whales.get(tenant) or expected_whales(block, default_whales)
+        top = sketch.top(k)
+        if len(top) < k:
+            print(f"⚠️  {tenant}: only {len(top)} devices with IAPs, fewer than {k} whales; "
+                  f"threshold left unchanged", file=sys.stderr)
+            continue
+        whale = int(top[-1][1])
+
+        values = dict(block.values)
+        values[CORE.whaleIapThreshold] = whale
+        for lower in (CORE.dolphinIapThreshold, CORE.minnowIapThreshold):
+            if lower in values and values[lower] > whale:
+                print(f"⚠️  {tenant}: lowering {_local_name(lower)} from {values[lower]} to {whale}",
+                      file=sys.stderr)
+                values[lower] = whale
+        partitions = len(sketch.partition.split(","))
+        block.values = values
+        block.definition = (f"Thresholds for {block.label.replace(' Monetization Thresholds', '')} tenant. "
+                            f"{_ordinal(k)} highest IAP count is {whale:,}.")
+        block.comments = [
+            "Thresholds derived by scripts/whale_thresholds.py:",
+            f"- Expected: {k} whales",
+            f"- {_ordinal(k)} highest IAP count: {whale:,} (after aggregation across {partitions} partition{'s' if partitions != 1 else ''})",
+            f"- {sketch.total:,} IAP events; count-min overestimate <= {sketch.error_bound:.1f} "
+            f"(p >= {1 - math.exp(-sketch.depth):.3f})",
+        ]
+    return out
+
+
+_PREFIXES = """@prefix : <http://ontology.gaming.network/core#> .
+@prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix xsd: <http://www.w3.org/2001/XMLSchema#> .
+@prefix skos: <http://www.w3.org/2004/02/skos/core#> .
+@prefix dc: <http://purl.org/dc/elements/1.1/> .
+"""
+
+_RULE = "# " + "=" * 76
+
+
+def split_layout(text: str) -> Tuple[str, str]:
+    """
+    (header, footer) of an existing thresholds file: the prefixes and title
+    comment before the first block, and the "END OF TENANT THRESHOLDS"
+    section with its instructions, so regenerated files keep them.
+    """
+    lines = text.splitlines()
+    first = next((i for i, line in enumerate(lines) if line.startswith("# Default thresholds")
+                  or line.startswith(":")), len(lines))
+    end = next((i for i, line in enumerate(lines) if "END OF TENANT THRESHOLDS" in line), None)
+    footer = "\n".join(lines[end - 1:]) + "\n" if end else ""
+    return "\n".join(lines[:first]).rstrip() + "\n", footer
+
+
+def render_thresholds(blocks: List[TenantThresholds], header: str = _PREFIXES, footer: str = "") -> str:
+    """Turtle in the tenant_thresholds.ttl layout."""
+    order = [CORE.whaleIapThreshold, CORE.dolphinIapThreshold, CORE.minnowIapThreshold,
+             CORE.whaleMonetaryThreshold, CORE.dolphinMonetaryThreshold, CORE.minnowMonetaryThreshold]
+    lines = [header]
+    for block in blocks:
+        if block.tenant is None:
+            lines.append("# Default thresholds (used for tenants without specific configuration)")
+            lines.append("# These provide fallback values for new tenants")
+        else:
+            lines += [_RULE, f"# {block.label.replace(' Monetization Thresholds', '')} Thresholds", _RULE]
+            lines += [f"# {c}" for c in block.comments]
+            lines.append("")
+        statements = [f"a :MonetizationThresholds",
+                      f"rdfs:label {Literal(block.label, lang='en').n3()}"]
+        if block.definition:
+            statements.append(f"skos:definition {Literal(block.definition, lang='en').n3()}")
+        if block.tenant is not None:
+            statements.append(f":appliesToTenant {Literal(block.tenant).n3()}")
+        for p in order:
+            if p in block.values:
+                statements.append(f":{_local_name(p)} {block.values[p]}")
+        lines.append(f":{_local_name(block.node)} " + " ;\n    ".join(statements) + " .")
+        lines.append("")
+    return "\n".join(lines) + "\n" + (footer or "\n".join([_RULE, "# END OF TENANT THRESHOLDS", _RULE, ""]))
+
+
+# ============================================================================
+# Command line
+# ============================================================================
+
+def synthetic_partitions(tenants: Dict[str, int], partitions: int, seed: int = 0,
+                         chunk_size: int = CHUNK_SIZE) -> Iterable[Tuple[str, str, Iterable[List[Dict[str, Any]]]]]:
+    """(tenant, partition, chunks) with Pareto-distributed IAP counts per device, spread over partitions."""
+    for tenant, devices in tenants.items():
+        for p in range(partitions):
+            def chunks(tenant=tenant, devices=devices, p=p):
+                rng = random.Random(f"{seed}:{tenant}:{p}")
+                chunk = []
+                for d in range(devices):
+                    for _ in range(int(rng.paretovariate(1.5)) - 1):
+                        chunk.append({"event_type": "InAppPurchase", "device_id": f"{tenant}-d{d}"})
+                        if len(chunk) >= chunk_size:
+                            yield chunk
+                            chunk = []
+                if chunk:
+                    yield chunk
+            yield tenant, f"p{p}", chunks()
+
+
+def _inputs(specs: List[str], default_tenant: Optional[str]) -> List[Tuple[str, str]]:
+    inputs = []
+    for spec in specs:
+        tenant, sep, path = spec.partition("=")
+        if not sep:
+            if not default_tenant:
+                raise SystemExit(f"No tenant for {spec!r}: use TENANT=PATH or --tenant")
+            tenant, path = default_tenant, spec
+        inputs.append((tenant, path))
+    return inputs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Derive per-tenant whale IAP thresholds from event streams")
+    parser.add_argument("inputs", nargs="*", help="Partition files as TENANT=PATH (or PATH with --tenant)")
+    parser.add_argument("--tenant", help="Tenant of inputs given without TENANT=")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--source", help="Adapter for source exports (see streaming_pipeline.ADAPTERS)")
+    source.add_argument("--universal", action="store_true", help="Inputs are universal event NDJSON")
+    parser.add_argument("--synthetic", type=int, metavar="DEVICES",
+                        help="Use synthetic flick/avakin/adinmo partitions with this many devices each")
+    parser.add_argument("--partitions", type=int, default=14, help="Synthetic partitions per tenant")
+    parser.add_argument("--whales", action="append", default=[], metavar="TENANT=K",
+                        help="Whales per tenant (default: from the tenant's skos:definition)")
+    parser.add_argument("--default-whales", type=int, default=DEFAULT_WHALES)
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH)
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH)
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY)
+    parser.add_argument("--workers", type=int, default=0, help="Sketch partition files in a process pool")
+    parser.add_argument("--thresholds", default=str(DEFAULT_THRESHOLDS), help="Existing thresholds TTL")
+    parser.add_argument("-o", "--output", help="Write the regenerated TTL here (default: stdout)")
+    args = parser.parse_args()
+
+    options = {"width": args.width, "depth": args.depth, "capacity": args.capacity}
+    start = time.perf_counter()
+    # Partitions are merged as they finish, so at most one unmerged sketch per worker is alive
+    if args.synthetic:
+        sketches = (sketch_partition(t, p, chunks, **options) for t, p, chunks in
+                    synthetic_partitions({t: args.synthetic for t in ("flick", "avakin", "adinmo")},
+                                         args.partitions))
+        merged = merge_partitions(sketches)
+    else:
+        if not args.source and not args.universal:
+            parser.error("one of --source, --universal or --synthetic is required")
+        inputs = _inputs(args.inputs, args.tenant)
+        if args.workers:
+            with ProcessPoolExecutor(args.workers) as pool:
+                merged = merge_partitions(pool.map(_sketch_file, *zip(*inputs), [args.source] * len(inputs),
+                                                   [options] * len(inputs)))
+        else:
+            merged = merge_partitions(_sketch_file(t, p, args.source, options) for t, p in inputs)
+    elapsed = time.perf_counter() - start
+
+    whales = {}
+    for spec in args.whales:
+        tenant, _, k = spec.partition("=")
+        whales[tenant] = int(k)
+    existing = Path(args.thresholds).read_text(encoding="utf-8")
+    blocks = derive_thresholds(read_thresholds(load_graph(args.thresholds), existing), merged, whales,
+                               args.default_whales)
+    text = render_thresholds(blocks, *split_layout(existing))
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text)
+
+    partitions = sum(len(s.partition.split(",")) for s in merged.values())
+    memory = args.depth * args.width * 8 / 1e6
+    print(f"Sketched {partitions} partitions of {len(merged)} tenants in {elapsed:.2f}s "
+          f"({memory:.1f} MB of counters per partition)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())